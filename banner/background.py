@@ -2,7 +2,6 @@
 Background and texture processing
 """
 from PIL import Image, ImageDraw
-from banner.textures import TEXTURE_MAP
 from banner.patterns import PATTERN_MAP
 from core.image_utils import hex_to_rgb, get_dominant_colors, get_average_color, rgb_distance, adjust_color, draw_gradient_custom
 import os
@@ -48,7 +47,7 @@ def draw_asym_rounded_rectangle(draw, box, radii, fill=None, outline=None, width
 # Import BannerConfig if needed
 
 def create_background(config) -> Image.Image:
-    """Creates background, gradient and texture."""
+    """Creates background and gradient (textures are applied by the pipeline's texture stage)."""
     # Color and size settings
     auto_color = getattr(config, 'auto_color', True)
     icon_path = getattr(config, 'icon_path', None)
@@ -59,9 +58,6 @@ def create_background(config) -> Image.Image:
     height = getattr(config, 'height', 256)
     SS = getattr(config, 'SuperSampling', 1)
     gradient_type = getattr(config, 'gradient_type', 'vertical')
-    texture = getattr(config, 'texture', 'none')
-    texture_density = getattr(config, 'texture_density', 1.0)
-    texture_opacity = getattr(config, 'texture_opacity', 20)
     border = getattr(config, 'border', False)
     rounded = getattr(config, 'rounded', False)
     corner_radius_tl = getattr(config, 'corner_radius_tl', None)
@@ -119,15 +115,6 @@ def create_background(config) -> Image.Image:
         grad_masked = Image.new("RGBA", (width, height), (0,0,0,0))
         grad_masked.paste(grad, (0,0), mask=bg_mask)
         img = grad_masked
-        if texture in TEXTURE_MAP and texture != "none":
-            img = TEXTURE_MAP[texture](
-                img,
-                density=texture_density,
-                opacity=texture_opacity,
-                rotation=getattr(config, 'texture_rotation', 0),
-                colors=getattr(config, 'texture_colors', None),
-                SS=SS
-            )
     else:
         if border:
             draw.rounded_rectangle(mask_box, radius=border_radius, fill=(200,200,200,255))
@@ -145,15 +132,6 @@ def create_background(config) -> Image.Image:
         grad_masked = Image.new("RGBA", (width, height), (0,0,0,0))
         grad_masked.paste(grad, (0,0), mask=bg_mask)
         img = grad_masked
-        if texture in TEXTURE_MAP and texture != "none":
-            img = TEXTURE_MAP[texture](
-                img,
-                density=texture_density,
-                opacity=texture_opacity,
-                rotation=getattr(config, 'texture_rotation', 0),
-                colors=getattr(config, 'texture_colors', None),
-                SS=SS
-            )
     return img 
 
 def apply_shape(img, W, H):
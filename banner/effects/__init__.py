@@ -2,7 +2,14 @@
 # Auto-discovery and import of effect modules
 
 import os
+import hashlib
 import importlib
+import inspect
+from collections import OrderedDict
+from ._pointwise import Mix, apply_pointwise_chain
+from ._utils import mix_images
+from ._lut import LUT_SIZE, apply_lut_chain, cube_effects, is_cube_path, load_cube
+from core.plugin_utils import PluginInfo, describe_plugin
 
 # Get current directory
 current_dir = os.path.dirname(__file__)
@@ -11,16 +18,88 @@ current_dir = os.path.dirname(__file__)
 effect_files = [f[:-3] for f in os.listdir(current_dir) 
                 if f.endswith('.py') and f != '__init__.py' and not f.startswith('_')]
 
-# Build EFFECT_MAP by importing modules
+# Build EFFECT_MAP by importing modules. EFFECT_PLUGINS holds each effect's
+# descriptor (see core.plugin_utils): a module's PLUGIN, else, for effects
+# that declare a pointwise colour form (POINTWISE), pointwise with that form
+# as the stage chains fuse, and global otherwise
 EFFECT_MAP = {}
+EFFECT_PLUGINS = {}
 for effect_name in effect_files:
     try:
         module = importlib.import_module(f'.{effect_name}', package='banner.effects')
         if hasattr(module, f'apply_{effect_name}'):
             EFFECT_MAP[effect_name] = getattr(module, f'apply_{effect_name}')
+            stage = getattr(module, 'POINTWISE', None)
+            EFFECT_PLUGINS[effect_name] = describe_plugin(
+                module, effect_name, EFFECT_MAP[effect_name],
+                kind="global" if stage is None else "pointwise", stage=stage)
     except ImportError:
         pass
 
+# Blur-based effects (bloom, glow, soft, lens_flare) take the pyramid blur quality
+BLUR_QUALITY_EFFECTS = {name for name, func in EFFECT_MAP.items()
+                        if 'blur_quality' in inspect.signature(func).parameters}
+
+# .cube LUT files in LUT_DIR become effects named after the file (loaded on first use)
+CUBE_EFFECTS = {name: path for name, path in cube_effects().items() if name not in EFFECT_MAP}
+for effect_name, cube_path in CUBE_EFFECTS.items():
+    EFFECT_MAP[effect_name] = lambda img, cube_path=cube_path: apply_lut_chain(img, [load_cube(cube_path)])
+    EFFECT_PLUGINS[effect_name] = PluginInfo(kind="pointwise", name=effect_name, func=EFFECT_MAP[effect_name])
+
+def _pointwise_stage(effect_name):
+    """Fusable colour stage for an effect name or a .cube file path, else None."""
+    info = EFFECT_PLUGINS.get(effect_name)
+    if info is None:
+        return load_cube(effect_name) if is_cube_path(effect_name) else None
+    if info.kind != "pointwise":
+        return None
+    if effect_name in CUBE_EFFECTS:
+        return load_cube(CUBE_EFFECTS[effect_name])  # Loaded on first use
+    return info.stage
+
+# Full-strength results of effects given an intensity, keyed by effect, its
+# declared config fields (see EFFECT_PLUGINS) and the input pixels: when only
+# the intensity changes, the effect itself is not recomputed
+EFFECT_CACHE_SIZE = 4
+_effect_cache = OrderedDict()
+
+def parse_effect_entry(entry):
+    """
+    Split an effect list entry into (name, intensity): "bloom:0.5" or
+    ("bloom", 0.5) gives an intensity, a bare name gives None (full
+    strength, uncached).
+    """
+    if isinstance(entry, (tuple, list)):
+        return entry[0], max(0.0, float(entry[1]))
+    name, sep, value = entry.rpartition(":")
+    if sep:
+        try:
+            return name.strip(), max(0.0, float(value))
+        except ValueError:
+            pass  # e.g. a drive letter in a .cube path
+    return entry.strip(), None
+
+def _full_strength(img, effect_name, config, compute):
+    """compute(img), from the effect cache when the same effect ran on the same pixels."""
+    info = EFFECT_PLUGINS.get(effect_name)
+    key = (effect_name, img.mode, img.size, info.cache_key(config) if info else (),
+           hashlib.blake2b(img.tobytes(), digest_size=16).digest())
+    if key in _effect_cache:
+        _effect_cache.move_to_end(key)
+        return _effect_cache[key]
+    result = compute(img)
+    _effect_cache[key] = result
+    while len(_effect_cache) > EFFECT_CACHE_SIZE:
+        _effect_cache.popitem(last=False)
+    return result
+
+def _apply_mask(img, mask):
+    """Clear everything outside the (binary) banner mask to transparent."""
+    from PIL import Image
+    img_masked = Image.new("RGBA", img.size, (0,0,0,0))
+    img_masked.paste(img, (0,0), mask=mask)
+    return img_masked
+
 # Add special handling for lens_flare which has different parameter signature
 if 'lens_flare' in EFFECT_MAP:
     # Keep the original lens_flare function with its full signature
@@ -39,6 +118,8 @@ def apply_effects(img, config):
     width = getattr(config, 'width', 1024)
     height = getattr(config, 'height', 256)
     SS = getattr(config, 'SuperSampling', 1)
+    lut_size = getattr(config, 'effect_lut_size', LUT_SIZE)
+    blur_quality = getattr(config, 'effect_blur_quality', 1.0)
     W, H = width, height
     # Mask parametreleri
     border = getattr(config, 'border', False)
@@ -69,30 +150,67 @@ def apply_effects(img, config):
         effect_list = [e.strip() for e in effect.split(",") if e.strip() and e.strip() != "none"]
     else:
         effect_list = list(effect)
-    for effect_name in effect_list:
-        if effect_name in EFFECT_MAP:
+    # (name, intensity) pairs; an intensity blends the full-strength effect
+    # with its input, see parse_effect_entry
+    effect_list = [parse_effect_entry(e) for e in effect_list]
+    effect_list = [(e, t) for e, t in effect_list if e in EFFECT_MAP or is_cube_path(e)]
+    # The chain works on one unmasked buffer and the mask is applied once at
+    # the end. The mask is binary, so pointwise effects are unaffected by
+    # what lies outside it; neighbourhood and global effects (blurs, channel
+    # shifts) get a freshly masked input, as when every effect was masked,
+    # if anything has run since the last mask.
+    outside_dirty = False
+    i = 0
+    while i < len(effect_list):
+        effect_name, intensity = effect_list[i]
+        if _pointwise_stage(effect_name) is not None:
+            # Fuse a run of pointwise colour effects and .cube LUTs into one
+            # baked 3D LUT (or, with effect_lut_size 0, one exact banded pass);
+            # partial intensities are part of the fused stages
+            run = []
+            while i < len(effect_list) and _pointwise_stage(effect_list[i][0]) is not None:
+                stage_name, stage_intensity = effect_list[i]
+                stage = _pointwise_stage(stage_name)
+                run.append(stage if stage_intensity in (None, 1.0) else Mix(stage, stage_intensity))
+                i += 1
+            if lut_size:
+                img = apply_lut_chain(img, run, lut_size)
+            else:
+                img = apply_pointwise_chain(img, run)
+        else:
+            if outside_dirty and not EFFECT_PLUGINS[effect_name].pointwise:
+                img = _apply_mask(img, mask)
             # Apply filter effect to entire image
-            if effect_name == "lens_flare":
-                # Enhanced lens flare with full customization
-                core_color = getattr(config, 'flare_core_color', (255, 255, 255))
-                ghost_colors = getattr(config, 'flare_ghost_colors', None)
-                intensity = getattr(config, 'flare_intensity', 1.0)
-                spike_enabled = getattr(config, 'flare_spikes', True)
-                hexagon_enabled = getattr(config, 'flare_hexagon', True)
-                blur_layers = getattr(config, 'flare_blur_layers', 3)
-                img = EFFECT_MAP[effect_name](img, position=effect_position, scale=effect_scale, SS=SS,
-                                       custom_x=effect_x, custom_y=effect_y, core_color=core_color,
-                                       ghost_colors=ghost_colors, intensity=intensity,
-                                       spike_enabled=spike_enabled, hexagon_enabled=hexagon_enabled,
-                                       blur_layers=blur_layers)
+            def compute(img, effect_name=effect_name):
+                if effect_name == "lens_flare":
+                    # Enhanced lens flare with full customization
+                    core_color = getattr(config, 'flare_core_color', (255, 255, 255))
+                    ghost_colors = getattr(config, 'flare_ghost_colors', None)
+                    flare_intensity = getattr(config, 'flare_intensity', 1.0)
+                    spike_enabled = getattr(config, 'flare_spikes', True)
+                    hexagon_enabled = getattr(config, 'flare_hexagon', True)
+                    blur_layers = getattr(config, 'flare_blur_layers', 3)
+                    return EFFECT_MAP[effect_name](img, position=effect_position, scale=effect_scale, SS=SS,
+                                                   custom_x=effect_x, custom_y=effect_y, core_color=core_color,
+                                                   ghost_colors=ghost_colors, intensity=flare_intensity,
+                                                   spike_enabled=spike_enabled, hexagon_enabled=hexagon_enabled,
+                                                   blur_layers=blur_layers, blur_quality=blur_quality)
+                if effect_name in BLUR_QUALITY_EFFECTS:
+                    return EFFECT_MAP[effect_name](img, blur_quality=blur_quality)
+                return EFFECT_MAP[effect_name](img)
+            if intensity is None:
+                img = compute(img)
             else:
-                img = EFFECT_MAP[effect_name](img)
-            
-            # Apply mask to final result
-            img_masked = Image.new("RGBA", img.size, (0,0,0,0))
-            img_masked.paste(img, (0,0), mask=mask)
-            img = img_masked
+                # Full strength once (cached), then a blend for the intensity
+                full = _full_strength(img, effect_name, config, compute)
+                img = full.copy() if intensity == 1.0 else mix_images(img, full, intensity)
+            i += 1
+        outside_dirty = True
+    
+    # Apply mask to final result
+    if outside_dirty:
+        img = _apply_mask(img, mask)
     return img
 
 # Export the map
-__all__ = ['EFFECT_MAP', 'apply_effects']
\ No newline at end of file
+__all__ = ['EFFECT_MAP', 'EFFECT_PLUGINS', 'apply_effects', 'parse_effect_entry']
\ No newline at end of file
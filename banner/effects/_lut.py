@@ -0,0 +1,179 @@
+# effects/_lut.py
+# 3D colour LUTs: baked pointwise chains and .cube files
+#
+# A run of pointwise stages (Pointwise forms from _pointwise, .cube LUTs)
+# is sampled once on a size^3 lattice and applied with Pillow's native
+# trilinear Color3DLUT filter, so the per-pixel cost is one table lookup
+# however long the chain is. Baked tables are cached by chain content and
+# lattice size. .cube files are standard Adobe/Resolve 3D LUTs; those in
+# LUT_DIR are registered as effects named after the file.
+
+import os
+from functools import cached_property, lru_cache
+import numpy as np
+from PIL import ImageFilter
+from core.parallel_utils import apply_in_bands
+
+# Lattice points per axis for baked chains (17 = cheaper bake, 33 = finer)
+LUT_SIZE = 33
+
+# Largest lattice Pillow's Color3DLUT accepts
+MAX_FILTER_SIZE = 65
+
+LUT_DIR = os.environ.get(
+    "BANNER_MAKER_LUT_DIR",
+    os.path.join(os.path.expanduser("~"), ".config", "banner_maker", "luts"),
+)
+
+def is_cube_path(effect_name):
+    """True for effect entries that name a .cube file."""
+    return isinstance(effect_name, str) and effect_name.lower().endswith(".cube")
+
+def trilinear(table, coords, out):
+    """
+    Trilinear lookup in an (n, n, n, 3) table indexed [r, g, b] at float32
+    lattice coordinates coords (..., 3); the result is written into out.
+    coords is used as scratch.
+    """
+    n = table.shape[0]
+    flat = table.reshape(-1, 3)
+    np.clip(coords, 0, n - 1, out=coords)
+    index = np.minimum(coords.astype(np.intp), n - 2)
+    coords -= index  # Fractions within the lattice cell
+    base = (index[..., 0] * n + index[..., 1]) * n + index[..., 2]
+    out[...] = 0
+    for dr in (0, 1):
+        wr = coords[..., 0] if dr else 1 - coords[..., 0]
+        for dg in (0, 1):
+            wrg = wr * (coords[..., 1] if dg else 1 - coords[..., 1])
+            for db in (0, 1):
+                weight = wrg * (coords[..., 2] if db else 1 - coords[..., 2])
+                out += flat[base + (dr * n + dg) * n + db] * weight[..., np.newaxis]
+    return out
+
+class CubeLut:
+    """
+    A 3D LUT as a pointwise stage: table is (n, n, n, 3) indexed [r, g, b]
+    with outputs on the 0..255 scale; inputs are mapped from the
+    [domain_min, domain_max] cube. Like the other colour effects, the
+    result is clipped and truncated to 8-bit levels.
+    """
+
+    def __init__(self, table, domain_min=(0.0, 0.0, 0.0), domain_max=(1.0, 1.0, 1.0)):
+        self.table = np.ascontiguousarray(table, dtype=np.float32)
+        self.size = self.table.shape[0]
+        domain_min = np.asarray(domain_min, dtype=np.float32)
+        domain_max = np.asarray(domain_max, dtype=np.float32)
+        # 0..255 input -> lattice coordinate, per channel
+        self.scale = (self.size - 1) / (255 * (domain_max - domain_min))
+        self.shift = -domain_min * (self.size - 1) / (domain_max - domain_min)
+        self.unit_domain = bool(np.all(domain_min == 0) and np.all(domain_max == 1))
+        self.key = (self.table.tobytes(), domain_min.tobytes(), domain_max.tobytes())
+        self._hash = hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, CubeLut) and self.key == other.key
+
+    def __hash__(self):
+        return self._hash
+
+    def apply_band(self, rgb, out):
+        """Apply to a float32 (rows, w, 3) band; the result is in out, rgb is scratch."""
+        rgb *= self.scale
+        rgb += self.shift
+        trilinear(self.table, rgb, out)
+        np.clip(out, 0, 255, out=out)
+        return np.floor(out, out=out)
+
+    @cached_property
+    def color_filter(self):
+        """The LUT itself as a Pillow Color3DLUT (unit input domain only)."""
+        # Color3DLUT wants red changing fastest: [b][g][r] order
+        table = self.table.transpose(2, 1, 0, 3) / 255
+        return ImageFilter.Color3DLUT(self.size, table.ravel())
+
+def _cube_numbers(path, lineno, keyword, values, count, kind=float):
+    """count numbers of kind from a .cube line, or a ValueError naming the line."""
+    try:
+        numbers = tuple(kind(v) for v in values)
+    except ValueError:
+        numbers = ()
+    if len(numbers) != count:
+        raise ValueError(f"{path}:{lineno}: {keyword} expects {count} {kind.__name__} value(s), got {' '.join(values) or 'none'}")
+    return numbers
+
+@lru_cache(maxsize=16)
+def load_cube(path):
+    """Parse a .cube file (LUT_3D_SIZE, optional DOMAIN_MIN/DOMAIN_MAX) into a CubeLut."""
+    size = None
+    domain_min, domain_max = (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            keyword, *values = line.split()
+            if keyword == "LUT_3D_SIZE":
+                size, = _cube_numbers(path, lineno, keyword, values, 1, int)
+                if size < 2:
+                    raise ValueError(f"{path}:{lineno}: LUT_3D_SIZE must be at least 2, got {size}")
+            elif keyword == "LUT_1D_SIZE":
+                raise ValueError(f"{path}: 1D .cube LUTs are not supported")
+            elif keyword == "DOMAIN_MIN":
+                domain_min = _cube_numbers(path, lineno, keyword, values, 3)
+            elif keyword == "DOMAIN_MAX":
+                domain_max = _cube_numbers(path, lineno, keyword, values, 3)
+            elif keyword[0].isdigit() or keyword[0] in "-+.":
+                if len(values) != 2:
+                    raise ValueError(f"{path}:{lineno}: table rows need 3 values, got {line}")
+                rows.append(line)
+            # TITLE and other keywords carry no table data
+    if size is None:
+        raise ValueError(f"{path}: missing LUT_3D_SIZE")
+    if any(lo >= hi for lo, hi in zip(domain_min, domain_max)):
+        raise ValueError(f"{path}: DOMAIN_MIN {domain_min} must be below DOMAIN_MAX {domain_max}")
+    try:
+        data = np.array(" ".join(rows).split(), dtype=np.float32)
+    except ValueError as e:
+        raise ValueError(f"{path}: malformed table value ({e})") from None
+    if data.size != size ** 3 * 3:
+        raise ValueError(f"{path}: expected {size ** 3} entries, found {data.size // 3}")
+    # Rows run with red fastest, i.e. [b][g][r]; store as [r][g][b] on the 0..255 scale
+    table = data.reshape(size, size, size, 3).transpose(2, 1, 0, 3) * np.float32(255)
+    return CubeLut(table, domain_min, domain_max)
+
+@lru_cache(maxsize=32)
+def bake_lut(stages, size=LUT_SIZE):
+    """Sample a chain of pointwise stages on a size^3 lattice into a Color3DLUT."""
+    size = max(2, min(int(size), MAX_FILTER_SIZE))
+    levels = np.linspace(0, 255, size, dtype=np.float32)
+    # Lattice in Color3DLUT order ([b][g][r], red fastest), as one band
+    b, g, r = np.meshgrid(levels, levels, levels, indexing="ij")
+    src = np.stack([r, g, b], axis=-1).reshape(size * size, size, 3)
+    dst = np.empty_like(src)
+    for stage in stages:
+        src, dst = stage.apply_band(src, dst), src
+    return ImageFilter.Color3DLUT(size, (src / 255).ravel())
+
+def apply_lut_chain(img, stages, size=LUT_SIZE):
+    """
+    Apply a chain of pointwise stages to an RGBA image as one 3D LUT
+    lookup, in row stripes on the band thread pool.
+    """
+    stages = tuple(stages)
+    lone = stages[0] if len(stages) == 1 else None
+    if isinstance(lone, CubeLut) and lone.unit_domain and lone.size <= MAX_FILTER_SIZE:
+        # A lone .cube file is already a LUT: use it at its own resolution
+        lut = lone.color_filter
+    else:
+        lut = bake_lut(stages, size)
+    return apply_in_bands(lambda band, top: band.filter(lut), img)
+
+def cube_effects(lut_dir=LUT_DIR):
+    """{effect name: path} for the .cube files in lut_dir."""
+    try:
+        names = sorted(os.listdir(lut_dir))
+    except OSError:
+        return {}
+    return {os.path.splitext(name)[0]: os.path.join(lut_dir, name) for name in names if is_cube_path(name)}
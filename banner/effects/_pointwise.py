@@ -0,0 +1,139 @@
+# effects/_pointwise.py
+# Pointwise (per-pixel colour) effects and chain fusion
+#
+# A pointwise effect maps every RGB value on its own: an affine colour
+# matrix, the 8-bit clip and truncation the effect always ended with, and
+# an optional per-channel curve. Effects declare that form as a module-level
+# POINTWISE; apply_effects fuses a run of such effects into one banded
+# float32 pass instead of a float conversion, uint8 cast and mask paste
+# per effect. Alpha is never touched. Any object with apply_band and a
+# content hash (e.g. a .cube LUT, see _lut) can be a stage in a chain.
+
+import numpy as np
+from PIL import Image
+from core.parallel_utils import map_bands, row_bands
+from ._utils import LUMA_WEIGHTS
+
+# Rows per band in the fused pass; keeps the float32 band cache-sized
+POINTWISE_BAND_ROWS = 64
+
+def _affine(matrix, offset=(0, 0, 0)):
+    """4x4 homogeneous form of rgb' = matrix @ rgb + offset."""
+    m = np.eye(4)
+    m[:3, :3] = matrix
+    m[:3, 3] = offset
+    return m
+
+def tint_matrix(red_factor, green_factor, blue_factor):
+    """Per-channel gain."""
+    return _affine(np.diag([red_factor, green_factor, blue_factor]))
+
+def levels_matrix(scale, offset):
+    """rgb * scale + offset."""
+    return _affine(np.eye(3) * scale, (offset,) * 3)
+
+def contrast_matrix(factor):
+    """Contrast around mid-grey (127.5)."""
+    return levels_matrix(factor, 127.5 * (1 - factor))
+
+def saturation_matrix(factor):
+    """Scale the distance from Rec. 601 luma by factor."""
+    gray = np.tile(LUMA_WEIGHTS.astype(np.float64), (3, 1))
+    return _affine(np.eye(3) * factor + gray * (1 - factor))
+
+def grayscale_matrix():
+    """Rec. 601 luma into all three channels."""
+    return _affine(np.tile(LUMA_WEIGHTS.astype(np.float64), (3, 1)))
+
+def color_matrix(matrix):
+    """Arbitrary 3x3 colour matrix (e.g. sepia)."""
+    return _affine(np.asarray(matrix, dtype=np.float64))
+
+class Pointwise:
+    """
+    Declared pointwise form of an effect: the steps (homogeneous 4x4
+    matrices, applied in order and composed into one affine map), then the
+    clip and truncation to 0..255, then an optional (3, 256) per-channel
+    curve on the 8-bit result.
+    """
+
+    def __init__(self, *steps, curve=None):
+        composed = np.eye(4)
+        for step in steps:
+            composed = step @ composed
+        self.matrix = composed[:3, :3].T.astype(np.float32)  # for row vectors: rgb @ matrix
+        self.offset = composed[:3, 3].astype(np.float32)
+        self.curve = None if curve is None else np.asarray(curve, dtype=np.float32).reshape(3, 256)
+        # Content key: equal forms share baked LUTs (see _lut)
+        self.key = (self.matrix.tobytes(), self.offset.tobytes(),
+                    None if self.curve is None else self.curve.tobytes())
+
+    def __eq__(self, other):
+        return isinstance(other, Pointwise) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def apply_band(self, rgb, out):
+        """Apply to a float32 (rows, w, 3) band; the result is in out, rgb is scratch."""
+        np.matmul(rgb, self.matrix, out=out)
+        out += self.offset
+        np.clip(out, 0, 255, out=out)
+        np.floor(out, out=out)
+        if self.curve is not None:
+            for c in range(3):
+                out[..., c] = self.curve[c][out[..., c].astype(np.intp)]
+        return out
+
+class Mix:
+    """
+    A pointwise stage at partial strength: rgb + (stage(rgb) - rgb) * amount,
+    clipped and truncated to 8-bit levels like the stage itself.
+    """
+
+    def __init__(self, stage, amount):
+        self.stage = stage
+        self.amount = np.float32(amount)
+        self.key = (stage, float(self.amount))
+
+    def __eq__(self, other):
+        return isinstance(other, Mix) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def apply_band(self, rgb, out):
+        """Apply to a float32 (rows, w, 3) band; the result is in out, rgb is scratch."""
+        src = rgb.copy()
+        self.stage.apply_band(rgb, out)
+        out -= src
+        out *= self.amount
+        out += src
+        np.clip(out, 0, 255, out=out)
+        return np.floor(out, out=out)
+
+def apply_pointwise_chain(img, forms, band_rows=POINTWISE_BAND_ROWS):
+    """
+    Apply a sequence of Pointwise forms to an RGBA image in one pass: each
+    band of rows is converted to float32 once, run through every form and
+    written back as uint8. Row stripes run on the band thread pool (see
+    core.parallel_utils). Matches applying the effects one by one.
+    """
+    arr = np.array(img)
+    h, w = arr.shape[:2]
+    band_rows = band_rows or h
+    rgb = arr[:, :, :3]
+
+    def run(s0, s1):
+        band = np.empty((min(band_rows, s1 - s0), w, 3), dtype=np.float32)
+        spare = np.empty_like(band)
+        for r0 in range(s0, s1, band_rows):
+            r1 = min(s1, r0 + band_rows)
+            src, dst = band[:r1 - r0], spare[:r1 - r0]
+            src[...] = rgb[r0:r1]
+            for form in forms:
+                src, dst = form.apply_band(src, dst), src
+            rgb[r0:r1] = src
+
+    map_bands(run, row_bands(h, align=band_rows))
+    return Image.fromarray(arr, mode="RGBA")
@@ -1,46 +1,85 @@
 # effects/_utils.py
 # Shared utilities for effects generation
+#
+# Numeric policy: effects work on one float32 RGBA working array
+# (to_float32), modify it in place, and convert back once (to_image);
+# per-pixel colour effects go through _pointwise instead.
+# Constants are float32 so nothing promotes to float64; per-pixel masks
+# are 2D float32 and broadcast over the channels. Effects that need no
+# intermediate precision stay in uint8 and write through ufunc out=.
+# A float32 working copy is 4x the uint8 RGBA canvas on its own; single-
+# array effects peak at about 6x, blends of two layers (the neighborhood
+# effects) at about 12x. tests/test_memory.py holds every effect to these.
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageFilter
 import math
 
-def apply_saturation_boost(arr, factor):
-    """Apply saturation boost to RGB array."""
-    rgb = arr[:, :, :3] / 255.0
-    gray = 0.299 * rgb[:, :, 0] + 0.587 * rgb[:, :, 1] + 0.114 * rgb[:, :, 2]
-    return (gray[..., np.newaxis] + (rgb - gray[..., np.newaxis]) * factor) * 255.0
-
-def apply_contrast_adjustment(arr, factor):
-    """Apply contrast adjustment to RGB array."""
-    return ((arr[:, :, :3] / 255.0 - 0.5) * factor + 0.5) * 255.0
-
-def apply_color_tint(arr, red_factor, green_factor, blue_factor):
-    """Apply color tint to RGB array."""
-    arr[:, :, 0] *= red_factor
-    arr[:, :, 1] *= green_factor
-    arr[:, :, 2] *= blue_factor
-    return arr
-
-def create_vignette_mask(h, w, strength=0.3):
-    """Create a vignette mask."""
-    y, x = np.ogrid[:h, :w]
+# Rec. 601 luma weights
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+def to_float32(img):
+    """float32 RGBA working array for an image."""
+    return np.asarray(img, dtype=np.float32)
+
+def to_image(arr):
+    """Clip a float32 working array in place and convert it to an RGBA image."""
+    np.clip(arr, 0, 255, out=arr)
+    return Image.fromarray(arr.astype(np.uint8), mode="RGBA")
+
+def mix_images(before, after, amount):
+    """before + (after - before) * amount for two RGBA images, as an RGBA image."""
+    arr = to_float32(after)
+    base = to_float32(before)
+    arr -= base
+    arr *= np.float32(amount)
+    arr += base
+    return to_image(arr)
+
+def luminance(arr):
+    """Rec. 601 luma of the RGB channels (uint8 or float32), float32 (h, w)."""
+    gray = arr[:, :, 0] * LUMA_WEIGHTS[0]
+    gray += arr[:, :, 1] * LUMA_WEIGHTS[1]
+    gray += arr[:, :, 2] * LUMA_WEIGHTS[2]
+    return gray
+
+def create_vignette_mask(h, w, strength=0.3, rows=None):
+    """Create a float32 vignette mask for an h x w image (only rows (r0, r1) if given)."""
+    r0, r1 = rows or (0, h)
+    y, x = np.ogrid[r0:r1, :w]
     center_x, center_y = w // 2, h // 2
-    
+
     # Distance from center
-    distance = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-    max_distance = np.sqrt(center_x**2 + center_y**2)
-    
-    # Vignette mask
-    vignette_mask = 1.0 - (distance / max_distance) * strength
-    return np.clip(vignette_mask, 1.0 - strength, 1.0)
+    dx = (x - center_x).astype(np.float32)
+    dy = (y - center_y).astype(np.float32)
+    distance = dx * dx + dy * dy
+    np.sqrt(distance, out=distance)
+    max_distance = np.float32(math.hypot(center_x, center_y))
+
+    # Vignette mask: 1 - distance / max_distance * strength, in place
+    vignette_mask = distance
+    vignette_mask *= -np.float32(strength) / max_distance
+    vignette_mask += np.float32(1.0)
+    return np.clip(vignette_mask, 1.0 - strength, 1.0, out=vignette_mask)
 
 def screen_blend(base, overlay, opacity=1.0):
-    """Screen blend mode: result = 1 - (1-base)(1-overlay)"""
-    result = 255 - (255 - base) * (255 - overlay * opacity) / 255
-    return np.clip(result, 0, 255)
+    """
+    Screen blend mode: result = 1 - (1-base)(1-overlay), written into the
+    float32 base array. overlay's buffer is reused as scratch.
+    """
+    overlay *= np.float32(-opacity)
+    overlay += 255
+    base -= 255
+    base *= overlay
+    base *= np.float32(1 / 255)
+    base += 255
+    return np.clip(base, 0, 255, out=base)
 
 def soft_light_blend(base, overlay, opacity=0.3):
-    """Soft light blend mode."""
-    result = base + overlay * opacity
-    return np.clip(result, 0, 255)
\ No newline at end of file
+    """
+    Soft light blend mode, written into the float32 base array. overlay's
+    buffer is reused as scratch.
+    """
+    overlay *= np.float32(opacity)
+    base += overlay
+    return np.clip(base, 0, 255, out=base)
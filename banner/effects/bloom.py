@@ -2,45 +2,40 @@
 # Bloom effect generation
 
 import numpy as np
-from PIL import Image, ImageFilter
+from PIL import Image
+from core.layer_utils import blur_reach, pyramid_blur
+from core.plugin_utils import PluginInfo
+from ._utils import to_float32, to_image, luminance, screen_blend
 
-def apply_bloom(img):
+# Bloom blur radius (pixels)
+BLOOM_RADIUS = 8
+
+PLUGIN = PluginInfo(kind="neighborhood", radius=blur_reach(BLOOM_RADIUS), params=('effect_blur_quality',))
+
+def apply_bloom(img, blur_quality=1.0):
     """Apply bloom effect - brightness-based gradient bloom."""
-    arr = np.array(img).astype(np.float32)
+    src = np.array(img)
     
     # Calculate brightness (luminance) for each pixel
-    brightness = (arr[:, :, 0] * 0.299 + arr[:, :, 1] * 0.587 + arr[:, :, 2] * 0.114)
+    brightness = luminance(src)
     
     # Create gradient bloom strength based on brightness
     # White (255) = full bloom, darker colors = less bloom
-    bloom_strength = np.zeros_like(brightness)
-    
     # Gradient bloom: starts at 160, full at 220+ (lowered thresholds)
-    mask_medium = brightness >= 160
-    mask_bright = brightness >= 220
-    
-    # Medium brightness: gradual bloom increase
-    bloom_strength[mask_medium] = (brightness[mask_medium] - 160) / (220 - 160)
-    # High brightness: full bloom
-    bloom_strength[mask_bright] = 1.0
+    bloom_strength = brightness
+    bloom_strength -= 160
+    bloom_strength *= np.float32(1 / (220 - 160))
+    np.clip(bloom_strength, 0, 1, out=bloom_strength)
     
-    # Apply bloom strength to each color channel
-    bloom_arr = np.zeros_like(arr)
-    for i in range(3):  # RGB channels
-        bloom_arr[:, :, i] = arr[:, :, i] * bloom_strength
-    
-    # Alpha channel stays original
-    bloom_arr[:, :, 3] = arr[:, :, 3]
+    # Apply bloom strength to each color channel, straight into uint8;
+    # alpha channel stays original
+    bloom_arr = src.copy()
+    np.multiply(src[:, :, :3], bloom_strength[..., np.newaxis], out=bloom_arr[:, :, :3], casting='unsafe')
     
     # Convert to PIL and blur
-    bloom_layer = Image.fromarray(bloom_arr.astype(np.uint8), mode="RGBA")
-    bloom_blurred = bloom_layer.filter(ImageFilter.GaussianBlur(radius=8))
-    
-    # Blend with original (screen blend mode)
-    bloom_arr = np.array(bloom_blurred).astype(np.float32)
+    bloom_layer = Image.fromarray(bloom_arr, mode="RGBA")
+    bloom_blurred = pyramid_blur(bloom_layer, BLOOM_RADIUS, blur_quality)
     
     # Slightly stronger screen blend
-    result = 255 - (255 - arr) * (255 - bloom_arr * 0.8) / 255
-    result = np.clip(result, 0, 255).astype(np.uint8)
-    
-    return Image.fromarray(result, mode="RGBA")
\ No newline at end of file
+    arr = screen_blend(to_float32(img), to_float32(bloom_blurred), opacity=0.8)
+    return to_image(arr)
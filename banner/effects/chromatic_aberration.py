@@ -3,6 +3,10 @@
 
 import numpy as np
 from PIL import Image
+from core.plugin_utils import PluginInfo
+
+# Red and blue shift two pixels sideways
+PLUGIN = PluginInfo(kind="neighborhood", radius=2)
 
 def apply_chromatic_aberration(img):
     """Apply chromatic aberration - RGB channel offset."""
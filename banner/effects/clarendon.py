@@ -1,19 +1,14 @@
 # effects/clarendon.py
 # Clarendon effect generation
 
-import numpy as np
-from PIL import Image
-from ._utils import apply_contrast_adjustment, apply_saturation_boost
+from ._pointwise import Pointwise, apply_pointwise_chain, contrast_matrix, saturation_matrix
+
+# Clarendon filter - bright highlights, dark shadows, as one pointwise colour map
+POINTWISE = Pointwise(
+    contrast_matrix(1.5),  # High contrast curve
+    saturation_matrix(1.3),  # Boost saturation
+)
 
 def apply_clarendon(img):
     """Apply Clarendon filter - bright highlights, dark shadows."""
-    arr = np.array(img).astype(np.float32)
-    
-    # High contrast curve
-    arr[:, :, :3] = apply_contrast_adjustment(arr, 1.5)
-    
-    # Boost saturation
-    arr[:, :, :3] = apply_saturation_boost(arr, 1.3)
-    
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
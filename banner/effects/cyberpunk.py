@@ -1,19 +1,14 @@
 # effects/cyberpunk.py
 # Cyberpunk effect generation
 
-import numpy as np
-from PIL import Image
-from ._utils import apply_contrast_adjustment, apply_color_tint
+from ._pointwise import Pointwise, apply_pointwise_chain, contrast_matrix, tint_matrix
+
+# cyberpunk filter - neon cyan/magenta with high contrast, as one pointwise colour map
+POINTWISE = Pointwise(
+    contrast_matrix(1.4),  # High contrast
+    tint_matrix(1.2, 0.9, 1.3),  # Cyan/magenta color shift
+)
 
 def apply_cyberpunk(img):
     """Apply cyberpunk filter - neon cyan/magenta with high contrast."""
-    arr = np.array(img).astype(np.float32)
-    
-    # High contrast
-    arr[:, :, :3] = apply_contrast_adjustment(arr, 1.4)
-    
-    # Cyan/magenta color shift
-    arr = apply_color_tint(arr, 1.2, 0.9, 1.3)
-    
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
@@ -1,19 +1,14 @@
 # effects/dramatic.py
 # Dramatic effect generation
 
-import numpy as np
-from PIL import Image
-from ._utils import apply_contrast_adjustment, apply_saturation_boost
+from ._pointwise import Pointwise, apply_pointwise_chain, contrast_matrix, saturation_matrix
+
+# dramatic filter - high contrast and saturation, as one pointwise colour map
+POINTWISE = Pointwise(
+    contrast_matrix(1.3),  # Increase contrast
+    saturation_matrix(1.2),  # Increase saturation
+)
 
 def apply_dramatic(img):
     """Apply dramatic filter - high contrast and saturation."""
-    arr = np.array(img).astype(np.float32)
-    
-    # Increase contrast
-    arr[:, :, :3] = apply_contrast_adjustment(arr, 1.3)
-    
-    # Increase saturation
-    arr[:, :, :3] = apply_saturation_boost(arr, 1.2)
-    
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
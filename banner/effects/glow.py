@@ -2,22 +2,26 @@
 # Glow effect generation
 
 import numpy as np
-from PIL import Image, ImageFilter
-from ._utils import soft_light_blend
+from core.layer_utils import blur_reach, pyramid_blur
+from core.plugin_utils import PluginInfo
+from ._utils import to_float32, to_image, soft_light_blend
 
-def apply_glow(img):
+# Glow blur radius (pixels)
+GLOW_RADIUS = 3
+
+PLUGIN = PluginInfo(kind="neighborhood", radius=blur_reach(GLOW_RADIUS), params=('effect_blur_quality',))
+
+def apply_glow(img, blur_quality=1.0):
     """Apply overall glow effect - soft luminous appearance."""
     # Create glow version
-    glow_img = img.filter(ImageFilter.GaussianBlur(radius=3))
+    glow_img = pyramid_blur(img, GLOW_RADIUS, blur_quality)
     
-    # Brighten the glow
-    glow_arr = np.array(glow_img).astype(np.float32)
-    glow_arr[:, :, :3] = np.clip(glow_arr[:, :, :3] * 1.3, 0, 255)
-    glow_bright = Image.fromarray(glow_arr.astype(np.uint8), mode="RGBA")
+    # Brighten the glow, truncated to whole values like an 8-bit layer
+    glow_arr = to_float32(glow_img)
+    glow_arr[:, :, :3] *= np.float32(1.3)
+    np.clip(glow_arr, 0, 255, out=glow_arr)
+    np.trunc(glow_arr, out=glow_arr)
     
     # Blend with original using soft light
-    original_arr = np.array(img).astype(np.float32)
-    glow_arr = np.array(glow_bright).astype(np.float32)
-    
-    result = soft_light_blend(original_arr, glow_arr)
-    return Image.fromarray(result.astype(np.uint8), mode="RGBA")
\ No newline at end of file
+    result = soft_light_blend(to_float32(img), glow_arr)
+    return to_image(result)
@@ -1,22 +1,15 @@
 # effects/lark.py
 # Lark effect generation
 
-import numpy as np
-from PIL import Image
-from ._utils import apply_saturation_boost, apply_color_tint
+from ._pointwise import Pointwise, apply_pointwise_chain, levels_matrix, saturation_matrix, tint_matrix
+
+# Lark filter - bright, airy, desaturated, as one pointwise colour map
+POINTWISE = Pointwise(
+    levels_matrix(1.0, 20),  # Brighten overall
+    saturation_matrix(0.7),  # Desaturate
+    tint_matrix(0.95, 1.0, 1.05),  # Cool tone
+)
 
 def apply_lark(img):
     """Apply Lark filter - bright, airy, desaturated."""
-    arr = np.array(img).astype(np.float32)
-    
-    # Brighten overall
-    arr[:, :, :3] += 20
-    
-    # Desaturate
-    arr[:, :, :3] = apply_saturation_boost(arr, 0.7)
-    
-    # Cool tone
-    arr = apply_color_tint(arr, 0.95, 1.0, 1.05)
-    
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
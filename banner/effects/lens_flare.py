@@ -2,169 +2,215 @@
 # Lens flare effect generation
 
 import numpy as np
-from PIL import Image, ImageFilter
+from PIL import Image
 import math
+from functools import lru_cache
+from core.layer_utils import blur_reach, pyramid_blur
+from core.plugin_utils import PluginInfo
+from ._utils import screen_blend
+
+# The flare is screened over each pixel independently of its neighbours
+PLUGIN = PluginInfo(kind="pointwise", supersampled=True, positional=True, params=(
+    'effect_position', 'effect_scale', 'effect_x', 'effect_y', 'effect_blur_quality'))
+
+# Contributions below this many 8-bit levels are dropped: each element is a
+# sprite covering only the radius where it is still visible
+FLARE_CUTOFF = 0.5
+
+# Widest blur layer radius (in pixels) and the margin it needs around the flare:
+# as far as that blur reaches, so the glow ends where a full-canvas blur's would
+FLARE_MAX_BLUR = 15
+FLARE_BLUR_PAD = blur_reach(FLARE_MAX_BLUR)
+
+# Ghost layout along the flare -> centre axis: (position, base size, intensity,
+# fade radius, fade gain, ring centre, ring width, ring gain), radii in ghost sizes
+GHOSTS = [
+    (0.2, 25, 1.0, 0.6, 150, None, None, 0),  # Small bright white-yellow ghost - intense center
+    (0.4, 45, 0.9, 0.8, 120, 0.6, 0.15, 50),  # Medium orange ghost - warm with strong ring
+    (0.7, 75, 0.8, 0.9, 100, 0.7, 0.2, 35),   # Large green ghost - distinctive color, medium ring
+    (0.9, 100, 0.5, 1.0, 80, 0.8, 0.3, 25),   # Outer purple ghost - subtle outer glow, visible outer ring
+]
+
+def _support(amplitude, radius, centre=0.0):
+    """Distance at which amplitude * exp(-|d - centre| / radius) falls below FLARE_CUTOFF."""
+    return centre + radius * math.log(max(amplitude / FLARE_CUTOFF, 1.0))
+
+def _radial_grid(extent):
+    """float32 distances from the centre of a (2 * extent + 1)^2 grid."""
+    y, x = np.ogrid[-extent:extent + 1, -extent:extent + 1]
+    return np.hypot(x.astype(np.float32), y.astype(np.float32))
+
+def _sprite(channels, extent):
+    """Cache form of a sprite: one 'F' image per RGB channel, plus its extent."""
+    return tuple(Image.fromarray(np.ascontiguousarray(c, dtype=np.float32), mode="F") for c in channels), extent
+
+@lru_cache(maxsize=16)
+def core_sprite(core_color, intensity):
+    """
+    Core, warm ring and warm glow at canonical scale (1 px per flare unit),
+    summed per channel, out to where the glow fades below FLARE_CUTOFF.
+    """
+    base_intensity = 250 * intensity  # Increased intensity for better visibility
+    # (radius, amplitude, RGB weights) per element
+    elements = [
+        (5, base_intensity * 1.2, [c / 255 for c in core_color]),  # Bright center - more intense and larger
+        (15, base_intensity * 0.8, (1.0, 0.6, 0.3)),  # Orange-pink ring - warmer and more prominent
+        (80, base_intensity * 0.4, (0.8, 0.5, 0.2)),  # Large warm glow - more visible and warmer
+    ]
+    extent = int(math.ceil(max(_support(a * max(w), r) for r, a, w in elements))) + 1
+    dist = _radial_grid(extent)
+    channels = np.zeros((3,) + dist.shape, dtype=np.float32)
+    for radius, amplitude, weights in elements:
+        field = np.exp(dist * np.float32(-1.0 / radius))
+        field *= np.float32(amplitude)
+        for c in range(3):
+            channels[c] += field * np.float32(weights[c])
+    return _sprite(channels, extent)
+
+@lru_cache(maxsize=32)
+def ghost_sprite(index, color):
+    """One ghost at canonical scale: fade plus ring, clipped, tinted by color."""
+    _, size, intensity, fade_radius, fade_gain, ring_centre, ring_width, ring_gain = GHOSTS[index]
+    amplitude = intensity * fade_gain
+    reach = _support(amplitude, size * fade_radius)
+    if ring_centre is not None:
+        reach = max(reach, _support(ring_gain, size * ring_width, size * ring_centre))
+    extent = int(math.ceil(reach)) + 1
+    dist = _radial_grid(extent)
+    fade = np.exp(dist * np.float32(-1.0 / (size * fade_radius)))
+    fade *= np.float32(amplitude)
+    if ring_centre is not None:
+        ring = np.abs(dist - np.float32(size * ring_centre))
+        ring *= np.float32(-1.0 / (size * ring_width))
+        np.exp(ring, out=ring)
+        ring *= np.float32(ring_gain)
+        fade += ring
+    np.clip(fade, 0, 255, out=fade)
+    return _sprite([fade * np.float32(c / 255) for c in color[:3]], extent)
+
+def _sprite_box(sprite, center, scale, bounds):
+    """
+    Destination box (x0, y0, x1, y1) covered by a sprite drawn at center with
+    the given scale, clipped to bounds, or None if it misses them.
+    """
+    reach = (sprite[1] - 1) * scale
+    cx, cy = center
+    x0, y0 = max(bounds[0], math.ceil(cx - reach)), max(bounds[1], math.ceil(cy - reach))
+    x1, y1 = min(bounds[2], math.floor(cx + reach) + 1), min(bounds[3], math.floor(cy + reach) + 1)
+    return (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
+
+def _add_sprite(layer, origin, sprite, center, scale, box):
+    """Resample a sprite bilinearly into box of a float32 (h, w, 3) layer at origin."""
+    images, extent = sprite
+    side = 2 * extent + 1
+    x0, y0, x1, y1 = box
+    # Destination pixel x samples the sprite at (x - cx) / scale + extent
+    sx0 = (x0 - center[0]) / scale + extent + 0.5 - 0.5 / scale
+    sy0 = (y0 - center[1]) / scale + extent + 0.5 - 0.5 / scale
+    source = (max(0.0, sx0), max(0.0, sy0),
+              min(side, sx0 + (x1 - x0) / scale), min(side, sy0 + (y1 - y0) / scale))
+    target = layer[y0 - origin[1]:y1 - origin[1], x0 - origin[0]:x1 - origin[0]]
+    for c, image in enumerate(images):
+        target[..., c] += np.asarray(image.resize((x1 - x0, y1 - y0), Image.BILINEAR, box=source))
+
+def apply_lens_flare(img, position="top_right", scale=1.0, SS=1, custom_x=None, custom_y=None,
+                    core_color=(255, 255, 255), ghost_colors=None, intensity=1.0,
+                    spike_enabled=True, hexagon_enabled=True, blur_layers=3, blur_quality=1.0):
+    """
+    Apply lens flare effect - enhanced version matching reference quality with full customization.
+
+    Core and ghosts are cached sprites at canonical scale, resampled only
+    where they are visible; blurring and blending run on the flare's own
+    bounding box, so the cost follows the flare size, not the banner size.
+    """
+    w, h = img.size
 
-def apply_lens_flare(img, position="top_right", scale=1.0, SS=1, custom_x=None, custom_y=None, 
-                    core_color=(255, 255, 255), ghost_colors=None, intensity=1.0, 
-                    spike_enabled=True, hexagon_enabled=True, blur_layers=3):
-    """Apply lens flare effect - enhanced version matching reference quality with full customization."""
-    arr = np.array(img).astype(np.float32)
-    h, w = arr.shape[:2]
-    
     # Scale with SuperSampling
     scale = scale * SS
-    
+
     # Enhanced colors for 4 ghost system
     if ghost_colors is None:
         ghost_colors = [
             (255, 255, 200),  # Bright white-yellow ghost
             (255, 140, 60),   # Warm orange ghost
-            (60, 180, 120),   # Green ghost  
+            (60, 180, 120),   # Green ghost
             (180, 100, 200),  # Purple ghost
         ]
-    
+
     # Calculate flare position - custom coordinates override preset positions
     if custom_x is not None and custom_y is not None:
         pos_x, pos_y = custom_x, custom_y
     else:
         position_map = {
             "top_left": (0.15, 0.15),
-            "top_right": (0.85, 0.15), 
+            "top_right": (0.85, 0.15),
             "center": (0.5, 0.5),
             "bottom_left": (0.15, 0.85),
             "bottom_right": (0.85, 0.85)
         }
         pos_x, pos_y = position_map.get(position, (0.85, 0.15))
-    
+
     flare_x, flare_y = int(w * pos_x), int(h * pos_y)
     center_x, center_y = w // 2, h // 2
-    
-    # Calculate vector from flare to center for lens elements
+
+    # Vector from flare to center for lens elements
     vec_x = center_x - flare_x
     vec_y = center_y - flare_y
-    vec_length = math.sqrt(vec_x**2 + vec_y**2)
-    
-    # Normalize vector
-    if vec_length > 0:
-        vec_x_norm = vec_x / vec_length
-        vec_y_norm = vec_y / vec_length
-    else:
-        vec_x_norm = vec_y_norm = 0
-    
-    # Create flare elements directly on the array for better blending
-    flare_arr = np.zeros_like(arr)
-    
-    # Anti-aliased core like real Photoshop - no hard edges
-    y_indices, x_indices = np.ogrid[:h, :w]
-    core_dist = np.sqrt((x_indices - flare_x)**2 + (y_indices - flare_y)**2)
-    
-    # Smooth core system - completely gradient-based (no masks)
-    base_intensity = 250 * intensity  # Increased intensity for better visibility
-    
-    # 1. Bright white center - more intense and larger
-    core_center = np.exp(-core_dist / (5 * scale)) * base_intensity
-    flare_arr[:, :, 0] += core_center * 1.2
-    flare_arr[:, :, 1] += core_center * 1.2  
-    flare_arr[:, :, 2] += core_center * 1.2
-    
-    # 2. Orange-pink ring - warmer and more prominent
-    warm_ring = np.exp(-core_dist / (15 * scale)) * (base_intensity * 0.8)
-    flare_arr[:, :, 0] += warm_ring * 1.0  # Strong orange
-    flare_arr[:, :, 1] += warm_ring * 0.6  # Warm orange
-    flare_arr[:, :, 2] += warm_ring * 0.3  # Orange tint
-    
-    # 3. Large warm glow - more visible and warmer
-    warm_glow = np.exp(-core_dist / (80 * scale)) * (base_intensity * 0.4)
-    flare_arr[:, :, 0] += warm_glow * 0.8  # Warm glow
-    flare_arr[:, :, 1] += warm_glow * 0.5  # Warm glow
-    flare_arr[:, :, 2] += warm_glow * 0.2  # Warm glow
-    
-    # Enhanced 4-ghost system for more dramatic effect
-    ghost_positions = [0.2, 0.4, 0.7, 0.9]  # More distributed ghosts
-    ghost_sizes = [
-        int(25*scale),   # Small bright ghost
-        int(45*scale),   # Medium orange ghost
-        int(75*scale),   # Large green ghost  
-        int(100*scale),  # Outer purple ghost
-    ]
-    ghost_intensities = [1.0, 0.9, 0.8, 0.5]  # Strong intensities
-    
-    for i, t in enumerate(ghost_positions):
-        if i < len(ghost_colors):
-            ghost_x = int(flare_x + vec_x * t)
-            ghost_y = int(flare_y + vec_y * t)
-            ghost_size = ghost_sizes[i]
-            ghost_color = ghost_colors[i]
-            ghost_intensity = ghost_intensities[i]
-            
-            # Reference-style circular ghost with very prominent ring structure
-            ghost_dist = np.sqrt((x_indices - ghost_x)**2 + (y_indices - ghost_y)**2)
-            ghost_mask = ghost_dist < ghost_size
-            
-            # Enhanced ghost rendering with stronger effects
-            if i == 0:  # Bright white-yellow ghost - intense center
-                ghost_fade = np.exp(-ghost_dist / (ghost_size * 0.6)) * ghost_intensity * 150
-            elif i == 1:  # Orange ghost - warm with strong ring
-                ghost_fade = np.exp(-ghost_dist / (ghost_size * 0.8)) * ghost_intensity * 120
-                ring_factor = np.exp(-abs(ghost_dist - ghost_size * 0.6) / (ghost_size * 0.15))
-                ghost_fade += ring_factor * 50  # Strong ring
-            elif i == 2:  # Green ghost - distinctive color
-                ghost_fade = np.exp(-ghost_dist / (ghost_size * 0.9)) * ghost_intensity * 100
-                ring_factor = np.exp(-abs(ghost_dist - ghost_size * 0.7) / (ghost_size * 0.2))
-                ghost_fade += ring_factor * 35  # Medium ring
-            else:  # Purple ghost - subtle outer glow
-                ghost_fade = np.exp(-ghost_dist / (ghost_size * 1.0)) * ghost_intensity * 80
-                outer_factor = np.exp(-abs(ghost_dist - ghost_size * 0.8) / (ghost_size * 0.3))
-                ghost_fade += outer_factor * 25  # Visible outer ring
-                
-            ghost_fade = np.clip(ghost_fade, 0, 255)
-            
-            # Apply to all pixels (no masking for smooth edges)
-            flare_arr[:, :, 0] += ghost_fade * ghost_color[0] / 255
-            flare_arr[:, :, 1] += ghost_fade * ghost_color[1] / 255
-            flare_arr[:, :, 2] += ghost_fade * ghost_color[2] / 255
-    
+
+    # Smooth core system - completely gradient-based (no masks), then the
+    # enhanced 4-ghost system along the flare -> center axis
+    elements = [(core_sprite(tuple(core_color[:3]), intensity), (flare_x, flare_y))]
+    for i, ghost in enumerate(GHOSTS[:len(ghost_colors)]):
+        ghost_center = (int(flare_x + vec_x * ghost[0]), int(flare_y + vec_y * ghost[0]))
+        elements.append((ghost_sprite(i, tuple(ghost_colors[i][:3])), ghost_center))
+
+    canvas = (0, 0, w, h)
+    boxes = [_sprite_box(sprite, center, scale, canvas) for sprite, center in elements]
+    visible = [box for box in boxes if box is not None]
+    if not visible:
+        return img.copy()
+
+    # Local flare layer: every visible element plus room for the widest blur
+    pad = FLARE_BLUR_PAD if blur_layers >= 1 else 0
+    lx0 = max(0, min(b[0] for b in visible) - pad)
+    ly0 = max(0, min(b[1] for b in visible) - pad)
+    lx1 = min(w, max(b[2] for b in visible) + pad)
+    ly1 = min(h, max(b[3] for b in visible) + pad)
+    flare_arr = np.zeros((ly1 - ly0, lx1 - lx0, 3), dtype=np.float32)
+    for (sprite, center), box in zip(elements, boxes):
+        if box is not None:
+            _add_sprite(flare_arr, (lx0, ly0), sprite, center, scale, box)
+
     # Clip flare values
-    flare_arr = np.clip(flare_arr, 0, 255)
-    
+    np.clip(flare_arr, 0, 255, out=flare_arr)
+
     # Very soft blur layers like Photoshop - subtle and gradual
-    flare_img = Image.fromarray(flare_arr.astype(np.uint8), mode="RGBA")
-    
-    if blur_layers >= 1:
-        # Subtle light blur
-        flare_light_blur = flare_img.filter(ImageFilter.GaussianBlur(radius=1.5))
-        flare_light_arr = np.array(flare_light_blur).astype(np.float32)
-    else:
-        flare_light_arr = flare_arr
-    
-    if blur_layers >= 2:
-        # Medium soft blur
-        flare_medium_blur = flare_img.filter(ImageFilter.GaussianBlur(radius=6))
-        flare_medium_arr = np.array(flare_medium_blur).astype(np.float32)
-    else:
-        flare_medium_arr = np.zeros_like(flare_arr)
-    
-    if blur_layers >= 3:
-        # Wide but very subtle blur like Photoshop
-        flare_heavy_blur = flare_img.filter(ImageFilter.GaussianBlur(radius=15))
-        flare_heavy_arr = np.array(flare_heavy_blur).astype(np.float32)
-    else:
-        flare_heavy_arr = np.zeros_like(flare_arr)
-    
-    # Very subtle layer combination like Photoshop
+    flare_img = Image.fromarray(flare_arr.astype(np.uint8), mode="RGB")
+
+    def blurred(radius):
+        return np.asarray(pyramid_blur(flare_img, radius, blur_quality))
+
+    # Very subtle layer combination like Photoshop: light (1.5), medium soft
+    # (6) and wide but very subtle (15) blurs, weighted into final_flare
     if blur_layers == 1:
-        final_flare = flare_arr * 0.8 + flare_light_arr * 0.2
+        weights = [(None, 0.8), (1.5, 0.2)]
     elif blur_layers == 2:
-        final_flare = flare_arr * 0.6 + flare_light_arr * 0.25 + flare_medium_arr * 0.15
-    else:  # 3 or more - very subtle blend
-        final_flare = (flare_arr * 0.5 + 
-                       flare_light_arr * 0.25 + 
-                       flare_medium_arr * 0.15 + 
-                       flare_heavy_arr * 0.1)
-    
-    # Screen blend mode: result = 1 - (1-base)(1-flare)
-    result = 255 - (255 - arr) * (255 - final_flare) / 255
-    result = np.clip(result, 0, 255).astype(np.uint8)
-    
-    return Image.fromarray(result, mode="RGBA")
\ No newline at end of file
+        weights = [(None, 0.6), (1.5, 0.25), (6, 0.15)]
+    elif blur_layers >= 3:  # 3 or more - very subtle blend
+        weights = [(None, 0.5), (1.5, 0.25), (6, 0.15), (FLARE_MAX_BLUR, 0.1)]
+    else:  # No blur layers: the light layer is the sharp flare itself
+        weights = [(None, 0.75)]
+    final_flare = flare_arr
+    final_flare *= np.float32(weights[0][1])
+    for radius, weight in weights[1:]:
+        layer = blurred(radius)
+        # Channel by channel, so only one float32 plane is ever temporary
+        for c in range(3):
+            final_flare[..., c] += layer[..., c] * np.float32(weight)
+
+    # Screen blend mode: result = 1 - (1-base)(1-flare), on the flare's box only
+    region = np.array(img.crop((lx0, ly0, lx1, ly1)))
+    region[..., :3] = screen_blend(region[..., :3].astype(np.float32), final_flare)
+    result = img.copy()
+    result.paste(Image.fromarray(region, mode="RGBA"), (lx0, ly0))
+    return result
@@ -1,19 +1,14 @@
 # effects/matte.py
 # Matte effect generation
 
-import numpy as np
-from PIL import Image
-from ._utils import apply_saturation_boost
+from ._pointwise import Pointwise, apply_pointwise_chain, levels_matrix, saturation_matrix
+
+# matte filter - lifted blacks, film look, as one pointwise colour map
+POINTWISE = Pointwise(
+    levels_matrix(0.9, 25),  # Lift blacks (add slight brightness to dark areas)
+    saturation_matrix(0.8),  # Slight desaturation
+)
 
 def apply_matte(img):
     """Apply matte filter - lifted blacks, film look."""
-    arr = np.array(img).astype(np.float32)
-    
-    # Lift blacks (add slight brightness to dark areas)
-    arr[:, :, :3] = arr[:, :, :3] * 0.9 + 25
-    
-    # Slight desaturation
-    arr[:, :, :3] = apply_saturation_boost(arr, 0.8)
-    
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
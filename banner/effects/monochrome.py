@@ -1,19 +1,13 @@
 # effects/monochrome.py
 # Monochrome effect generation
 
-import numpy as np
-from PIL import Image
+from ._pointwise import Pointwise, apply_pointwise_chain, grayscale_matrix
+
+# monochrome filter - black and white, as one pointwise colour map
+POINTWISE = Pointwise(
+    grayscale_matrix(),  # Convert to grayscale using luminance formula
+)
 
 def apply_monochrome(img):
     """Apply monochrome filter - black and white."""
-    arr = np.array(img)
-    
-    # Convert to grayscale using luminance formula
-    gray = 0.299 * arr[:, :, 0] + 0.587 * arr[:, :, 1] + 0.114 * arr[:, :, 2]
-    
-    # Apply to RGB channels
-    arr[:, :, 0] = gray
-    arr[:, :, 1] = gray
-    arr[:, :, 2] = gray
-    
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
@@ -1,25 +1,16 @@
 # effects/reyes.py
 # Reyes effect generation
 
-import numpy as np
-from PIL import Image
-from ._utils import apply_contrast_adjustment, apply_color_tint, apply_saturation_boost
+from ._pointwise import Pointwise, apply_pointwise_chain, contrast_matrix, levels_matrix, saturation_matrix, tint_matrix
+
+# Reyes filter - vintage, faded, lifted blacks, as one pointwise colour map
+POINTWISE = Pointwise(
+    levels_matrix(0.8, 40),  # Lift blacks significantly
+    contrast_matrix(0.8),  # Reduce contrast
+    tint_matrix(1.1, 1.05, 0.9),  # Warm, faded tone
+    saturation_matrix(0.6),  # Desaturate
+)
 
 def apply_reyes(img):
     """Apply Reyes filter - vintage, faded, lifted blacks."""
-    arr = np.array(img).astype(np.float32)
-    
-    # Lift blacks significantly
-    arr[:, :, :3] = arr[:, :, :3] * 0.8 + 40
-    
-    # Reduce contrast
-    arr[:, :, :3] = apply_contrast_adjustment(arr, 0.8)
-    
-    # Warm, faded tone
-    arr = apply_color_tint(arr, 1.1, 1.05, 0.9)
-    
-    # Desaturate
-    arr[:, :, :3] = apply_saturation_boost(arr, 0.6)
-    
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
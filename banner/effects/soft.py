@@ -2,18 +2,25 @@
 # Soft effect generation
 
 import numpy as np
-from PIL import Image, ImageFilter
+from core.layer_utils import blur_reach, pyramid_blur
+from core.plugin_utils import PluginInfo
+from ._utils import to_float32, to_image
 
-def apply_soft(img):
+# Soft blur radius (pixels)
+SOFT_RADIUS = 2.0
+
+PLUGIN = PluginInfo(kind="neighborhood", radius=blur_reach(SOFT_RADIUS), params=('effect_blur_quality',))
+
+def apply_soft(img, blur_quality=1.0):
     """Apply soft filter - gentle blur for dreamy effect."""
     # Light gaussian blur
-    blurred = img.filter(ImageFilter.GaussianBlur(radius=2.0))  # Stronger blur
+    blurred = pyramid_blur(img, SOFT_RADIUS, blur_quality)  # Stronger blur
     
     # Blend with original (60% original, 40% blurred)
-    arr_orig = np.array(img).astype(np.float32)
-    arr_blur = np.array(blurred).astype(np.float32)
-    
-    result = arr_orig * 0.6 + arr_blur * 0.4  # More blur effect
-    result = np.clip(result, 0, 255).astype(np.uint8)
+    result = to_float32(img)
+    result *= np.float32(0.6)
+    blurred_arr = to_float32(blurred)
+    blurred_arr *= np.float32(0.4)  # More blur effect
+    result += blurred_arr
     
-    return Image.fromarray(result, mode="RGBA")
\ No newline at end of file
+    return to_image(result)
@@ -1,22 +1,15 @@
 # effects/valencia.py
 # Valencia effect generation
 
-import numpy as np
-from PIL import Image
-from ._utils import apply_contrast_adjustment, apply_color_tint
+from ._pointwise import Pointwise, apply_pointwise_chain, contrast_matrix, levels_matrix, tint_matrix
+
+# Valencia filter - warm, dreamy, soft contrast, as one pointwise colour map
+POINTWISE = Pointwise(
+    tint_matrix(1.2, 1.1, 0.8),  # Warm orange tone
+    contrast_matrix(0.9),  # Soft contrast
+    levels_matrix(0.95, 15),  # Lift shadows slightly
+)
 
 def apply_valencia(img):
     """Apply Valencia filter - warm, dreamy, soft contrast."""
-    arr = np.array(img).astype(np.float32)
-    
-    # Warm orange tone
-    arr = apply_color_tint(arr, 1.2, 1.1, 0.8)
-    
-    # Soft contrast
-    arr[:, :, :3] = apply_contrast_adjustment(arr, 0.9)
-    
-    # Lift shadows slightly
-    arr[:, :, :3] = arr[:, :, :3] * 0.95 + 15
-    
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
@@ -1,19 +1,14 @@
 # effects/vibrant.py
 # Vibrant effect generation
 
-import numpy as np
-from PIL import Image
-from ._utils import apply_saturation_boost, apply_contrast_adjustment
+from ._pointwise import Pointwise, apply_pointwise_chain, contrast_matrix, saturation_matrix
+
+# vibrant filter - boost saturation and slight contrast, as one pointwise colour map
+POINTWISE = Pointwise(
+    saturation_matrix(1.5),  # Boost saturation
+    contrast_matrix(1.1),  # Slight contrast boost
+)
 
 def apply_vibrant(img):
     """Apply vibrant filter - boost saturation and slight contrast."""
-    arr = np.array(img).astype(np.float32)
-    
-    # Boost saturation
-    arr[:, :, :3] = apply_saturation_boost(arr, 1.5)
-    
-    # Slight contrast boost
-    arr[:, :, :3] = apply_contrast_adjustment(arr, 1.1)
-    
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    return apply_pointwise_chain(img, [POINTWISE])
@@ -3,20 +3,24 @@
 
 import numpy as np
 from PIL import Image
+from core.parallel_utils import map_bands, row_bands
+from core.plugin_utils import PluginInfo
 from ._utils import create_vignette_mask
 
+# Darkening depends on the pixel and its position only, not its neighbours
+PLUGIN = PluginInfo(kind="pointwise", positional=True)
+
 def apply_vignette(img):
     """Apply vignette effect - darken edges."""
     arr = np.array(img)
     h, w = arr.shape[:2]
     
-    # Create vignette mask
-    vignette_mask = create_vignette_mask(h, w, strength=0.5)  # Stronger vignette
-    
-    # Apply vignette to RGB channels
-    if arr.shape[2] == 4:  # RGBA
-        arr[:, :, :3] = (arr[:, :, :3] * vignette_mask[..., np.newaxis]).astype(np.uint8)
-    else:  # RGB
-        arr = (arr * vignette_mask[..., np.newaxis]).astype(np.uint8)
+    # Create the vignette mask and apply it to the RGB channels in place in
+    # uint8, one row stripe at a time
+    def run(r0, r1):
+        vignette_mask = create_vignette_mask(h, w, strength=0.5, rows=(r0, r1))  # Stronger vignette
+        rgb = arr[r0:r1, :, :3]
+        np.multiply(rgb, vignette_mask[..., np.newaxis], out=rgb, casting='unsafe')
     
-    return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
+    map_bands(run, row_bands(h))
+    return Image.fromarray(arr, mode="RGBA")
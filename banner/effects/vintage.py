@@ -2,27 +2,26 @@
 # Vintage effect generation
 
 import numpy as np
-from PIL import Image
+from ._pointwise import Pointwise, apply_pointwise_chain, color_matrix
+from core.plugin_utils import PluginInfo
 from .vignette import apply_vignette
 
+# Sepia tone matrix
+SEPIA_MATRIX = np.array([
+    [0.393, 0.769, 0.189],
+    [0.349, 0.686, 0.168], 
+    [0.272, 0.534, 0.131]
+], dtype=np.float32)
+
+SEPIA = Pointwise(color_matrix(SEPIA_MATRIX))
+
+# Sepia and vignette only read the pixel they write
+PLUGIN = PluginInfo(kind="pointwise", positional=True)
+
 def apply_vintage(img):
     """Apply vintage filter - sepia tone + vignette."""
-    arr = np.array(img).astype(np.float32)
-    
-    # Sepia tone matrix
-    sepia_matrix = np.array([
-        [0.393, 0.769, 0.189],
-        [0.349, 0.686, 0.168], 
-        [0.272, 0.534, 0.131]
-    ])
-    
     # Apply sepia to RGB channels
-    if arr.shape[2] >= 3:
-        rgb = arr[:, :, :3]
-        sepia_rgb = np.dot(rgb, sepia_matrix.T)
-        arr[:, :, :3] = np.clip(sepia_rgb, 0, 255)
-    
-    img_sepia = Image.fromarray(arr.astype(np.uint8), mode="RGBA")
+    img_sepia = apply_pointwise_chain(img, [SEPIA])
     
     # Apply vignette
-    return apply_vignette(img_sepia)
\ No newline at end of file
+    return apply_vignette(img_sepia)
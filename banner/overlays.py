@@ -3,6 +3,7 @@
 from PIL import Image, ImageDraw, ImageFilter
 import numpy as np
 import math
+from core.layer_utils import composite_in_bbox
 
 def overlay_simple(img, W, H, SS):
     overlay = Image.new("RGBA", img.size, (0,0,0,0))
@@ -12,7 +13,7 @@ def overlay_simple(img, W, H, SS):
     ], fill=(255,255,255,60))
     # Blur removed - SuperSampling provides anti-aliasing
     # overlay = overlay.filter(ImageFilter.GaussianBlur(radius=16*SS))
-    return Image.alpha_composite(img, overlay)
+    return composite_in_bbox(img, overlay)
 
 def overlay_color(img, W, H, SS, color=(0,0,0,80), blur=0):
     overlay = Image.new("RGBA", img.size, color)
@@ -47,13 +48,17 @@ def overlay_gradient(img, W, H, SS, color1=(0,0,0,80), color2=(255,255,255,0), d
     return Image.alpha_composite(img, overlay)
 
 def overlay_lens_flare(img, W, H, SS, center=None):
-    overlay = Image.new("RGBA", img.size, (0,0,0,0))
-    draw = ImageDraw.Draw(overlay)
     cx, cy = center if center else (int(W*0.7), int(H*0.3))
     
     # Simple, subtle lens flare - just a gentle glow
     base_radius = int(40 * SS)  # SS scaled radius
     
+    # Draw only the glow's own box, in coordinates local to it
+    ox, oy = cx - base_radius, cy - base_radius
+    overlay = Image.new("RGBA", (2 * base_radius + 1, 2 * base_radius + 1), (0,0,0,0))
+    draw = ImageDraw.Draw(overlay)
+    cx, cy = cx - ox, cy - oy
+    
     # Main subtle glow
     draw.ellipse([cx-base_radius, cy-base_radius, cx+base_radius, cy+base_radius], 
                  fill=(255,255,255,30))
@@ -63,7 +68,7 @@ def overlay_lens_flare(img, W, H, SS, center=None):
     draw.ellipse([cx-inner_radius, cy-inner_radius, cx+inner_radius, cy+inner_radius], 
                  fill=(255,255,255,40))
     
-    return Image.alpha_composite(img, overlay)
+    return composite_in_bbox(img, overlay, (ox, oy))
 
 # Extensible overlay function map
 OVERLAY_MAP = {
@@ -7,9 +7,21 @@ import random
 from PIL import Image, ImageDraw
 import numpy as np
 from core.color_utils import parse_color, get_random_rotation
+from core.plugin_utils import describe_plugin
+
+# Patterns draw onto their own layer; motif layout and colours are hashed
+# from absolute positions (see _utils), and sizes follow supersampling.
+# This is the default descriptor (see core.plugin_utils)
+PATTERN_PLUGIN_DEFAULTS = dict(
+    kind="pointwise", rng="position", supersampled=True, positional=True, origin=True,
+    params=('pattern_density', 'pattern_opacity', 'pattern_rotation', 'pattern_tilt',
+            'pattern_colors', 'pattern_jitter', 'pattern_size_variance', 'pattern_freq',
+            'pattern_amp', 'pattern_placement', 'pattern_seed'),
+)
 
 # Auto-discover and import all pattern modules
 PATTERN_MAP = {}
+PATTERN_PLUGINS = {}
 current_dir = os.path.dirname(__file__)
 
 # Get all .py files in patterns directory (excluding __init__.py)
@@ -27,8 +39,9 @@ for pattern_name in pattern_files:
                 # Use the function name without 'apply_' prefix
                 map_name = attr_name[6:]  # Remove 'apply_' prefix
                 PATTERN_MAP[map_name] = func
+                PATTERN_PLUGINS[map_name] = describe_plugin(module, map_name, func, **PATTERN_PLUGIN_DEFAULTS)
     except ImportError as e:
         print(f"Warning: Could not import pattern {pattern_name}: {e}")
 
 # Export the map
-__all__ = ['PATTERN_MAP']
\ No newline at end of file
+__all__ = ['PATTERN_MAP', 'PATTERN_PLUGINS']
\ No newline at end of file
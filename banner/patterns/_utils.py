@@ -1,8 +1,160 @@
 # Utility functions for motifs
-import random
+import math
+from functools import lru_cache
 import numpy as np
 from PIL import Image, ImageDraw
-from core.color_utils import parse_color, get_random_rotation
+from core.color_utils import parse_color
+from core.random_utils import hash_randint, hash_uint32, hash_uniform
+from core.layer_utils import composite_in_bbox
+
+# Random streams for per-motif attributes (see core.random_utils)
+STREAM_JITTER_X, STREAM_JITTER_Y, STREAM_SIZE, STREAM_COLOR, STREAM_ROTATION = range(5)
+# Random streams for the per-block variants of the Poisson-disk tile
+STREAM_TILE_SHIFT_X, STREAM_TILE_SHIFT_Y, STREAM_TILE_FLIP, STREAM_SEAM = range(5, 9)
+
+# Side length of the cached blue-noise tile, in units of the minimum distance
+POISSON_TILE = 32
+
+# Rotation cache resolution for image stamps, in degrees
+STAMP_ROTATION_STEP = 5
+
+# Stamp layouts with at least this many stamps are composited in batches
+# (composite_stamp_layers); below it one Pillow composite per stamp is
+# cheaper than moving the canvas through NumPy
+STAMP_BATCH_MIN = 2048
+
+@lru_cache(maxsize=16)
+def _poisson_tile(seed, tile=POISSON_TILE, k=30):
+    """
+    Bridson Poisson-disk sampling on a toroidal tile x tile square with unit
+    minimum distance. Wrapping distances make the tile seamless, so it can be
+    repeated across any canvas without breaking the spacing at tile borders.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(math.ceil(tile * math.sqrt(2)))
+    hash_cell = tile / n  # <= 1/sqrt(2): at most one point per hash cell
+    grid = np.full((n, n), -1, dtype=np.int64)
+    points = np.empty((n * n, 2), dtype=np.float64)
+    offsets = np.array([(dx, dy) for dy in range(-2, 3) for dx in range(-2, 3)])
+
+    first = rng.uniform(0, tile, 2)
+    points[0] = first
+    grid[int(first[1] // hash_cell) % n, int(first[0] // hash_cell) % n] = 0
+    count = 1
+    active = [0]
+    while active:
+        idx = rng.integers(len(active))
+        origin = points[active[idx]]
+        # k candidates in the annulus [1, 2) around the active point
+        angle = rng.uniform(0, 2 * math.pi, k)
+        dist = np.sqrt(rng.uniform(1, 4, k))
+        cand = (origin + np.stack([np.cos(angle), np.sin(angle)], axis=1) * dist[:, None]) % tile
+        # Look up the 5x5 hash neighbourhood of every candidate at once
+        cells = (cand // hash_cell).astype(np.int64)
+        nb = (cells[:, None, :] + offsets[None, :, :]) % n
+        ids = grid[nb[..., 1], nb[..., 0]]
+        delta = np.abs(points[np.maximum(ids, 0)] - cand[:, None, :])
+        delta = np.minimum(delta, tile - delta)
+        too_close = (ids >= 0) & ((delta ** 2).sum(axis=2) < 1.0)
+        valid = np.flatnonzero(~too_close.any(axis=1))
+        if len(valid):
+            c = valid[0]
+            points[count] = cand[c]
+            grid[cells[c, 1] % n, cells[c, 0] % n] = count
+            active.append(count)
+            count += 1
+        else:
+            active[idx] = active[-1]
+            active.pop()
+    return points[:count]
+
+def _poisson_block(seed, bx, by):
+    """
+    Unit-distance points of tile block (bx, by), in absolute unit coordinates:
+    the seed's toroidal tile with a hashed wrap-around shift and flip/transpose,
+    so neighbouring blocks never repeat the same layout.
+    """
+    points = _poisson_tile(seed).copy()
+    shift_x = hash_uniform(seed, bx, by, STREAM_TILE_SHIFT_X, np.float64) * POISSON_TILE
+    shift_y = hash_uniform(seed, bx, by, STREAM_TILE_SHIFT_Y, np.float64) * POISSON_TILE
+    flip = int(hash_randint(seed, bx, by, 0, 8, STREAM_TILE_FLIP))
+    if flip & 1:
+        points[:, 0] = POISSON_TILE - points[:, 0]
+    if flip & 2:
+        points[:, 1] = POISSON_TILE - points[:, 1]
+    if flip & 4:
+        points = points[:, ::-1]
+    points = (points + (shift_x, shift_y)) % POISSON_TILE
+    return points + np.array([bx, by], dtype=np.float64) * POISSON_TILE
+
+@lru_cache(maxsize=32)
+def poisson_disk_points(W, H, radius, seed=42, origin=(0, 0)):
+    """
+    Well-spaced (blue-noise) motif centres covering a W x H area at origin,
+    no two closer than radius. The plane is split into blocks of
+    POISSON_TILE radii, each filled with a hashed variant of one cached
+    Poisson-disk tile (see _poisson_block). Where two blocks meet, the point
+    with the lower hashed priority of a too-close pair is dropped, which only
+    depends on the blocks around it, so any region yields the same points as
+    the full canvas.
+    """
+    x0, y0 = origin[0] / radius, origin[1] / radius
+    x1, y1 = x0 + W / radius, y0 + H / radius
+    bx0, bx1 = math.floor(x0 / POISSON_TILE), math.floor(x1 / POISSON_TILE)
+    by0, by1 = math.floor(y0 / POISSON_TILE), math.floor(y1 / POISSON_TILE)
+    # Blocks one further on every side, for the seam checks
+    blocks = {(bx, by): _poisson_block(seed, bx, by)
+              for by in range(by0 - 1, by1 + 2) for bx in range(bx0 - 1, bx1 + 2)}
+
+    kept = []
+    for by in range(by0, by1 + 1):
+        for bx in range(bx0, bx1 + 1):
+            own = blocks[bx, by]
+            own = own[(own[:, 0] >= x0) & (own[:, 0] < x1) & (own[:, 1] >= y0) & (own[:, 1] < y1)]
+            # Only points within one unit of the block border can meet a neighbour's
+            local = own - np.array([bx, by], dtype=np.float64) * POISSON_TILE
+            near = ((local < 1) | (local > POISSON_TILE - 1)).any(axis=1)
+            others = np.concatenate([blocks[bx + dx, by + dy] for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy])
+            lo = np.array([bx, by], dtype=np.float64) * POISSON_TILE - 1
+            others = others[((others >= lo) & (others <= lo + POISSON_TILE + 2)).all(axis=1)]
+            edge = own[near]
+            close = ((edge[:, None, :] - others[None, :, :]) ** 2).sum(axis=2) < 1.0
+            beaten = close & (_seam_priority(seed, others)[None, :] > _seam_priority(seed, edge)[:, None])
+            drop = np.zeros(len(own), dtype=bool)
+            drop[np.flatnonzero(near)[beaten.any(axis=1)]] = True
+            kept.append(own[~drop])
+    points = np.concatenate(kept) * radius
+    points.setflags(write=False)
+    return points
+
+def _seam_priority(seed, points):
+    """Hashed priority of unit points at block seams (keyed by position, so both blocks agree)."""
+    keys = np.floor(points * 4096).astype(np.int64)
+    return hash_uint32(seed, keys[:, 0], keys[:, 1], STREAM_SEAM)
+
+def _motif_rotations(rotation, seed, x, y):
+    """Per-motif rotation: uniform in a (low, high) range, else the fixed value."""
+    if isinstance(rotation, (list, tuple)) and len(rotation) == 2:
+        u = hash_uniform(seed, x, y, STREAM_ROTATION, dtype=np.float64)
+        return rotation[0] + (rotation[1] - rotation[0]) * u
+    return np.full(np.shape(x), rotation, dtype=np.float64)
+
+def colorize_index_map(image, index_map, palette):
+    """
+    Colour a motif index map (0 = empty, i = palette[i-1]) onto image with a
+    single table lookup. Covered pixels are replaced, like a direct draw.
+    """
+    lut = np.zeros((len(palette) + 1, 4), dtype=np.uint8)
+    lut[1:] = palette
+    h, w = index_map.shape
+    layer = Image.frombuffer("P", (w, h), np.ascontiguousarray(index_map), "raw", "P", 0, 1)
+    layer.putpalette(lut.tobytes(), rawmode="RGBA")
+    coverage = Image.fromarray(index_map).point([0] + [255] * 255)
+    image.paste(layer.convert("RGBA"), (0, 0), mask=coverage)
+    return image
+
+def _hashable(value):
+    return tuple(value) if isinstance(value, list) else value
 
 def fill_area_2d(draw_func, image, grid_params, motif_params):
     W, H = image.size
@@ -11,29 +163,285 @@ def fill_area_2d(draw_func, image, grid_params, motif_params):
         raise ValueError(
             f"Motif grid cell parameter invalid! cell={cell}, density={grid_params.get('density', 'none')}, H={H}, grid_params={grid_params}"
         )
-    jitter = grid_params.get('jitter', 0)
-    size_variance = grid_params.get('size_variance', 0)
-    rotation = grid_params.get('rotation', 0)
     colors = grid_params.get('colors')
     if not colors:
         colors = [(0,0,0,255)]  # Black for visibility on white background
-    fill_type = grid_params.get('fill_type', 'filled')
+    colors = colors[:255]  # Index map is 8-bit, 0 is reserved for empty
+    opacity = grid_params.get('opacity', 255)
+    # Geometry is cached on everything except colors and opacity
+    index_map = motif_index_map_2d(
+        draw_func, (W, H), cell,
+        grid_params.get('jitter', 0),
+        grid_params.get('size_variance', 0),
+        _hashable(grid_params.get('rotation', 0)),
+        grid_params.get('fill_type', 'filled'),
+        len(colors),
+        grid_params.get('placement', 'grid'),
+        grid_params.get('seed', 42),
+        tuple(grid_params.get('origin', (0, 0))),
+        tuple(sorted((k, _hashable(v)) for k, v in motif_params.items())),
+    )
+    return colorize_index_map(image, index_map, [parse_color(c, opacity) for c in colors])
+
+def motif_layout_2d(size, cell, jitter, size_variance, rotation, ncolors, placement, seed, origin):
+    """
+    Centres (absolute), sizes, colour indices and rotations of every motif
+    that can reach into the W x H region at origin.
+
+    Every per-motif random value is hashed from (seed, motif position), so a
+    region rendered at origin matches the same region of the full canvas.
+    """
+    W, H = size
+    x0, y0 = origin
+    base_size = max(8, int(cell * 0.6))  # Standard motifs - 60% of cell size
+    size_var = max(1, int(base_size * size_variance))
+    if placement == 'poisson':
+        # Keep neighbours at least one (largest) motif apart; 0.8*cell keeps
+        # the motif count close to the regular grid at the same density
+        radius = float(max(cell * 0.8, base_size + size_var))
+        margin = int(math.ceil(radius))
+        points = poisson_disk_points(W + 2 * margin, H + 2 * margin, radius, seed, (x0 - margin, y0 - margin))
+        keys_x, keys_y = points[:, 0].astype(np.int64), points[:, 1].astype(np.int64)
+        centers_x, centers_y = keys_x, keys_y
+    else:
+        # Cells whose motifs can reach into the region (motif + jitter <= 2 cells)
+        cols = np.arange(x0 // cell - 2, (x0 + W) // cell + 3)
+        rows = np.arange(y0 // cell - 2, (y0 + H) // cell + 3)
+        keys_y, keys_x = [a.ravel() for a in np.meshgrid(rows, cols, indexing='ij')]
+        centers_x = keys_x * cell + cell // 2
+        centers_y = keys_y * cell + cell // 2
+        if jitter > 0:
+            centers_x = centers_x + hash_randint(seed, keys_x, keys_y, -jitter, jitter, STREAM_JITTER_X)
+            centers_y = centers_y + hash_randint(seed, keys_x, keys_y, -jitter, jitter, STREAM_JITTER_Y)
+    sizes = np.maximum(6, base_size + hash_randint(seed, keys_x, keys_y, -size_var, size_var, STREAM_SIZE))
+    color_idx = hash_randint(seed, keys_x, keys_y, 0, ncolors, STREAM_COLOR)
+    rotations = _motif_rotations(rotation, seed, keys_x, keys_y)
+    return centers_x, centers_y, sizes, color_idx, rotations
+
+@lru_cache(maxsize=8)
+def motif_index_map_2d(draw_func, size, cell, jitter, size_variance, rotation, fill_type, ncolors, placement, seed, origin, motif_items):
+    """
+    Rasterize a 2D motif field as a palette-index map: 0 where nothing is
+    drawn, i+1 where motif colour i is drawn. Motifs draw with fill=index
+    instead of an RGBA colour, so the same motif functions are reused as-is.
+    """
+    W, H = size
+    x0, y0 = origin
+    motif_params = dict(motif_items)
+    centers_x, centers_y, sizes, color_idx, rotations = motif_layout_2d(
+        size, cell, jitter, size_variance, rotation, ncolors, placement, seed, origin)
+    # Draw with a margin so motifs are never clipped inside the region;
+    # clipping at the canvas edge is the one place PIL rasterization is not
+    # translation invariant
+    pad = 2 * cell
+    index_img = Image.new("L", (W + 2 * pad, H + 2 * pad), 0)
+    draw = ImageDraw.Draw(index_img)
+    for cx, cy, motif_size, ci, rot in zip((centers_x - x0 + pad).tolist(), (centers_y - y0 + pad).tolist(), sizes.tolist(), (color_idx + 1).tolist(), rotations.tolist()):
+        # SS is already in motif_params, don't pass it separately
+        draw_func(draw, cx, cy, motif_size, ci, rot, fill_type, **motif_params)
+    index_map = np.array(index_img)[pad:pad + H, pad:pad + W]
+    index_map.setflags(write=False)
+    return index_map
+
+@lru_cache(maxsize=8)
+def stamp_mipmap(path):
+    """
+    Load a stamp image once and build its mipmap pyramid: the full image,
+    then halved (box filter) down to a single pixel.
+    """
+    level = Image.open(path).convert("RGBA")
+    levels = [level]
+    while max(level.size) > 1:
+        level = level.resize((max(1, level.width // 2), max(1, level.height // 2)), Image.BOX)
+        levels.append(level)
+    return tuple(levels)
+
+@lru_cache(maxsize=128)
+def stamp_scaled(path, size):
+    """
+    Stamp image scaled so its longest side is size. Resizes start from the
+    smallest mip level that is still at least size, so each one is a small,
+    well-filtered downscale.
+    """
+    levels = stamp_mipmap(path)
+    source = levels[0]
+    for level in levels:
+        if max(level.size) < size:
+            break
+        source = level
+    scale = size / max(levels[0].size)
+    target = (max(1, round(levels[0].width * scale)), max(1, round(levels[0].height * scale)))
+    return source.resize(target, Image.LANCZOS)
+
+@lru_cache(maxsize=512)
+def stamp_sprite(path, size, angle, tint, opacity):
+    """
+    Scaled stamp rotated by angle, optionally tinted to a single colour (the
+    stamp's alpha is kept as the glyph shape), with opacity applied.
+    """
+    sprite = stamp_scaled(path, size)
+    if angle:
+        # Rotate premultiplied so transparent pixels don't bleed into edges
+        sprite = sprite.convert("RGBa").rotate(angle, Image.BICUBIC, expand=True).convert("RGBA")
+    alpha = sprite.getchannel("A")
+    if tint is not None:
+        sprite = Image.new("RGBA", sprite.size, tint[:3] + (255,))
+        opacity = opacity * tint[3] // 255
+    if opacity < 255:
+        alpha = alpha.point(lambda a: a * opacity // 255)
+    sprite.putalpha(alpha)
+    return sprite
+
+def fill_area_stamp(image, grid_params, stamp_path, tint=False):
+    """
+    Composite an image stamp at every motif position of the 2D layout. The
+    layout is the same as fill_area_2d; sprites come from a cache keyed on
+    (size, rotation, colour), so many motifs share few resizes. Rotations are
+    snapped to STAMP_ROTATION_STEP degrees to keep that cache small. Dense
+    layouts (STAMP_BATCH_MIN stamps or more) are composited in batches.
+    """
+    W, H = image.size
+    cell = grid_params.get('cell', 32)
+    if not isinstance(cell, int) or cell <= 0:
+        raise ValueError(
+            f"Motif grid cell parameter invalid! cell={cell}, density={grid_params.get('density', 'none')}, H={H}, grid_params={grid_params}"
+        )
     opacity = grid_params.get('opacity', 255)
-    SS = motif_params.get('SS', 1)  # Get SS from motif_params
-    draw = ImageDraw.Draw(image)
-    for y in range(0, H, cell):
-        for x in range(0, W, cell):
-            cx = x + cell // 2 + (np.random.randint(-jitter, jitter) if jitter > 0 else 0)
-            cy = y + cell // 2 + (np.random.randint(-jitter, jitter) if jitter > 0 else 0)
-            base_size = max(8, int(cell * 0.6))  # Standard motifs - 60% of cell size
-            size_var = max(1, int(base_size * size_variance))
-            size = max(6, base_size + np.random.randint(-size_var, size_var))
-            color = parse_color(random.choice(colors), opacity)
-            shape_rot = get_random_rotation(rotation)
-            # SS is already in motif_params, don't pass it separately
-            draw_func(draw, cx, cy, size, color, shape_rot, fill_type, **motif_params)
+    colors = grid_params.get('colors') if tint else None
+    palette = [parse_color(c, 255) for c in colors] if colors else [None]
+    x0, y0 = origin = tuple(grid_params.get('origin', (0, 0)))
+    centers_x, centers_y, sizes, color_idx, rotations = motif_layout_2d(
+        (W, H), cell,
+        grid_params.get('jitter', 0),
+        grid_params.get('size_variance', 0),
+        grid_params.get('rotation', 0),
+        len(palette),
+        grid_params.get('placement', 'grid'),
+        grid_params.get('seed', 42),
+        origin,
+    )
+    angles = np.round(rotations / STAMP_ROTATION_STEP).astype(np.int64) * STAMP_ROTATION_STEP % 360
+    # Placements by sprite content box, in image coordinates
+    sprites, stamps = {}, []
+    for cx, cy, motif_size, ci, angle in zip((centers_x - x0).tolist(), (centers_y - y0).tolist(), sizes.tolist(), color_idx.tolist(), angles.tolist()):
+        key = (stamp_path, motif_size, angle, palette[ci], opacity)
+        if key not in sprites:
+            sprite = stamp_sprite(*key)
+            sprites[key] = (sprite, sprite.getbbox())
+        sprite, bbox = sprites[key]
+        if bbox is not None:
+            left, top = cx - sprite.width // 2 + bbox[0], cy - sprite.height // 2 + bbox[1]
+            right, bottom = left + bbox[2] - bbox[0], top + bbox[3] - bbox[1]
+            if left < W and right > 0 and top < H and bottom > 0:
+                stamps.append((key, (left, top, right, bottom)))
+    if len(stamps) < STAMP_BATCH_MIN:
+        for key, (left, top, _, _) in stamps:
+            sprite, bbox = sprites[key]
+            composite_in_bbox(image, sprite, (left - bbox[0], top - bbox[1]), bbox)
+        return image
+    keys = list(sprites)
+    index = {key: i for i, key in enumerate(keys)}
+    sprite_ids = np.array([index[key] for key, _ in stamps], dtype=np.int64)
+    boxes = np.array([box for _, box in stamps], dtype=np.int64)
+    return composite_stamp_layers(image, keys, sprite_ids, boxes)
+
+def composite_stamp_layers(image, keys, sprite_ids, boxes):
+    """
+    Alpha-composite many stamps at once: stamp_pixels(*keys[i]) with its
+    content box at each of boxes (left, top, right, bottom) of sprite i, in
+    order. Stamps are split into layers of non-overlapping ones
+    (stamp_layers); each layer gathers the stamped pixels of all its sprites
+    (one array operation per sprite) and composites them as a single row.
+    Overlapping stamps sit in later layers in order, so the result matches
+    compositing the stamps one by one.
+    """
+    W, H = image.size
+    layers = stamp_layers(boxes)
+    left, top = np.maximum(boxes[:, :2].min(axis=0), 0).tolist()
+    right, bottom = np.minimum(boxes[:, 2:].max(axis=0), (W, H)).tolist()
+    width, height = right - left, bottom - top
+    boxes = boxes - (left, top, left, top)
+    # One uint32 per RGBA pixel of the stamped area, so a stamped pixel is a single element
+    area = np.frombuffer(bytearray(image.crop((left, top, right, bottom)).tobytes()), dtype=np.uint32)
+    for layer in range(int(layers.max()) + 1):
+        in_layer = layers == layer
+        targets, values = [], []
+        for sid in np.unique(sprite_ids[in_layer]).tolist():
+            sel = boxes[in_layer & (sprite_ids == sid)]
+            dy, dx, pixels = stamp_pixels(*keys[sid])
+            inside = (sel[:, 0] >= 0) & (sel[:, 1] >= 0) & (sel[:, 2] <= width) & (sel[:, 3] <= height)
+            corners = sel[inside, 1] * width + sel[inside, 0]
+            targets.append((corners[:, None] + (dy * width + dx)).ravel())
+            values.append(np.broadcast_to(pixels, (len(corners), len(pixels))).ravel())
+            if not inside.all():
+                # Stamps crossing the canvas edge keep their pixels on the canvas
+                rows, cols = sel[~inside, 1, None] + dy, sel[~inside, 0, None] + dx
+                keep = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+                targets.append((rows * width + cols)[keep])
+                values.append(np.broadcast_to(pixels, keep.shape)[keep])
+        targets, values = np.concatenate(targets), np.concatenate(values)
+        if len(targets):
+            below = Image.frombuffer("RGBA", (len(targets), 1), area[targets], "raw", "RGBA", 0, 1)
+            above = Image.frombuffer("RGBA", (len(values), 1), values, "raw", "RGBA", 0, 1)
+            area[targets] = np.frombuffer(Image.alpha_composite(below, above).tobytes(), dtype=np.uint32)
+    image.paste(Image.frombuffer("RGBA", (width, height), area, "raw", "RGBA", 0, 1), (left, top))
     return image
 
+@lru_cache(maxsize=512)
+def stamp_pixels(path, size, angle, tint, opacity):
+    """
+    Offsets (dy, dx) from the content box corner and packed RGBA (uint32)
+    of the visible pixels of stamp_sprite; transparent pixels leave the
+    canvas unchanged and are skipped.
+    """
+    sprite = stamp_sprite(path, size, angle, tint, opacity)
+    pixels = np.asarray(sprite.crop(sprite.getbbox()))
+    dy, dx = np.nonzero(pixels[..., 3])
+    packed = np.ascontiguousarray(pixels[dy, dx]).view(np.uint32).ravel()
+    for arr in (dy, dx, packed):
+        arr.setflags(write=False)
+    return dy, dx, packed
+
+def stamp_layers(boxes):
+    """
+    Layer index per box (left, top, right, bottom) such that boxes sharing a
+    layer never overlap and each box lies above every earlier box it overlaps.
+    """
+    n = len(boxes)
+    # Overlap candidates: boxes whose left edge falls in the x range a box of
+    # the widest size could overlap, found on the boxes sorted by left edge
+    order = np.argsort(boxes[:, 0], kind='stable')
+    lefts = boxes[order, 0]
+    widest = int((boxes[:, 2] - boxes[:, 0]).max())
+    lo = np.searchsorted(lefts, boxes[:, 0] - widest, side='right')
+    hi = np.searchsorted(lefts, boxes[:, 2], side='left')
+    counts = hi - lo
+    pairs_i = np.repeat(np.arange(n), counts)
+    pairs_j = order[np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+    bi, bj = boxes[pairs_i], boxes[pairs_j]
+    overlap = ((pairs_j < pairs_i) & (bi[:, 0] < bj[:, 2]) & (bj[:, 0] < bi[:, 2]) &
+               (bi[:, 1] < bj[:, 3]) & (bj[:, 1] < bi[:, 3]))
+    pairs_i, pairs_j = pairs_i[overlap], pairs_j[overlap]
+    layers = np.zeros(n, dtype=np.int64)
+    # Longest chain of earlier overlapping boxes, relaxed until stable
+    while len(pairs_i):
+        new = layers.copy()
+        np.maximum.at(new, pairs_i, layers[pairs_j] + 1)
+        if np.array_equal(new, layers):
+            break
+        layers = new
+    return layers
+
+def line_xs(W, step, x_range=None):
+    """
+    Absolute x of a line's vertices: every step across the canvas width W,
+    limited to the segments that reach into x_range = (start, stop) if given.
+    """
+    if x_range is None:
+        return range(0, W, step)
+    start, stop = x_range
+    return range(max(0, start // step * step), min(W, -(-stop // step) * step + 1), step)
+
 def fill_area_1d(draw_func, image, line_params, motif_params):
     W, H = image.size
     colors = line_params.get('colors')
@@ -41,8 +449,7 @@ def fill_area_1d(draw_func, image, line_params, motif_params):
     
     # Use colors array if provided, otherwise default to white
     if colors and len(colors) > 0:
-        import random
-        color = random.choice(colors)
+        color = colors[int(hash_randint(line_params.get('seed', 42), 0, 0, 0, len(colors), STREAM_COLOR))]
     else:
         color = line_params.get('color') or (255,255,255,255)
     
@@ -53,8 +460,42 @@ def fill_area_1d(draw_func, image, line_params, motif_params):
     step = line_params.get('step', int(W//16))
     spacing = line_params.get('spacing', width*3)
     spacing = max(spacing, 2)  # spacing should never be zero
-    draw = ImageDraw.Draw(image)
-    for y in range(spacing//2, H, spacing):
-        draw_func(draw, (W, H), color, width=width, amp=amp, freq=freq, step=step, y_offset=y, **motif_params)
-    return image
+    index_map = line_index_map_1d(
+        draw_func, (W, H),
+        tuple(line_params.get('canvas') or (W, H)),
+        width, amp, freq, step, spacing,
+        line_params.get('jitter', 0),
+        line_params.get('seed', 42),
+        tuple(line_params.get('origin', (0, 0))),
+        tuple(sorted((k, _hashable(v)) for k, v in motif_params.items())),
+    )
+    return colorize_index_map(image, index_map, [color])
+
+@lru_cache(maxsize=8)
+def line_index_map_1d(draw_func, size, canvas, width, amp, freq, step, spacing, jitter, seed, origin, motif_items):
+    """
+    Rasterize a 1D line field as an index map (all lines use palette index 1).
 
+    Line k runs across the canvas at absolute y = k * spacing + spacing // 2
+    (plus a jitter hashed from (seed, k)), and its shape is computed from
+    absolute x, so the W x H region rendered at origin matches the same
+    region of the full canvas.
+    """
+    W, H = size
+    x0, y0 = origin
+    canvas_w, canvas_h = canvas
+    # Draw with a margin so lines are never clipped inside the region (see
+    # motif_index_map_2d); lines further than their amplitude away are skipped
+    pad = step + 2 * width
+    reach = amp + jitter + pad
+    index_img = Image.new("L", (W + 2 * pad, H + 2 * pad), 0)
+    draw = ImageDraw.Draw(index_img)
+    for k, y in enumerate(range(spacing//2, canvas_h, spacing)):
+        if jitter > 0:
+            y += int(hash_randint(seed, 0, k, -jitter, jitter, STREAM_JITTER_Y))
+        if y0 - reach <= y < y0 + H + reach:
+            draw_func(draw, (canvas_w, canvas_h), 1, width=width, amp=amp, freq=freq, step=step, y_offset=y,
+                      x_range=(x0 - pad, x0 + W + pad), shift=(x0 - pad, y0 - pad), **dict(motif_items))
+    index_map = np.array(index_img)[pad:pad + H, pad:pad + W]
+    index_map.setflags(write=False)
+    return index_map
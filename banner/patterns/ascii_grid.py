@@ -17,7 +17,7 @@ def motif_ascii_grid(draw, cx, cy, size, color, rot, fill_type, SS=1, **kwargs):
     draw.line([cx-half, cy, cx+half, cy], fill=color, width=line_width)  # Horizontal line
     draw.line([cx, cy-half, cx, cy+half], fill=color, width=line_width)  # Vertical line
 
-def apply_ascii_grid(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1):
+def apply_ascii_grid(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1, placement='grid', seed=42, origin=(0, 0)):
     """ASCII Grid = grid lines forming + pattern"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -28,6 +28,6 @@ def apply_ascii_grid(grad, bg_box, H, density, opacity, jitter=0.0, size_varianc
     # ASCII grid uses line drawing
     fill_type = 'outline'
     
-    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density)
+    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density, placement=placement, seed=seed, origin=origin)
     motif_params = {'SS': SS}
     return fill_area_2d(motif_ascii_grid, grad, grid_params, motif_params)
\ No newline at end of file
@@ -11,7 +11,7 @@ def motif_dot(draw, cx, cy, size, color, rot, fill_type, SS=1, **kwargs):
     else:
         draw.ellipse([cx-r, cy-r, cx+r, cy+r], outline=color, width=max(2, 2*SS))
 
-def apply_dots(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1):
+def apply_dots(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1, placement='grid', seed=42, origin=(0, 0)):
     """Dots = filled circles"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -22,11 +22,11 @@ def apply_dots(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0,
     # Dots are always filled
     fill_type = 'filled'
     
-    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density)
+    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density, placement=placement, seed=seed, origin=origin)
     motif_params = {'SS': SS}
     return fill_area_2d(motif_dot, grad, grid_params, motif_params)
 
-def apply_circles(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1):
+def apply_circles(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1, placement='grid', seed=42, origin=(0, 0)):
     """Circles = outline circles"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -37,6 +37,6 @@ def apply_circles(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0
     # Circles are always outline
     fill_type = 'outline'
     
-    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density)
+    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density, placement=placement, seed=seed, origin=origin)
     motif_params = {'SS': SS}
     return fill_area_2d(motif_dot, grad, grid_params, motif_params)
\ No newline at end of file
@@ -4,12 +4,13 @@ Lines motif - straight lines pattern
 from ._utils import fill_area_1d
 from PIL import ImageDraw
 
-def draw_line_straight(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=0, SS=1, **kwargs):
+def draw_line_straight(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=0, SS=1, x_range=None, shift=(0, 0), **kwargs):
     W, H = size
     width = max(width, 2*SS)
-    draw.line([0, y_offset, W, y_offset], fill=color, width=width)
+    dx, dy = shift
+    draw.line([-dx, y_offset - dy, W - dx, y_offset - dy], fill=color, width=width)
 
-def apply_lines(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1):
+def apply_lines(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1, seed=42, origin=(0, 0)):
     """Lines = straight horizontal lines"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -24,7 +25,11 @@ def apply_lines(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0
         spacing=base_spacing,
         amp=0,  # No amplitude for straight lines
         freq=1,
-        step=2
+        step=2,
+        jitter=int(base_spacing*jitter),
+        seed=seed,
+        canvas=(bg_box[2] - bg_box[0], bg_box[3] - bg_box[1]),
+        origin=origin
     )
     motif_params = {'SS': SS}
     return fill_area_1d(draw_line_straight, grad, line_params, motif_params)
\ No newline at end of file
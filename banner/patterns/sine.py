@@ -1,22 +1,22 @@
 """
 Sine motif - sine wave lines pattern
 """
-from ._utils import fill_area_1d
+from ._utils import fill_area_1d, line_xs
 from PIL import ImageDraw
 
-def draw_line_sine(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=0, SS=1, **kwargs):
+def draw_line_sine(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=0, SS=1, x_range=None, shift=(0, 0), **kwargs):
     from math import sin, pi
     W, H = size
     width = max(width, 2*SS)
     points = []
-    for x in range(0, W, step):
+    for x in line_xs(W, step, x_range):
         y = int(y_offset + amp * sin(2 * pi * freq * x / W))
-        points.append((x, y))
+        points.append((x - shift[0], y - shift[1]))
     if len(points) > 1:
         for i in range(len(points) - 1):
             draw.line([points[i], points[i+1]], fill=color, width=width)
 
-def apply_sine(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1, freq=None, amp=None):
+def apply_sine(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1, freq=None, amp=None, seed=42, origin=(0, 0)):
     """Sine = sine wave lines"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -36,7 +36,11 @@ def apply_sine(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0,
         spacing=base_spacing,
         amp=amp,  # Direct amplitude in pixels
         freq=freq,  # Direct frequency value
-        step=4
+        step=4,
+        jitter=int(base_spacing*jitter),
+        seed=seed,
+        canvas=(bg_box[2] - bg_box[0], bg_box[3] - bg_box[1]),
+        origin=origin
     )
     motif_params = {'SS': SS}
     return fill_area_1d(draw_line_sine, grad, line_params, motif_params)
\ No newline at end of file
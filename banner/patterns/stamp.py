@@ -0,0 +1,21 @@
+"""
+Stamp motif - user image (e.g. a brand glyph) stamped on the motif grid
+"""
+from ._utils import fill_area_stamp
+from core.plugin_utils import PluginInfo
+from . import PATTERN_PLUGIN_DEFAULTS
+
+PLUGIN = PluginInfo(**{**PATTERN_PLUGIN_DEFAULTS, 'params': PATTERN_PLUGIN_DEFAULTS['params'] + ('pattern_stamp', 'pattern_stamp_tint')})
+
+def apply_stamp(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1, placement='grid', seed=42, origin=(0, 0), stamp=None, tint=False):
+    """Stamp = image file as motif, optionally tinted with pattern colors"""
+    if not stamp:
+        raise ValueError("Pattern 'stamp' requires pattern_stamp (path to the stamp image)")
+    W, H_img = grad.size
+    density = max(density if density is not None else 1.0, 0.05)
+    min_cell = max(8*SS, H//128, 24)
+    cell = max(int(H * 0.10 / density) * SS, min_cell)
+    cell = min(cell, H//2)
+    
+    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, opacity=opacity, density=density, placement=placement, seed=seed, origin=origin)
+    return fill_area_stamp(grad, grid_params, stamp, tint)
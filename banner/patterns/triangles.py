@@ -19,7 +19,7 @@ def motif_triangle(draw, cx, cy, size, color, rot, fill_type, SS=1, **kwargs):
             end = points[(i + 1) % len(points)]
             draw.line([start, end], fill=color, width=line_width)
 
-def apply_triangles(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1):
+def apply_triangles(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1, placement='grid', seed=42, origin=(0, 0)):
     """Triangles = filled triangles"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -30,11 +30,11 @@ def apply_triangles(grad, bg_box, H, density, opacity, jitter=0.0, size_variance
     # Triangles are always filled
     fill_type = 'filled'
     
-    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density)
+    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density, placement=placement, seed=seed, origin=origin)
     motif_params = {'SS': SS}
     return fill_area_2d(motif_triangle, grad, grid_params, motif_params)
 
-def apply_triangles_outline(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1):
+def apply_triangles_outline(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, SS=1, placement='grid', seed=42, origin=(0, 0)):
     """Triangles outline = outline triangles"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -45,6 +45,6 @@ def apply_triangles_outline(grad, bg_box, H, density, opacity, jitter=0.0, size_
     # Triangles outline are always outline
     fill_type = 'outline'
     
-    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density)
+    grid_params = dict(cell=cell, jitter=int(cell*jitter), size_variance=size_variance, rotation=tilt, colors=colors, fill_type=fill_type, opacity=opacity, density=density, placement=placement, seed=seed, origin=origin)
     motif_params = {'SS': SS}
     return fill_area_2d(motif_triangle, grad, grid_params, motif_params)
\ No newline at end of file
@@ -1,10 +1,10 @@
 """
 Wave motif - parallel wave lines pattern (S-shaped)
 """
-from ._utils import fill_area_1d
+from ._utils import fill_area_1d, line_xs
 from PIL import ImageDraw
 
-def draw_line_wave(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=0, SS=1, **kwargs):
+def draw_line_wave(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=0, SS=1, x_range=None, shift=(0, 0), **kwargs):
     """Draw parallel wave lines - S-shaped pattern"""
     from math import sin, cos, pi
     W, H = size
@@ -12,17 +12,17 @@ def draw_line_wave(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=
     points = []
     
     # Create S-shaped wave pattern
-    for x in range(0, W, step):
+    for x in line_xs(W, step, x_range):
         # S-curve using sine with phase shift
         t = x / W
         y = int(y_offset + amp * sin(2 * pi * freq * t + pi/2))
-        points.append((x, y))
+        points.append((x - shift[0], y - shift[1]))
     
     if len(points) > 1:
         for i in range(len(points) - 1):
             draw.line([points[i], points[i+1]], fill=color, width=width)
 
-def apply_wave(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1, freq=None, amp=None):
+def apply_wave(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1, freq=None, amp=None, seed=42, origin=(0, 0)):
     """Wave = parallel wave lines (S-shaped)"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -42,7 +42,11 @@ def apply_wave(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0,
         spacing=base_spacing,
         amp=amp,  # Direct amplitude in pixels
         freq=freq,  # Direct frequency value
-        step=4
+        step=4,
+        jitter=int(base_spacing*jitter),
+        seed=seed,
+        canvas=(bg_box[2] - bg_box[0], bg_box[3] - bg_box[1]),
+        origin=origin
     )
     motif_params = {'SS': SS}
     return fill_area_1d(draw_line_wave, grad, line_params, motif_params)
\ No newline at end of file
@@ -1,23 +1,23 @@
 """
 Zigzag motif - zigzag lines pattern
 """
-from ._utils import fill_area_1d
+from ._utils import fill_area_1d, line_xs
 from PIL import ImageDraw
 
-def draw_line_zigzag(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=0, SS=1, **kwargs):
+def draw_line_zigzag(draw, size, color, width=2, amp=30, freq=2, step=8, y_offset=0, SS=1, x_range=None, shift=(0, 0), **kwargs):
     W, H = size
     width = max(width, 2*SS)
     points = []
     zigzag_period = W // (freq * 2)
-    for x in range(0, W, step):
+    for x in line_xs(W, step, x_range):
         cycle_pos = (x % zigzag_period) / zigzag_period
         y = int(y_offset + amp * (1 - 2 * abs(cycle_pos - 0.5)))
-        points.append((x, y))
+        points.append((x - shift[0], y - shift[1]))
     if len(points) > 1:
         for i in range(len(points) - 1):
             draw.line([points[i], points[i+1]], fill=color, width=width)
 
-def apply_zigzag(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1, freq=None, amp=None):
+def apply_zigzag(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.0, rotation=0, tilt=0, colors=None, fill_type='filled', SS=1, freq=None, amp=None, seed=42, origin=(0, 0)):
     """Zigzag = zigzag lines"""
     W, H_img = grad.size
     density = max(density if density is not None else 1.0, 0.05)
@@ -37,7 +37,11 @@ def apply_zigzag(grad, bg_box, H, density, opacity, jitter=0.0, size_variance=0.
         spacing=base_spacing,
         amp=amp,  # Direct amplitude in pixels
         freq=freq,  # Direct frequency value
-        step=4
+        step=4,
+        jitter=int(base_spacing*jitter),
+        seed=seed,
+        canvas=(bg_box[2] - bg_box[0], bg_box[3] - bg_box[1]),
+        origin=origin
     )
     motif_params = {'SS': SS}
     return fill_area_1d(draw_line_zigzag, grad, line_params, motif_params)
\ No newline at end of file
@@ -10,11 +10,16 @@ from banner.icon import add_icon
 from banner.text import add_text
 from banner.effects import apply_effects
 from banner.patterns import PATTERN_MAP
-from banner.textures import TEXTURE_MAP
+from banner.textures import TEXTURE_MAP, TEXTURE_PLUGINS
 from banner.overlays import OVERLAY_MAP
 from banner.shapes import SHAPE_MAP
+from core.layer_utils import composite_in_bbox
+from core.parallel_utils import apply_in_bands, set_workers
 from typing import Tuple
 
+# Pipeline stages a texture can run at (texture_target)
+TEXTURE_TARGETS = ("background", "composite")
+
 @dataclass
 class BannerConfig:
     title: str = "Banner Maker"
@@ -58,6 +63,9 @@ class BannerConfig:
     effect_scale: float = 1.0           # 0.5-2.0 lens flare size multiplier
     effect_x: float = None              # Custom X coordinate (0.0-1.0, None = use effect_position)
     effect_y: float = None              # Custom Y coordinate (0.0-1.0, None = use effect_position)
+    effect_blur_quality: float = 1.0    # Bloom/glow/soft/flare blur: higher = less downsampling, closer to an exact Gaussian
+    effect_lut_size: int = 33           # Colour effect chains bake into a size^3 3D LUT (17 or 33; 0 = exact per-pixel pass)
+    render_workers: int = None          # Threads for row-band effect/texture work (0 = one per core, 1 = serial, None = BANNER_MAKER_WORKERS or one per core)
     # --- New text_box parameters ---
     text_box: bool = False
     text_box_color: str = "rgba(0,0,0,0.35)"
@@ -68,12 +76,13 @@ class BannerConfig:
     texture_density: float = 1.0
     texture_rotation: float = 0
     texture_colors: list = None
-    texture_scale: float = 1.0
+    texture_scale: float = 1.0      # Texture band quality: samples per feature for coarse bands (lower = faster)
     texture_displacement_strength: float = 12.0
     texture_shading_strength: float = 4.0
     texture_contrast_boost: float = 1.0
     texture_blur: float = 0.0
     texture_seed: int = 42
+    texture_target: str = "composite"  # Texture stage: background (gradient only) or composite (everything below effects)
     grid_spacing: int = 80
     SuperSampling: int = 2  # Supersampling factor (default 2, can be 2-3)
     pattern: str = "none"
@@ -86,6 +95,10 @@ class BannerConfig:
     pattern_size_variance: float = 0.0
     pattern_freq: float = None  # Frequency for wave patterns (sine, wave, zigzag)
     pattern_amp: float = None   # Amplitude for wave patterns (sine, wave, zigzag)
+    pattern_placement: str = "grid"  # Motif placement for 2D patterns: grid, poisson (blue-noise)
+    pattern_seed: int = 42           # Seed for motif jitter, size, color, tilt and placement
+    pattern_stamp: str = None        # Image file used as the motif by the stamp pattern
+    pattern_stamp_tint: bool = False # Tint the stamp with pattern_colors instead of its own colors
     overlay: str = "none"
     
     # Debug and test mode settings
@@ -141,6 +154,10 @@ def apply_pattern_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
     pattern_size_variance = getattr(config, 'pattern_size_variance', 0.0)
     pattern_freq = getattr(config, 'pattern_freq', None)
     pattern_amp = getattr(config, 'pattern_amp', None)
+    pattern_placement = getattr(config, 'pattern_placement', 'grid')
+    pattern_seed = getattr(config, 'pattern_seed', 42)
+    pattern_stamp = getattr(config, 'pattern_stamp', None)
+    pattern_stamp_tint = getattr(config, 'pattern_stamp_tint', False)
     width = config.width
     height = config.height
     bg_box = [0, 0, width, height]
@@ -163,7 +180,8 @@ def apply_pattern_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
         
         # Prepare pattern parameters
         pattern_kwargs = {
-            'SS': getattr(config, 'SuperSampling', 1)
+            'SS': getattr(config, 'SuperSampling', 1),
+            'seed': pattern_seed
         }
         
         # Add freq and amp for wave patterns
@@ -172,6 +190,12 @@ def apply_pattern_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
                 pattern_kwargs['freq'] = pattern_freq
             if pattern_amp is not None:
                 pattern_kwargs['amp'] = pattern_amp
+        elif pattern_type != 'lines':
+            # 2D motif patterns
+            pattern_kwargs['placement'] = pattern_placement
+            if pattern_type == 'stamp':
+                pattern_kwargs['stamp'] = pattern_stamp
+                pattern_kwargs['tint'] = pattern_stamp_tint
         
         pattern_layer = PATTERN_MAP[pattern_type](
             pattern_layer, expanded_bg_box, height,  # Always use original height for density calculations
@@ -189,7 +213,8 @@ def apply_pattern_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
             bottom = top + height
             pattern_layer = pattern_layer.crop((left, top, right, bottom))
         
-        img = Image.alpha_composite(img, pattern_layer)
+        # Only the pattern's content box is composited
+        img = composite_in_bbox(img, pattern_layer)
     return img
 
 def apply_icon_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
@@ -198,24 +223,44 @@ def apply_icon_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
 def apply_text_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
     return add_text(img, config)
 
-def apply_texture_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
+def apply_texture_layer(img: Image.Image, config: BannerConfig, stage: str = "composite") -> Image.Image:
+    """
+    Apply the configured texture if texture_target selects this stage. The
+    pipeline offers the texture at two points (right after the background
+    and after text); it runs at exactly one of them.
+    """
     texture = getattr(config, 'texture', 'none')
+    target = getattr(config, 'texture_target', None) or "composite"
+    if target not in TEXTURE_TARGETS:
+        raise ValueError(f"Unknown texture_target '{target}' (expected one of: {', '.join(TEXTURE_TARGETS)})")
+    if target != stage:
+        return img
     if texture in TEXTURE_MAP and texture != 'none':
-        img = TEXTURE_MAP[texture](
-            img,
-            density=getattr(config, 'texture_density', 1.0),
-            opacity=getattr(config, 'texture_opacity', 255),
-            rotation=getattr(config, 'texture_rotation', 0),
-            colors=getattr(config, 'texture_colors', None),
-            SS=getattr(config, 'SuperSampling', 1),
-            scale=getattr(config, 'texture_scale', 1.0),
-            displacement_strength=getattr(config, 'texture_displacement_strength', 12.0),
-            shading_strength=getattr(config, 'texture_shading_strength', 4.0),
-            contrast_boost=getattr(config, 'texture_contrast_boost', 1.0),
-            blur=getattr(config, 'texture_blur', 0.0),
-            seed=getattr(config, 'texture_seed', 42),
-            grid_spacing=getattr(config, 'grid_spacing', 80)
-        )
+        # Tileable textures (see core.plugin_utils) are shaded in row stripes,
+        # each at its origin, and match the whole canvas exactly
+        info = TEXTURE_PLUGINS[texture]
+        def shade(band, top):
+            return info.func(
+                band,
+                density=getattr(config, 'texture_density', 1.0),
+                opacity=getattr(config, 'texture_opacity', 255),
+                rotation=getattr(config, 'texture_rotation', 0),
+                colors=getattr(config, 'texture_colors', None),
+                SS=getattr(config, 'SuperSampling', 1),
+                scale=getattr(config, 'texture_scale', 1.0),
+                displacement_strength=getattr(config, 'texture_displacement_strength', 12.0),
+                shading_strength=getattr(config, 'texture_shading_strength', 4.0),
+                contrast_boost=getattr(config, 'texture_contrast_boost', 1.0),
+                blur=getattr(config, 'texture_blur', 0.0),
+                seed=getattr(config, 'texture_seed', 42),
+                grid_spacing=getattr(config, 'grid_spacing', 80),
+                origin=(0, top)
+            )
+
+        if info.tileable:
+            img = apply_in_bands(shade, img, halo=info.halo(getattr(config, 'SuperSampling', 1)))
+        else:
+            img = shade(img, 0)
     return img
 
 def apply_effects_layer(img: Image.Image, config: BannerConfig) -> Image.Image:
@@ -331,13 +376,18 @@ def generate_banner(config: BannerConfig):
         'corner_radius_br': config.corner_radius_br * SS if config.corner_radius_br is not None else None,
         'preset_name': getattr(config, 'preset_name', None),
     })
+    # render_workers applies to this render only
+    previous_workers = None
+    if getattr(config, 'render_workers', None) is not None:
+        previous_workers = set_workers(config.render_workers)
     try:
         img = create_background_layer(big_config)
+        img = apply_texture_layer(img, big_config, stage="background")
         img = apply_pattern_layer(img, big_config)     # Pattern behind everything
         img = apply_shape_layer(img, big_config)     # Decorative shapes behind text/icon
         img = apply_icon_layer(img, big_config)      # Icon in foreground
         img = apply_text_layer(img, big_config)      # Text on top of everything
-        img = apply_texture_layer(img, big_config)
+        img = apply_texture_layer(img, big_config, stage="composite")
         img = apply_effects_layer(img, big_config)
         img = apply_overlay_layer(img, big_config)
         img = apply_mask_layer(img, big_config)
@@ -359,4 +409,7 @@ def generate_banner(config: BannerConfig):
         config_str = pprint.pformat(config_dict, width=120, compact=True)
         raise RuntimeError(
             f"[ERROR] Layer: {layer} | Preset: {preset_name or 'Unknown'} | Error: {str(e)}\n\nUsed config parameters:\n{config_str}\n\nDetailed traceback:\n{tb}"
-        ) from e 
\ No newline at end of file
+        ) from e
+    finally:
+        if previous_workers is not None:
+            set_workers(previous_workers)
@@ -3,6 +3,7 @@
 
 import os
 import importlib
+from core.plugin_utils import describe_plugin
 
 # Get current directory
 current_dir = os.path.dirname(__file__)
@@ -11,15 +12,26 @@ current_dir = os.path.dirname(__file__)
 shape_files = [f[:-3] for f in os.listdir(current_dir) 
                if f.endswith('.py') and f != '__init__.py' and not f.startswith('_')]
 
-# Build SHAPE_MAP by importing modules
+# Shapes draw their own layer and composite it over the image, with sizes
+# that follow supersampling: this is the default descriptor (see
+# core.plugin_utils)
+SHAPE_PLUGIN_DEFAULTS = dict(
+    kind="pointwise", supersampled=True, positional=True,
+    params=('shape', 'shape_color', 'shape_blur', 'shapes'),
+)
+
+# Build SHAPE_MAP (and SHAPE_PLUGINS descriptors) by importing modules
 SHAPE_MAP = {}
+SHAPE_PLUGINS = {}
 for shape_name in shape_files:
     try:
         module = importlib.import_module(f'.{shape_name}', package='banner.shapes')
         if hasattr(module, f'apply_{shape_name}'):
             SHAPE_MAP[shape_name] = getattr(module, f'apply_{shape_name}')
+            SHAPE_PLUGINS[shape_name] = describe_plugin(
+                module, shape_name, SHAPE_MAP[shape_name], **SHAPE_PLUGIN_DEFAULTS)
     except ImportError:
         pass
 
 # Export the map
-__all__ = ['SHAPE_MAP']
\ No newline at end of file
+__all__ = ['SHAPE_MAP', 'SHAPE_PLUGINS']
\ No newline at end of file
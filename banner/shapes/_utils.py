@@ -4,20 +4,44 @@
 from PIL import Image, ImageDraw
 import math
 import random
+from core.layer_utils import composite_in_bbox
 
 def create_shape_overlay(img):
     """Create a transparent overlay for shape drawing."""
     return Image.new("RGBA", img.size, (0,0,0,0))
 
+def create_bbox_overlay(img, bbox, pad=1):
+    """
+    Create a transparent overlay covering only bbox (left, top, right, bottom),
+    padded and clipped to img. Returns (overlay, origin); draw with
+    coordinates shifted by -origin and pass origin to composite_shape.
+    """
+    left = max(0, int(math.floor(bbox[0])) - pad)
+    top = max(0, int(math.floor(bbox[1])) - pad)
+    right = min(img.width, int(math.ceil(bbox[2])) + pad + 1)
+    bottom = min(img.height, int(math.ceil(bbox[3])) + pad + 1)
+    return Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (0,0,0,0)), (left, top)
+
+def points_bbox(points):
+    """Bounding box (left, top, right, bottom) of a list of (x, y) points."""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+def shift_points(points, origin):
+    """Translate points into the coordinates of an overlay placed at origin."""
+    ox, oy = origin
+    return [(x - ox, y - oy) for x, y in points]
+
 def ensure_color_tuple(color):
     """Ensure color is a tuple."""
     if isinstance(color, list):
         return tuple(color)
     return color
 
-def composite_shape(img, overlay):
-    """Composite shape overlay onto image."""
-    return Image.alpha_composite(img, overlay)
+def composite_shape(img, overlay, origin=(0, 0)):
+    """Composite shape overlay (placed at origin) onto image, within its content box only."""
+    return composite_in_bbox(img, overlay, origin)
 
 def calculate_default_center(W, H):
     """Calculate default center point."""
@@ -3,16 +3,16 @@
 
 from PIL import Image, ImageDraw
 import math
-import random
-from ._utils import create_shape_overlay, ensure_color_tuple, composite_shape
+from ._utils import create_bbox_overlay, points_bbox, shift_points, ensure_color_tuple, composite_shape
+from core.random_utils import hash_uniform
+from core.plugin_utils import PluginInfo
+
+PLUGIN = PluginInfo(kind="pointwise", supersampled=True, rng="position", positional=True,
+                    params=('shape', 'shape_color', 'shape_blur', 'shapes'))
 
 def apply_blob(img, W, H, SS, color=(255, 140, 0, 90), seed=42, scale=0.7, blur=24):
     scale = max(scale if scale is not None else 0.7, 0.05)
     blur = max(blur if blur is not None else 24, 0)
-    random.seed(seed)
-    
-    overlay = create_shape_overlay(img)
-    draw = ImageDraw.Draw(overlay)
     
     # Simple blob algorithm: random points around center
     cx, cy = int(W*0.5), int(H*0.5)
@@ -22,12 +22,15 @@ def apply_blob(img, W, H, SS, color=(255, 140, 0, 90), seed=42, scale=0.7, blur=
     
     for i in range(n):
         angle = 2 * math.pi * i / n
-        radius = r * (0.85 + 0.3 * random.random())
+        # Control point i is keyed by its index, not by draw order
+        radius = r * (0.85 + 0.3 * float(hash_uniform(seed, i, 0)))
         x = int(cx + radius * math.cos(angle))
         y = int(cy + radius * math.sin(angle))
         points.append((x, y))
     
     color = ensure_color_tuple(color)
-    draw.polygon(points, fill=color)
+    overlay, origin = create_bbox_overlay(img, points_bbox(points))
+    draw = ImageDraw.Draw(overlay)
+    draw.polygon(shift_points(points, origin), fill=color)
     
-    return composite_shape(img, overlay)
\ No newline at end of file
+    return composite_shape(img, overlay, origin)
\ No newline at end of file
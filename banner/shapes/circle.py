@@ -2,15 +2,12 @@
 # Circle shape generation
 
 from PIL import Image, ImageDraw
-from ._utils import create_shape_overlay, ensure_color_tuple, composite_shape
+from ._utils import create_bbox_overlay, ensure_color_tuple, composite_shape
 
 def apply_circle(img, W, H, SS, color=(255, 100, 100, 100), center=None, radius=None, blur=0):
     """Create a circular shape."""
     color = ensure_color_tuple(color)
     
-    overlay = create_shape_overlay(img)
-    draw = ImageDraw.Draw(overlay)
-    
     # Default center and radius
     if center is None:
         center = (W // 2, H // 2)
@@ -23,6 +20,8 @@ def apply_circle(img, W, H, SS, color=(255, 100, 100, 100), center=None, radius=
     right = center[0] + radius
     bottom = center[1] + radius
     
-    draw.ellipse([left, top, right, bottom], fill=color)
+    overlay, (ox, oy) = create_bbox_overlay(img, (left, top, right, bottom))
+    draw = ImageDraw.Draw(overlay)
+    draw.ellipse([left - ox, top - oy, right - ox, bottom - oy], fill=color)
     
-    return composite_shape(img, overlay)
\ No newline at end of file
+    return composite_shape(img, overlay, (ox, oy))
\ No newline at end of file
@@ -3,16 +3,13 @@
 
 from PIL import Image, ImageDraw
 from math import radians, tan
-from ._utils import create_shape_overlay, ensure_color_tuple, composite_shape
+from ._utils import create_bbox_overlay, points_bbox, shift_points, ensure_color_tuple, composite_shape
 
 def apply_diagonal_bar(img, W, H, SS, color=(0, 0, 0, 60), angle=30, thickness=0.25, blur=16):
     angle = angle if angle is not None else 30
     thickness = max(thickness if thickness is not None else 0.25, 0.01)
     blur = max(blur if blur is not None else 16, 0)
     
-    overlay = create_shape_overlay(img)
-    draw = ImageDraw.Draw(overlay)
-    
     # Bar width
     bar_w = int(H * thickness)
     # Calculate bar corner points (top-left to bottom-right)
@@ -25,6 +22,8 @@ def apply_diagonal_bar(img, W, H, SS, color=(0, 0, 0, 60), angle=30, thickness=0
     ]
     
     color = ensure_color_tuple(color)
-    draw.polygon(points, fill=color)
+    overlay, origin = create_bbox_overlay(img, points_bbox(points))
+    draw = ImageDraw.Draw(overlay)
+    draw.polygon(shift_points(points, origin), fill=color)
     
-    return composite_shape(img, overlay)
\ No newline at end of file
+    return composite_shape(img, overlay, origin)
\ No newline at end of file
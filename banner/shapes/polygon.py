@@ -3,15 +3,12 @@
 
 from PIL import Image, ImageDraw
 import math
-from ._utils import create_shape_overlay, ensure_color_tuple, composite_shape
+from ._utils import create_bbox_overlay, points_bbox, shift_points, ensure_color_tuple, composite_shape
 
 def apply_polygon(img, W, H, SS, color=(255, 80, 80, 80), center=None, radius=None, sides=6, rotation=0, blur=24):
     sides = max(sides if sides is not None else 6, 3)
     blur = max(blur if blur is not None else 24, 0)
     
-    overlay = create_shape_overlay(img)
-    draw = ImageDraw.Draw(overlay)
-    
     cx, cy = center if center else (W//2, H//2)
     radius = radius if radius else int(min(W, H)*0.35)
     angle_offset = math.radians(rotation)
@@ -25,6 +22,8 @@ def apply_polygon(img, W, H, SS, color=(255, 80, 80, 80), center=None, radius=No
     ]
     
     color = ensure_color_tuple(color)
-    draw.polygon(points, fill=color)
+    overlay, origin = create_bbox_overlay(img, points_bbox(points))
+    draw = ImageDraw.Draw(overlay)
+    draw.polygon(shift_points(points, origin), fill=color)
     
-    return composite_shape(img, overlay)
\ No newline at end of file
+    return composite_shape(img, overlay, origin)
\ No newline at end of file
@@ -2,15 +2,12 @@
 # Rectangle shape generation
 
 from PIL import Image, ImageDraw
-from ._utils import create_shape_overlay, ensure_color_tuple, composite_shape
+from ._utils import create_bbox_overlay, ensure_color_tuple, composite_shape
 
 def apply_rectangle(img, W, H, SS, color=(100, 255, 100, 100), center=None, width=None, height=None, blur=0):
     """Create a rectangular shape."""
     color = ensure_color_tuple(color)
     
-    overlay = create_shape_overlay(img)
-    draw = ImageDraw.Draw(overlay)
-    
     # Default center and dimensions
     if center is None:
         center = (W // 2, H // 2)
@@ -25,6 +22,8 @@ def apply_rectangle(img, W, H, SS, color=(100, 255, 100, 100), center=None, widt
     right = center[0] + width // 2
     bottom = center[1] + height // 2
     
-    draw.rectangle([left, top, right, bottom], fill=color)
+    overlay, (ox, oy) = create_bbox_overlay(img, (left, top, right, bottom))
+    draw = ImageDraw.Draw(overlay)
+    draw.rectangle([left - ox, top - oy, right - ox, bottom - oy], fill=color)
     
-    return composite_shape(img, overlay)
\ No newline at end of file
+    return composite_shape(img, overlay, (ox, oy))
\ No newline at end of file
@@ -2,15 +2,12 @@
 # Triangle shape generation
 
 from PIL import Image, ImageDraw
-from ._utils import create_shape_overlay, ensure_color_tuple, composite_shape
+from ._utils import create_bbox_overlay, points_bbox, shift_points, ensure_color_tuple, composite_shape
 
 def apply_triangle(img, W, H, SS, color=(100, 100, 255, 100), center=None, size=None, blur=0):
     """Create a triangular shape."""
     color = ensure_color_tuple(color)
     
-    overlay = create_shape_overlay(img)
-    draw = ImageDraw.Draw(overlay)
-    
     # Default center and size
     if center is None:
         center = (W // 2, H // 2)
@@ -29,6 +26,8 @@ def apply_triangle(img, W, H, SS, color=(100, 100, 255, 100), center=None, size=
     bottom_right = (cx + size // 2, cy + height // 2)
     
     points = [top, bottom_left, bottom_right]
-    draw.polygon(points, fill=color)
+    overlay, origin = create_bbox_overlay(img, points_bbox(points))
+    draw = ImageDraw.Draw(overlay)
+    draw.polygon(shift_points(points, origin), fill=color)
     
-    return composite_shape(img, overlay)
\ No newline at end of file
+    return composite_shape(img, overlay, origin)
\ No newline at end of file
@@ -3,7 +3,7 @@
 
 from PIL import Image, ImageDraw
 import math
-from ._utils import create_shape_overlay, ensure_color_tuple, composite_shape
+from ._utils import create_bbox_overlay, points_bbox, shift_points, ensure_color_tuple, composite_shape
 
 def apply_wave(img, W, H, SS, color=(0, 200, 255, 90), amplitude=0.18, frequency=2, blur=16, 
                phases=3, phase_shift=0.8, transparency_decay=0.7):
@@ -16,18 +16,13 @@ def apply_wave(img, W, H, SS, color=(0, 200, 255, 90), amplitude=0.18, frequency
     
     color = ensure_color_tuple(color)
     
-    # Create multiple wave layers with different phases
-    overlay = create_shape_overlay(img)
-    
+    # Compute every wave outline first so all layers share one content box
+    waves = []
     for phase in range(phases):
         # Calculate phase offset and transparency
         phase_offset = phase * phase_shift * math.pi
         opacity_factor = transparency_decay ** phase
         
-        # Create wave layer
-        wave_layer = create_shape_overlay(img)
-        draw = ImageDraw.Draw(wave_layer)
-        
         wave_height = int(H * amplitude * (1 - phase * 0.2))  # Slightly decrease amplitude for each layer
         points = []
         
@@ -46,9 +41,16 @@ def apply_wave(img, W, H, SS, color=(0, 200, 255, 90), amplitude=0.18, frequency
         
         # Apply transparency based on layer
         wave_color = (color[0], color[1], color[2], int(color[3] * opacity_factor))
-        draw.polygon(points, fill=wave_color)
+        waves.append((points, wave_color))
+    
+    # Create multiple wave layers with different phases
+    overlay, origin = create_bbox_overlay(img, points_bbox([p for points, _ in waves for p in points]))
+    for points, wave_color in waves:
+        wave_layer = Image.new("RGBA", overlay.size, (0,0,0,0))
+        draw = ImageDraw.Draw(wave_layer)
+        draw.polygon(shift_points(points, origin), fill=wave_color)
         
         # Composite this layer onto the main overlay
         overlay = Image.alpha_composite(overlay, wave_layer)
     
-    return composite_shape(img, overlay)
\ No newline at end of file
+    return composite_shape(img, overlay, origin)
\ No newline at end of file
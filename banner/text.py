@@ -2,20 +2,20 @@
 Text (title, subtitle) processing
 """
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-from core.text_utils import get_text_width
+from core.font_utils import find_font_path, first_fitting, font_manager
+from core.text_utils import text_mask, outline_mask, mask_layer
+from core.layer_utils import composite_in_bbox
 from core.image_utils import get_outline_color, hex_to_rgb, get_contrast_color, contrast_ratio
-import os
+import math
 
-def find_font_path(font_name):
-    # Add .ttf extension if not present
-    if not os.path.splitext(font_name)[1]:
-        font_name += ".ttf"
-    # If no path specified, search in fonts/ directory first
-    if not os.path.isabs(font_name) and not os.path.exists(font_name):
-        font_path = os.path.join("fonts", font_name)
-        if os.path.exists(font_path):
-            return font_path
-    return font_name
+def _stamp(img, color, mask, origin, offset=0):
+    """Blend color into img through a coverage mask at origin (+offset), as ImageDraw.text would."""
+    x, y = origin[0] + offset, origin[1] + offset
+    img.paste(color, (x, y, x + mask.width, y + mask.height), mask)
+
+def _composite_run(img, layer, origin, offset=0):
+    """Alpha-composite a text run's layer (e.g. its shadow) onto img in place, within the run's box."""
+    composite_in_bbox(img, layer, (origin[0] + offset, origin[1] + offset), (0, 0) + layer.size)
 
 def add_text(img: Image.Image, config) -> Image.Image:
     """Adds title and subtitle."""
@@ -152,18 +152,11 @@ def add_text(img: Image.Image, config) -> Image.Image:
     base_chars_per_width = 0.04  # Approximately 40 chars for 1024px width
     max_title_chars = max(15, int(max_title_width * base_chars_per_width))
     
-    while font_size > 10*SS:
-        try:
-            font_title = ImageFont.truetype(find_font_path(title_font), font_size)
-        except Exception as e:
-            print(f"[WARN] Title font could not be loaded: {title_font} ({e}), using default font.")
-            font_title = ImageFont.load_default()
-            # If default font has no size info, assign manually
-            if not hasattr(font_title, 'size'):
-                font_title.size = font_size
-        title_w = get_text_width(font_title, title)
-        title_h = getattr(font_title, 'size', font_size)
-        
+    title_path = find_font_path(title_font)
+    subtitle_path = find_font_path(subtitle_font)
+    
+    def fit_subtitle(font_size):
+        """Subtitle size for a title size: the largest (stepping by SS) that fits."""
         # Smart subtitle sizing - independent optimization
         base_subtitle_size = max(10*SS, int(font_size * 0.45))
         max_subtitle_size = max(12*SS, int(font_size * 0.65))  # Allow larger subtitle if space permits
@@ -171,36 +164,25 @@ def add_text(img: Image.Image, config) -> Image.Image:
         # Dynamic subtitle character limit based on available width
         max_subtitle_chars = max(25, int(max_title_width * base_chars_per_width * 1.5))  # Allow more chars for subtitle
         
-        # Find optimal subtitle size
-        subtitle_font_size = max_subtitle_size
-        while subtitle_font_size >= base_subtitle_size:
-            try:
-                font_subtitle = ImageFont.truetype(find_font_path(subtitle_font), subtitle_font_size)
-            except Exception as e:
-                print(f"[WARN] Subtitle font could not be loaded: {subtitle_font} ({e}), using default font.")
-                font_subtitle = ImageFont.load_default()
-                if not hasattr(font_subtitle, 'size'):
-                    font_subtitle.size = subtitle_font_size
-            
-            subtitle_w = get_text_width(font_subtitle, subtitle)
-            subtitle_h = getattr(font_subtitle, 'size', subtitle_font_size)
-            
-            # Check if subtitle fits well
-            subtitle_fits = subtitle_w < max_title_width and (len(subtitle) <= max_subtitle_chars or subtitle_font_size <= base_subtitle_size)
-            
-            if subtitle_fits:
-                break
-            subtitle_font_size -= 1*SS
-        
-        # Final subtitle sizing
-        try:
-            font_subtitle = ImageFont.truetype(find_font_path(subtitle_font), subtitle_font_size)
-        except Exception as e:
-            font_subtitle = ImageFont.load_default()
-            if not hasattr(font_subtitle, 'size'):
-                font_subtitle.size = subtitle_font_size
+        # Check if subtitle fits well
+        def subtitle_fits(subtitle_font_size):
+            subtitle_w = font_manager.text_width(subtitle_path, subtitle_font_size, subtitle)
+            return subtitle_w < max_title_width and (len(subtitle) <= max_subtitle_chars or subtitle_font_size <= base_subtitle_size)
         
-        subtitle_w = get_text_width(font_subtitle, subtitle)
+        sizes = range(max_subtitle_size, base_subtitle_size - 1, -SS)
+        subtitle_font_size = first_fitting(sizes, subtitle_fits)
+        if subtitle_font_size is None:
+            # Nothing fits: one step below the smallest candidate
+            subtitle_font_size = sizes[-1] - SS if sizes else max_subtitle_size
+        return subtitle_font_size
+    
+    def text_fits(font_size):
+        font_title = font_manager.get_font(title_path, font_size)
+        title_w = font_manager.text_width(title_path, font_size, title)
+        title_h = getattr(font_title, 'size', font_size)
+        subtitle_font_size = fit_subtitle(font_size)
+        font_subtitle = font_manager.get_font(subtitle_path, subtitle_font_size)
+        subtitle_w = font_manager.text_width(subtitle_path, subtitle_font_size, subtitle)
         subtitle_h = getattr(font_subtitle, 'size', subtitle_font_size)
         text_block_h = title_h + int(0.18*height) + subtitle_h
         
@@ -208,15 +190,23 @@ def add_text(img: Image.Image, config) -> Image.Image:
         width_fits = title_w < max_title_width and subtitle_w < max_title_width
         height_fits = text_block_h < max_block_height
         char_reasonable = len(title) <= max_title_chars or font_size < int(height * 0.15)  # Allow smaller fonts for very long text
-        
-        if width_fits and height_fits and char_reasonable:
-            break
-        
-        # Smaller reduction step for finer control
-        font_size -= 1*SS
+        return width_fits and height_fits and char_reasonable
+    
+    # Largest title size (stepping down by SS, above 10*SS) that fits; every
+    # criterion only gets easier as the size shrinks, so binary search over
+    # the cached fonts and measurements finds it in a handful of steps
+    sizes = range(font_size, 10*SS, -SS)
+    fitting_size = first_fitting(sizes, text_fits)
+    if fitting_size is not None:
+        font_size = fitting_size
+    elif sizes:
+        font_size = sizes[-1]  # Nothing fits: the smallest candidate
+    subtitle_font_size = fit_subtitle(font_size)
+    font_title = font_manager.get_font(title_path, font_size)
+    font_subtitle = font_manager.get_font(subtitle_path, subtitle_font_size)
     # Position calculations
-    title_w, title_h = get_text_width(font_title, title), getattr(font_title, 'size', font_size)
-    subtitle_w, subtitle_h = get_text_width(font_subtitle, subtitle), getattr(font_subtitle, 'size', subtitle_font_size)
+    title_w, title_h = font_manager.text_width(title_path, font_size, title), getattr(font_title, 'size', font_size)
+    subtitle_w, subtitle_h = font_manager.text_width(subtitle_path, subtitle_font_size, subtitle), getattr(font_subtitle, 'size', subtitle_font_size)
     text_block_h = title_h + int(0.18*height) + subtitle_h
     icon_block_h = icon_size
     block_h = max(text_block_h, icon_block_h)
@@ -227,8 +217,11 @@ def add_text(img: Image.Image, config) -> Image.Image:
         title_x = min_icon_margin
     title_y = block_y + (block_h - text_block_h)//2
     subtitle_y = title_y + title_h + int(0.18*height)
-    draw = ImageDraw.Draw(img)
     outline_color = get_outline_color(text_rgb)
+    # Box, shadows, outlines and fills are composited in place, each only
+    # within its own bounding box
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
     # --- NEW: text_box drawing ---
     if text_box:
         # Calculate box size (for title + subtitle)
@@ -260,47 +253,40 @@ def add_text(img: Image.Image, config) -> Image.Image:
             return (0,0,0,90)
         box_color_draw = parse_rgba(text_box_color)
         # Text box background applied
-        # Use overlay layer for transparent box
-        overlay = Image.new("RGBA", img.size, (0,0,0,0))
+        # Use overlay layer for transparent box, covering just the box
+        left, top = math.floor(box_left), math.floor(box_top)
+        overlay = Image.new("RGBA", (math.ceil(box_right) - left + 1, math.ceil(box_bottom) - top + 1), (0,0,0,0))
         overlay_draw = ImageDraw.Draw(overlay)
+        local_box = [box_left - left, box_top - top, box_right - left, box_bottom - top]
         try:
-            overlay_draw.rounded_rectangle([box_left, box_top, box_right, box_bottom], radius=text_box_radius, fill=box_color_draw)
+            overlay_draw.rounded_rectangle(local_box, radius=text_box_radius, fill=box_color_draw)
         except:
-            overlay_draw.rectangle([box_left, box_top, box_right, box_bottom], fill=box_color_draw)
-        img = Image.alpha_composite(img, overlay)
-        draw = ImageDraw.Draw(img)
+            overlay_draw.rectangle(local_box, fill=box_color_draw)
+        composite_in_bbox(img, overlay, (left, top), (0, 0) + overlay.size)
     # ---
+    # Each text run is rasterized once into a coverage mask; its shadow,
+    # outline (the mask stamped at 8 offsets) and fill are stamped from it
+    title_mask, title_origin = text_mask(font_title, title, (title_x, title_y), pad=2*SS)
+    subtitle_mask, subtitle_origin = text_mask(font_subtitle, subtitle, (title_x, subtitle_y), pad=1*SS)
     # Shadow effect
     if shadow:
-        shadow_layer = Image.new("RGBA", img.size, (0,0,0,0))
-        shadow_draw = ImageDraw.Draw(shadow_layer)
         shadow_color = (0,0,0,shadow_opacity)
         shadow_offset = 4 * SS
-        shadow_draw.text((title_x+shadow_offset, title_y+shadow_offset), title, font=font_title, fill=shadow_color)
+        shadow_layer = mask_layer(title_mask, shadow_color)
         # Blur removed - SuperSampling provides anti-aliasing for shadows
         # shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(radius=4*SS/2))
-        img = Image.alpha_composite(img.convert("RGBA"), shadow_layer)
-        draw = ImageDraw.Draw(img)
+        _composite_run(img, shadow_layer, title_origin, shadow_offset)
     # Outline
-    for dx in [-2*SS,0,2*SS]:
-        for dy in [-2*SS,0,2*SS]:
-            if dx == 0 and dy == 0: continue
-            draw.text((title_x+dx, title_y+dy), title, font=font_title, fill=outline_color)
-    draw.text((title_x, title_y), title, font=font_title, fill=text_rgb)
+    _stamp(img, outline_color, outline_mask(title_mask, 2*SS), title_origin)
+    _stamp(img, text_rgb, title_mask, title_origin)
     # Subtitle
     if shadow:
-        shadow_layer = Image.new("RGBA", img.size, (0,0,0,0))
-        shadow_draw = ImageDraw.Draw(shadow_layer)
         shadow_color = (0,0,0,shadow_opacity)
         shadow_offset = 2 * SS
-        shadow_draw.text((title_x+shadow_offset, subtitle_y+shadow_offset), subtitle, font=font_subtitle, fill=shadow_color)
+        shadow_layer = mask_layer(subtitle_mask, shadow_color)
         # Blur removed - SuperSampling provides anti-aliasing for shadows
         # shadow_layer = shadow_layer.filter(ImageFilter.GaussianBlur(radius=3*SS/2))
-        img = Image.alpha_composite(img.convert("RGBA"), shadow_layer)
-        draw = ImageDraw.Draw(img)
-    for dx in [-1*SS,0,1*SS]:
-        for dy in [-1*SS,0,1*SS]:
-            if dx == 0 and dy == 0: continue
-            draw.text((title_x+dx, subtitle_y+dy), subtitle, font=font_subtitle, fill=outline_color)
-    draw.text((title_x, subtitle_y), subtitle, font=font_subtitle, fill=text_rgb)
-    return img 
\ No newline at end of file
+        _composite_run(img, shadow_layer, subtitle_origin, shadow_offset)
+    _stamp(img, outline_color, outline_mask(subtitle_mask, 1*SS), subtitle_origin)
+    _stamp(img, text_rgb, subtitle_mask, subtitle_origin)
+    return img
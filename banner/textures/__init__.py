@@ -3,6 +3,7 @@
 
 import os
 import importlib
+from core.plugin_utils import describe_plugin
 
 # Get current directory
 current_dir = os.path.dirname(__file__)
@@ -11,15 +12,25 @@ current_dir = os.path.dirname(__file__)
 texture_files = [f[:-3] for f in os.listdir(current_dir) 
                  if f.endswith('.py') and f != '__init__.py' and not f.startswith('_')]
 
-# Build TEXTURE_MAP by importing modules
+# Textures only multiply or offset the pixel under them, by values keyed by
+# absolute position: this is the default descriptor (see core.plugin_utils)
+TEXTURE_PLUGIN_DEFAULTS = dict(
+    kind="pointwise", rng="position", supersampled=True, positional=True, origin=True,
+    params=('texture_density', 'texture_seed', 'texture_scale'),
+)
+
+# Build TEXTURE_MAP (and TEXTURE_PLUGINS descriptors) by importing modules
 TEXTURE_MAP = {}
+TEXTURE_PLUGINS = {}
 for texture_name in texture_files:
     try:
         module = importlib.import_module(f'.{texture_name}', package='banner.textures')
         if hasattr(module, f'apply_{texture_name}'):
             TEXTURE_MAP[texture_name] = getattr(module, f'apply_{texture_name}')
+            TEXTURE_PLUGINS[texture_name] = describe_plugin(
+                module, texture_name, TEXTURE_MAP[texture_name], **TEXTURE_PLUGIN_DEFAULTS)
     except ImportError:
         pass
 
 # Export the map
-__all__ = ['TEXTURE_MAP']
\ No newline at end of file
+__all__ = ['TEXTURE_MAP', 'TEXTURE_PLUGINS']
\ No newline at end of file
@@ -1,126 +1,252 @@
 # textures/_utils.py
 # Shared utilities for texture generation
 
+from functools import lru_cache
 import numpy as np
 from PIL import Image
+from core.noise_utils import resample_open_grid
 
-def calculate_normal_map_from_heightmap(heightmap, strength=1.0):
+# Numeric policy: textures keep the image in uint8 (int16 where noise is
+# added) and compute heights, slopes and lighting in float32 row bands,
+# multiplying lighting into RGB in place (multiply_rgb). Peak extra memory
+# is about 3x the uint8 canvas for weaves, 5x for noise and grain, and up to
+# about 12x with the float32 band intermediates of heightmap textures
+# (SHADE_BAND_ROWS rows on a 3x supersampled banner). tests/test_memory.py
+# holds every texture to 12x.
+
+# Rows per band in the shading kernels; bounds the float32 intermediates
+SHADE_BAND_ROWS = 256
+
+# Bounding-box pixels tested per batch in rasterize_triangle_ids
+RASTER_BATCH_PIXELS = 1 << 18
+
+# Samples per feature when a texture band is synthesized below full
+# resolution (multiplied by the quality knob, texture_scale)
+BAND_SAMPLES_PER_FEATURE = 4
+
+def multiply_rgb(rgb, factor):
+    """Multiply a uint8 RGB view by a float32 (h, w) factor in place (truncating, like an 8-bit assignment)."""
+    np.multiply(rgb, factor[..., np.newaxis], out=rgb, casting='unsafe')
+    return rgb
+
+def _diffuse(dx, dy, strength, light_dir, ambient):
     """
-    Calculate normal map from heightmap using gradient.
-    Simple version without mesh triangulation.
+    Lighting factor ambient + (1 - ambient) * Lambert diffuse for height
+    slopes dx, dy (normal (-dx, -dy, 1/strength)). float32, computed in
+    place in dx's and dy's buffers.
     """
-    h, w = heightmap.shape
+    lx, ly, lz = (np.asarray(light_dir, dtype=np.float64) / np.linalg.norm(light_dir)).astype(np.float32)
+    dz = np.float32(1.0 / strength)
+    ambient = np.float32(ambient)
     
-    # Calculate gradients (sobel-like)
-    # Pad the heightmap to handle edges
-    padded = np.pad(heightmap, 1, mode='edge')
+    # |n| before dx/dy are overwritten
+    length = dx * dx
+    length += dy * dy
+    length += dz * dz
+    np.sqrt(length, out=length)
     
-    # Calculate gradients
-    dx = (padded[1:-1, 2:] - padded[1:-1, :-2]) / 2.0
-    dy = (padded[2:, 1:-1] - padded[:-2, 1:-1]) / 2.0
+    # diffuse = dot((-dx, -dy, dz), light) / |n|, computed in dx's buffer
+    diffuse = dx
+    diffuse *= -lx
+    dy *= ly
+    diffuse -= dy
+    diffuse += dz * lz
+    diffuse /= length
+    np.clip(diffuse, 0, 1, out=diffuse)  # Only positive lighting
     
-    # Calculate normal vectors
-    # Normal = (-dx, -dy, 1) normalized
-    dz = np.ones_like(dx) / strength
-    
-    # Normalize
-    length = np.sqrt(dx*dx + dy*dy + dz*dz)
-    nx = -dx / length
-    ny = -dy / length  
-    nz = dz / length
-    
-    # Convert to [0, 255] range
-    normal_map = np.zeros((h, w, 3), dtype=np.uint8)
-    normal_map[:, :, 0] = ((nx + 1) * 127.5).astype(np.uint8)  # Red = X
-    normal_map[:, :, 1] = ((ny + 1) * 127.5).astype(np.uint8)  # Green = Y  
-    normal_map[:, :, 2] = ((nz + 1) * 127.5).astype(np.uint8)  # Blue = Z
-    
-    return normal_map
+    # lighting = ambient + (1 - ambient) * diffuse
+    diffuse *= 1 - ambient
+    diffuse += ambient
+    return diffuse
+
+def _slopes(heights):
+    """Central-difference slopes (dx, dy) of the interior of heights (one pixel of context on every side)."""
+    heights = heights.astype(np.float32, copy=False)
+    dx = heights[1:-1, 2:] - heights[1:-1, :-2]
+    dx *= np.float32(0.5)
+    dy = heights[2:, 1:-1] - heights[:-2, 1:-1]
+    dy *= np.float32(0.5)
+    return dx, dy
+
+def _lighting(heights, strength, light_dir, ambient):
+    """Lighting factor for the interior of heights (one pixel of context on every side)."""
+    dx, dy = _slopes(heights)
+    return _diffuse(dx, dy, strength, light_dir, ambient)
 
-def apply_lighting_to_image(img_array, normal_map, light_dir=(-0.5, -0.5, 1.0), ambient=0.3):
+def band_steps(feature_size, quality=1.0):
     """
-    Apply lighting to image using normal map.
+    Sample spacing (x, y) in pixels for a band whose finest detail is
+    feature_size pixels (a number or (x, y) pair) at the given quality.
     """
-    # Normalize light direction
-    light_dir = np.array(light_dir)
-    light_dir = light_dir / np.linalg.norm(light_dir)
-    
-    # Convert normal map back to [-1, 1] range
-    normal_map_processed = (normal_map.astype(np.float32) / 127.5) - 1
-    
-    # Calculate diffuse lighting (dot product)
-    diffuse = np.sum(normal_map_processed * light_dir, axis=2)
-    diffuse = np.clip(diffuse, 0, 1)  # Only positive lighting
-    
-    # Combine ambient + diffuse
-    lighting = ambient + (1 - ambient) * diffuse
+    fx, fy = feature_size if isinstance(feature_size, (tuple, list)) else (feature_size, feature_size)
+    samples = BAND_SAMPLES_PER_FEATURE * max(quality, 1e-3)
+    return (max(1, int(fx / samples)), max(1, int(fy / samples)))
+
+def _band_slopes(height_func, xs, ys, steps):
+    """
+    Slopes (dx, dy) of one band at pixels xs, ys: central differences at
+    the band's own sample spacing, resampled bilinearly to full resolution.
+    """
+    step_x, step_y = steps
+    if (step_x, step_y) == (1, 1):
+        ext_x = np.arange(xs[0, 0] - 1, xs[0, -1] + 2)[None, :]
+        ext_y = np.arange(ys[0, 0] - 1, ys[-1, 0] + 2)[:, None]
+        return _slopes(np.broadcast_to(height_func(ext_x, ext_y), (ext_y.shape[0], ext_x.shape[1])))
     
-    # Apply lighting to image
-    if img_array.shape[-1] == 4:  # RGBA
-        lit_img = img_array.copy()
-        lit_img[:, :, :3] = (lit_img[:, :, :3] * lighting[..., np.newaxis]).astype(np.uint8)
-    else:  # RGB
-        lit_img = (img_array * lighting[..., np.newaxis]).astype(np.uint8)
+    def coarse_slopes(gx, gy):
+        # Heights with one extra sample on every side, differenced on the sample grid
+        ext_x = np.arange(gx[0, 0] - step_x, gx[0, -1] + 2 * step_x, step_x)[None, :]
+        ext_y = np.arange(gy[0, 0] - step_y, gy[-1, 0] + 2 * step_y, step_y)[:, None]
+        dx, dy = _slopes(np.broadcast_to(height_func(ext_x, ext_y), (ext_y.shape[0], ext_x.shape[1])))
+        dx /= np.float32(step_x)
+        dy /= np.float32(step_y)
+        return np.stack([dx, dy])
     
+    dx, dy = resample_open_grid(coarse_slopes, xs, ys, steps)
+    return dx, dy
+
+def shade_bands(img_array, bands, strength=1.0, light_dir=(-0.5, -0.5, 1.0), ambient=0.3, origin=(0, 0), quality=1.0, band_rows=SHADE_BAND_ROWS):
+    """
+    Light an image by a heightmap given as frequency bands: a sequence of
+    (feature_size, height_func) pairs whose sum is the heightmap, where
+    height_func(xs, ys) gives heights at absolute pixel coordinates.
+
+    Slopes are linear in height, so each band's slopes are synthesized at
+    the lowest adequate resolution (see band_steps; quality is
+    texture_scale), upsampled and summed. Lighting then runs once at full
+    resolution, in row bands.
+    """
+    h, w = img_array.shape[:2]
+    x0, y0 = origin
+    steps = [band_steps(feature_size, quality) for feature_size, _ in bands]
+    lit_img = img_array.copy()
+    rgb = lit_img[..., :3]
+    xs = np.arange(x0, x0 + w)[None, :]
+    band_rows = band_rows or h
+    for r0 in range(0, h, band_rows):
+        r1 = min(h, r0 + band_rows)
+        ys = np.arange(y0 + r0, y0 + r1)[:, None]
+        dx = np.zeros((r1 - r0, w), dtype=np.float32)
+        dy = np.zeros((r1 - r0, w), dtype=np.float32)
+        for (_, height_func), band_step in zip(bands, steps):
+            band_dx, band_dy = _band_slopes(height_func, xs, ys, band_step)
+            dx += band_dx
+            dy += band_dy
+        lighting = _diffuse(dx, dy, strength, light_dir, ambient)
+        multiply_rgb(rgb[r0:r1], lighting)
     return lit_img
 
+@lru_cache(maxsize=32)
+def periodic_lighting_unit(height_func, period, params, strength=1.0, light_dir=(-0.5, -0.5, 1.0), ambient=0.3):
+    """
+    Lighting factor for one (period_x, period_y) repeat unit of a periodic
+    heightmap height_func(xs, ys, *params), evaluated at absolute pixel
+    coordinates. The context ring comes from the neighbouring periods, so
+    tiled copies join without seams. Cached per weave geometry and light.
+    """
+    px, py = period
+    ys, xs = np.ogrid[-1:py + 1, -1:px + 1]
+    heights = np.broadcast_to(height_func(xs, ys, *params), (py + 2, px + 2))
+    lighting = _lighting(heights, strength, light_dir, ambient)
+    lighting.setflags(write=False)
+    return lighting
+
+def shade_periodic(img_array, unit, origin=(0, 0), band_rows=SHADE_BAND_ROWS):
+    """
+    Multiply RGB by a cached lighting unit tiled across the image (aligned
+    to absolute coordinates via origin). Only a unit-high strip of the
+    canvas width and one band are ever materialized.
+    """
+    h, w = img_array.shape[:2]
+    py, px = unit.shape
+    x0, y0 = origin
+    lit_img = img_array.copy()
+    rgb = lit_img[..., :3]
+    strip = np.take(unit, (np.arange(w) + x0) % px, axis=1)
+    band_rows = band_rows or h
+    for r0 in range(0, h, band_rows):
+        r1 = min(h, r0 + band_rows)
+        lighting = np.take(strip, (np.arange(r0, r1) + y0) % py, axis=0)
+        multiply_rgb(rgb[r0:r1], lighting)
+    return lit_img
+
+def rasterize_triangle_ids(shape, vertices, tri_simplices):
+    """
+    Label map of triangle IDs: each pixel holds the index of the triangle
+    covering it (inclusive barycentric test), or -1. Triangles are tested in
+    batches of about RASTER_BATCH_PIXELS bounding-box pixels at once; later
+    triangles win on shared edges.
+    """
+    H, W = shape
+    labels = np.full(H * W, -1, dtype=np.int32)
+    corners = np.asarray(vertices, dtype=np.float64)[np.asarray(tri_simplices)].reshape(-1, 3, 2)
+    (x0, y0), (x1, y1), (x2, y2) = corners[:, 0].T, corners[:, 1].T, corners[:, 2].T
+    denom = (y1 - y2)*(x0 - x2) + (x2 - x1)*(y0 - y2)
+    # Bounding boxes, truncated like int() and clipped to the canvas
+    min_x = np.maximum(0, np.trunc(corners[..., 0].min(axis=1))).astype(np.int64)
+    max_x = np.minimum(W, np.trunc(corners[..., 0].max(axis=1)) + 1).astype(np.int64)
+    min_y = np.maximum(0, np.trunc(corners[..., 1].min(axis=1))).astype(np.int64)
+    max_y = np.minimum(H, np.trunc(corners[..., 1].max(axis=1)) + 1).astype(np.int64)
+    widths, heights = max_x - min_x, max_y - min_y
+    tris = np.flatnonzero((np.abs(denom) >= 1e-8) & (widths > 0) & (heights > 0))
+    # By box size, so the boxes of a batch pad to about the same size
+    tris = tris[np.lexsort((widths[tris], heights[tris]))]
+
+    start = 0
+    while start < len(tris):
+        count = max(1, RASTER_BATCH_PIXELS // int(widths[tris[start]] * heights[tris[start]]))
+        while True:
+            batch = tris[start:start + count]
+            bw, bh = int(widths[batch].max()), int(heights[batch].max())
+            if count == 1 or len(batch) * bw * bh <= 2 * RASTER_BATCH_PIXELS:
+                break
+            count //= 2
+        # (triangle, row, column) pixels of every box, padded to bh x bw
+        tx0, ty0, tx1, ty1, tx2, ty2, d, left, top, right, bottom = (
+            v[batch, np.newaxis, np.newaxis] for v in (x0, y0, x1, y1, x2, y2, denom, min_x, min_y, max_x, max_y))
+        xs = left + np.arange(bw)[np.newaxis, np.newaxis, :]
+        ys = top + np.arange(bh)[np.newaxis, :, np.newaxis]
+        a = ((ty1 - ty2)*(xs - tx2) + (tx2 - tx1)*(ys - ty2)) / d
+        b = ((ty2 - ty0)*(xs - tx2) + (tx0 - tx2)*(ys - ty2)) / d
+        c = 1 - a - b
+        inside = (a >= 0) & (a <= 1) & (b >= 0) & (b <= 1) & (c >= 0) & (c <= 1) & (xs < right) & (ys < bottom)
+        ids = np.broadcast_to(batch[:, np.newaxis, np.newaxis].astype(np.int32), inside.shape)
+        # Highest triangle index per pixel, i.e. later triangles win
+        np.maximum.at(labels, (ys * W + xs)[inside], ids[inside])
+        start += len(batch)
+    return labels.reshape(H, W)
+
 def calculate_normal_map(heightmap, vertices, tri_simplices, strength=2.5):
     """
     Function that calculates a single normal vector for each triangle
     """
     H, W = heightmap.shape
-    normal_map = np.zeros((H, W, 3), dtype=np.float32)
     
-    # Calculate normal for each triangle
-    for simplex in tri_simplices:
-        # Get triangle corner points
-        v0, v1, v2 = vertices[simplex]
-        x0, y0 = v0
-        x1, y1 = v1
-        x2, y2 = v2
-        
-        # Height values of corners
-        z0 = heightmap[int(y0), int(x0)]
-        z1 = heightmap[int(y1), int(x1)]
-        z2 = heightmap[int(y2), int(x2)]
-        
-        # Two vectors of the triangle
-        vec1 = np.array([x1-x0, y1-y0, z1-z0])
-        vec2 = np.array([x2-x0, y2-y0, z2-z0])
-        
-        # Normal vector (cross product)
-        normal = np.cross(vec1, vec2)
-        normal = normal / (np.linalg.norm(normal) + 1e-8)  # normalize
-        
-        # Find triangle boundaries
-        min_x, max_x = int(min(x0, x1, x2)), int(max(x0, x1, x2)) + 1
-        min_y, max_y = int(min(y0, y1, y2)), int(max(y0, y1, y2)) + 1
-        
-        # Assign this normal to all pixels within the triangle
-        for x in range(max(0, min_x), min(W, max_x)):
-            for y in range(max(0, min_y), min(H, max_y)):
-                # Calculate barycentric coordinates
-                denom = (y1 - y2)*(x0 - x2) + (x2 - x1)*(y0 - y2)
-                if abs(denom) < 1e-8:
-                    continue
-                a = ((y1 - y2)*(x - x2) + (x2 - x1)*(y - y2)) / denom
-                b = ((y2 - y0)*(x - x2) + (x0 - x2)*(y - y2)) / denom
-                c = 1 - a - b
-                
-                # If pixel is inside triangle
-                if 0 <= a <= 1 and 0 <= b <= 1 and 0 <= c <= 1:
-                    normal_map[y, x] = normal
+    # Per-face normals for all triangles at once
+    corners = np.asarray(vertices, dtype=np.float64)[np.asarray(tri_simplices)]  # (n, 3, 2)
+    xi = corners[..., 0].astype(np.int64)
+    yi = corners[..., 1].astype(np.int64)
+    z = heightmap[yi, xi]
+    points = np.concatenate([corners, z[..., np.newaxis]], axis=-1)
+    normals = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True) + 1e-8
+    
+    # Rasterize triangle IDs, then gather each pixel's face normal
+    labels = rasterize_triangle_ids((H, W), vertices, tri_simplices)
+    face_normals = np.vstack([normals, np.zeros((1, 3))]).astype(np.float32)
+    normal_map = face_normals[labels]  # -1 (uncovered) picks the zero row
     
     # Edge highlighting
     if strength > 0:
-        dzdx = np.gradient(heightmap, axis=1) * strength * 3.0
-        dzdy = np.gradient(heightmap, axis=0) * strength * 3.0
+        heightmap = np.asarray(heightmap, dtype=np.float32)
+        dzdx = np.gradient(heightmap, axis=1) * np.float32(strength * 3.0)
+        dzdy = np.gradient(heightmap, axis=0) * np.float32(strength * 3.0)
         
         edge_strength = np.sqrt(dzdx**2 + dzdy**2)
-        edge_mask = (edge_strength > np.percentile(edge_strength, 70)).astype(float)
+        edge_mask = (edge_strength > np.percentile(edge_strength, 70)).astype(np.float32)
         
-        normal_map[..., 0] -= edge_mask * dzdx * 0.7
-        normal_map[..., 1] -= edge_mask * dzdy * 0.7
+        normal_map[..., 0] -= edge_mask * dzdx * np.float32(0.7)
+        normal_map[..., 1] -= edge_mask * dzdy * np.float32(0.7)
     
     # Bring normal map to [0,1] range
     normal_map = (normal_map + 1) / 2  # [-1,1] -> [0,1]
@@ -3,30 +3,27 @@
 
 import numpy as np
 from PIL import Image
-from ._utils import calculate_normal_map_from_heightmap, apply_lighting_to_image
+from ._utils import periodic_lighting_unit, shade_periodic
+
+def canvas_heightmap(xs, ys, thread_size):
+    """Canvas weave height at absolute pixel coordinates."""
+    # Simple checkerboard pattern for over/under
+    pattern_x = (xs // thread_size) % 2
+    pattern_y = (ys // thread_size) % 2
+    checkerboard = pattern_x ^ pattern_y
+    
+    # Height variation
+    return np.where(checkerboard, 0.3, 0.1)
 
 def apply_canvas(img, density=1.0, opacity=255, rotation=0, colors=None, SS=1, **kwargs):
     """Apply canvas texture - classic square weave pattern."""
     img_array = np.array(img)
-    h, w = img_array.shape[:2]
     
     # Canvas has simple, regular square weave - scale with SS
     thread_size = max(4, int(12 * SS / density))
     
-    x = np.arange(w)
-    y = np.arange(h)
-    X, Y = np.meshgrid(x, y)
-    
-    # Simple checkerboard pattern for over/under
-    pattern_x = (X // thread_size) % 2
-    pattern_y = (Y // thread_size) % 2
-    checkerboard = pattern_x ^ pattern_y
-    
-    # Height variation
-    heightmap = np.where(checkerboard, 0.3, 0.1)
-    
-    # Calculate normal map and apply lighting
-    normal_map = calculate_normal_map_from_heightmap(heightmap, strength=15.0)
-    lit_img = apply_lighting_to_image(img_array, normal_map, ambient=0.3)
+    # Shade one weave repeat (2 threads each way) and tile it
+    unit = periodic_lighting_unit(canvas_heightmap, (2 * thread_size, 2 * thread_size), (thread_size,), strength=15.0, ambient=0.3)
+    lit_img = shade_periodic(img_array, unit, kwargs.get('origin', (0, 0)))
     
-    return Image.fromarray(lit_img, mode="RGBA")
\ No newline at end of file
+    return Image.fromarray(lit_img, mode="RGBA")
@@ -3,35 +3,32 @@
 
 import numpy as np
 from PIL import Image
-from ._utils import calculate_normal_map_from_heightmap, apply_lighting_to_image
+from ._utils import shade_bands
+from core.noise_utils import gradient_noise
+from core.noise_bank import bank_normal
 
 def apply_concrete(img, density=1.0, opacity=255, rotation=0, colors=None, SS=1, **kwargs):
     """Apply concrete texture using multi-scale height map."""
     img_array = np.array(img)
-    h, w = img_array.shape[:2]
     
     # Generate concrete heightmap with multiple scales
     scale_factor = max(0.5, density)
+    seed = kwargs.get('seed', 42)
     
-    # Coarse bumps - more dramatic
-    coarse_scale = max(16, int(32 / scale_factor))
-    coarse_h, coarse_w = h // 4, w // 4
-    coarse = np.random.normal(0, 0.15, (coarse_h, coarse_w))
-    
-    # Resize coarse to full size
-    from PIL import Image as PILImage
-    coarse_img = PILImage.fromarray(((coarse + 0.3) * 255).astype(np.uint8), mode='L')
-    coarse_resized = coarse_img.resize((w, h), PILImage.BILINEAR)
-    coarse_full = (np.array(coarse_resized).astype(np.float32) / 255) - 0.3
+    # Coarse bumps - more dramatic: 3 octaves of gradient noise (8px features
+    # and finer), each its own band; weights are those of fbm(octaves=3) * 0.5
+    def octave(i):
+        weight = 0.5 * 0.5 ** i / 1.75 * 0.8
+        return lambda xs, ys: gradient_noise(seed, xs, ys, 8 * SS / 2 ** i, stream=i) * np.float32(weight)
     
     # Fine grain - stronger
-    fine = np.random.normal(0, 0.08 * scale_factor, (h, w))
+    def fine(xs, ys):
+        return bank_normal(seed, xs, ys, stream=1, scale=0.08 * scale_factor * 0.4)
     
-    # Combine scales
-    heightmap = coarse_full * 0.8 + fine * 0.4
+    bands = [(8 * SS / 2 ** i, octave(i)) for i in range(3)] + [(1, fine)]
     
-    # Calculate normal map and apply lighting - rougher concrete
-    normal_map = calculate_normal_map_from_heightmap(heightmap, strength=10.0)
-    lit_img = apply_lighting_to_image(img_array, normal_map, ambient=0.2)
+    # Shade by the heightmap's normals - rougher concrete
+    lit_img = shade_bands(img_array, bands, strength=10.0, ambient=0.2,
+                          origin=kwargs.get('origin', (0, 0)), quality=kwargs.get('scale', 1.0))
     
-    return Image.fromarray(lit_img, mode="RGBA")
\ No newline at end of file
+    return Image.fromarray(lit_img, mode="RGBA")
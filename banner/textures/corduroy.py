@@ -3,28 +3,26 @@
 
 import numpy as np
 from PIL import Image
-from ._utils import calculate_normal_map_from_heightmap, apply_lighting_to_image
+from ._utils import periodic_lighting_unit, shade_periodic
+
+def corduroy_heightmap(xs, ys, rib_width):
+    """Corduroy rib height at absolute pixel coordinates (constant along y)."""
+    # Vertical rib pattern
+    rib_position = xs // rib_width
+    rib_pattern = rib_position % 2
+    
+    # Raised ribs vs valleys
+    return np.where(rib_pattern, 0.4, 0.0) + 0.1
 
 def apply_corduroy(img, density=1.0, opacity=255, rotation=0, colors=None, SS=1, **kwargs):
     """Apply corduroy texture - vertical ribs/channels."""
     img_array = np.array(img)
-    h, w = img_array.shape[:2]
     
     # Corduroy has vertical ribs - scale with SS
     rib_width = max(2, int(8 * SS / density))
     
-    x = np.arange(w)
-    X = np.tile(x, (h, 1))
-    
-    # Vertical rib pattern
-    rib_position = X // rib_width
-    rib_pattern = rib_position % 2
-    
-    # Raised ribs vs valleys
-    heightmap = np.where(rib_pattern, 0.4, 0.0) + 0.1
-    
-    # Calculate normal map and apply lighting
-    normal_map = calculate_normal_map_from_heightmap(heightmap, strength=20.0)
-    lit_img = apply_lighting_to_image(img_array, normal_map, ambient=0.2)
+    # Shade one rib pair (a single row, ribs don't vary vertically) and tile it
+    unit = periodic_lighting_unit(corduroy_heightmap, (2 * rib_width, 1), (rib_width,), strength=20.0, ambient=0.2)
+    lit_img = shade_periodic(img_array, unit, kwargs.get('origin', (0, 0)))
     
-    return Image.fromarray(lit_img, mode="RGBA")
\ No newline at end of file
+    return Image.fromarray(lit_img, mode="RGBA")
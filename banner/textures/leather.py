@@ -3,33 +3,34 @@
 
 import numpy as np
 from PIL import Image
-from ._utils import calculate_normal_map_from_heightmap, apply_lighting_to_image
+from ._utils import shade_bands
+from core.noise_utils import fbm, domain_warp
+from core.noise_bank import bank_normal
 
 def apply_leather(img, density=1.0, opacity=255, rotation=0, colors=None, SS=1, **kwargs):
     """Apply leather texture - organic bumps and grain."""
     img_array = np.array(img)
-    h, w = img_array.shape[:2]
     
     # Leather has organic, random bumps
     grain_size = max(0.5, density)
+    seed = kwargs.get('seed', 42)
     
-    # Multi-scale leather grain
-    coarse = np.random.normal(0, 0.1 * grain_size, (h//3, w//3))
-    medium = np.random.normal(0, 0.05 * grain_size, (h//2, w//2))
-    fine = np.random.normal(0, 0.02 * grain_size, (h, w))
+    # Multi-scale leather grain: domain-warped gradient noise gives irregular,
+    # organic pebbles (coarse and medium octaves) over fine pore noise
+    def pebbles(xs, ys):
+        warped_x, warped_y = domain_warp(seed, xs, ys, 8 * SS, 2 * SS, stream=0, step=2 * SS)
+        return fbm(seed, warped_x, warped_y, 4 * SS, octaves=2, stream=1) * np.float32(0.3 * grain_size * 0.9)
     
-    # Resize and combine
-    from PIL import Image as PILImage
-    coarse_img = PILImage.fromarray(((coarse + 0.2) * 255).astype(np.uint8), mode='L')
-    coarse_full = np.array(coarse_img.resize((w, h), PILImage.BILINEAR)) / 255 - 0.2
+    def pores(xs, ys):
+        return bank_normal(seed, xs, ys, stream=2, scale=0.02 * grain_size * 0.1)
     
-    medium_img = PILImage.fromarray(((medium + 0.1) * 255).astype(np.uint8), mode='L')
-    medium_full = np.array(medium_img.resize((w, h), PILImage.BILINEAR)) / 255 - 0.1
+    # Pebbles are sampled at their coarse octave's scale (the warped noise
+    # costs a direct evaluation per sample) and the warp field at half its
+    # finest octave; the slopes are upsampled (see shade_bands)
+    bands = [(4 * SS, pebbles), (1, pores)]
     
-    heightmap = coarse_full * 0.6 + medium_full * 0.3 + fine * 0.1 + 0.1
+    # Shade by the heightmap's normals
+    lit_img = shade_bands(img_array, bands, strength=8.0, ambient=0.4,
+                          origin=kwargs.get('origin', (0, 0)), quality=kwargs.get('scale', 1.0))
     
-    # Calculate normal map and apply lighting
-    normal_map = calculate_normal_map_from_heightmap(heightmap, strength=8.0)
-    lit_img = apply_lighting_to_image(img_array, normal_map, ambient=0.4)
-    
-    return Image.fromarray(lit_img, mode="RGBA")
\ No newline at end of file
+    return Image.fromarray(lit_img, mode="RGBA")
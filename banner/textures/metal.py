@@ -3,26 +3,25 @@
 
 import numpy as np
 from PIL import Image
-from ._utils import calculate_normal_map_from_heightmap, apply_lighting_to_image
+from ._utils import shade_bands
+from core.noise_bank import bank_normal
 
 def apply_metal(img, density=1.0, opacity=255, rotation=0, colors=None, SS=1, **kwargs):
     """Apply brushed metal texture using height map."""
     img_array = np.array(img)
-    h, w = img_array.shape[:2]
     
     # Generate brushed metal heightmap
     scratch_density = max(0.5, density)
+    seed = kwargs.get('seed', 42)
     
-    # Create directional scratches (horizontal brushing) - more pronounced, scale with SS
-    heightmap = np.random.normal(0, 0.08 * scratch_density, (h, w))
+    # Create directional scratches (horizontal brushing) - more pronounced
+    def scratches(xs, ys):
+        return bank_normal(seed, xs, ys, scale=0.08 * scratch_density)
     
-    # Blur removed - SuperSampling provides anti-aliasing for brush direction
-    heightmap_img = Image.fromarray(((heightmap + 0.2) * 255).astype(np.uint8), mode='L')
-    heightmap = (np.array(heightmap_img).astype(np.float32) / 255) - 0.2
+    bands = [(1, scratches)]
     
-    # Calculate normal map and apply lighting - stronger metallic effect
-    normal_map = calculate_normal_map_from_heightmap(heightmap, strength=12.0)
-    lit_img = apply_lighting_to_image(img_array, normal_map, 
-                                     light_dir=(-0.2, -0.9, 1.0), ambient=0.3)
+    # Shade by the heightmap's normals - stronger metallic effect
+    lit_img = shade_bands(img_array, bands, strength=12.0, light_dir=(-0.2, -0.9, 1.0), ambient=0.3,
+                          origin=kwargs.get('origin', (0, 0)), quality=kwargs.get('scale', 1.0))
     
-    return Image.fromarray(lit_img, mode="RGBA")
\ No newline at end of file
+    return Image.fromarray(lit_img, mode="RGBA")
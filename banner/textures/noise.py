@@ -3,12 +3,25 @@
 
 import numpy as np
 from PIL import Image
+from core.random_utils import pixel_grid
+from core.noise_bank import bank_normal
+from core.plugin_utils import PluginInfo
+
+# Per-pixel noise; its strength does not follow supersampling
+PLUGIN = PluginInfo(kind="pointwise", rng="position", positional=True, origin=True,
+                    params=('texture_density', 'texture_seed'))
 
 def apply_noise(img, density=1.0, opacity=255, rotation=0, colors=None, SS=1, **kwargs):
     """Apply noise texture with configurable parameters."""
     arr = np.array(img)
     # Scale noise intensity by density (SS doesn't affect noise)
     noise_intensity = int(16 * density)
-    noise = np.random.normal(0, noise_intensity, arr.shape).astype(np.int16)
-    arr = np.clip(arr + noise, 0, 255).astype(np.uint8)
+    # Position-keyed noise, one stream per channel
+    ys, xs = pixel_grid(arr.shape, kwargs.get('origin', (0, 0)))
+    seed = kwargs.get('seed', 42)
+    # Added channel by channel into one int16 copy of the image
+    result = arr.astype(np.int16)
+    for c in range(arr.shape[2]):
+        result[:, :, c] += bank_normal(seed, xs, ys, c, noise_intensity).astype(np.int16)
+    arr = np.clip(result, 0, 255, out=result).astype(np.uint8)
     return Image.fromarray(arr, mode="RGBA")
\ No newline at end of file
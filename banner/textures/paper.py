@@ -3,29 +3,30 @@
 
 import numpy as np
 from PIL import Image
-from ._utils import calculate_normal_map_from_heightmap, apply_lighting_to_image
+from ._utils import shade_bands
+from core.noise_utils import gradient_noise
+from core.noise_bank import bank_normal
 
 def apply_paper(img, density=1.0, opacity=255, rotation=0, colors=None, SS=1, **kwargs):
     """Apply paper fiber texture using height map."""
     img_array = np.array(img)
-    h, w = img_array.shape[:2]
     
     # Generate paper fiber heightmap
     fiber_density = max(0.3, density)
+    seed = kwargs.get('seed', 42)
     
     # Random fiber pattern - more visible
-    heightmap = np.random.normal(0, 0.04 * fiber_density, (h, w))
+    def fibers(xs, ys):
+        return bank_normal(seed, xs, ys, stream=0, scale=0.04 * fiber_density)
     
-    # Add some directional fibers - stronger
-    direction_noise = np.random.normal(0, 0.02, (h//2, w))
-    direction_img = Image.fromarray(((direction_noise + 0.1) * 255).astype(np.uint8), mode='L')
-    direction_resized = direction_img.resize((w, h), Image.BILINEAR)
-    direction_full = (np.array(direction_resized).astype(np.float32) / 255) - 0.1
+    # Add some directional fibers - stronger (gradient noise stretched vertically 4x)
+    def direction(xs, ys):
+        return gradient_noise(seed, xs, ys, (2 * SS, 8 * SS), stream=1) * np.float32(0.06 * 0.5)
     
-    heightmap += direction_full * 0.5
+    bands = [(1, fibers), ((2 * SS, 8 * SS), direction)]
     
-    # Calculate normal map and apply lighting - more paper texture
-    normal_map = calculate_normal_map_from_heightmap(heightmap, strength=6.0)
-    lit_img = apply_lighting_to_image(img_array, normal_map, ambient=0.5)
+    # Shade by the heightmap's normals - more paper texture
+    lit_img = shade_bands(img_array, bands, strength=6.0, ambient=0.5,
+                          origin=kwargs.get('origin', (0, 0)), quality=kwargs.get('scale', 1.0))
     
-    return Image.fromarray(lit_img, mode="RGBA")
\ No newline at end of file
+    return Image.fromarray(lit_img, mode="RGBA")
@@ -227,7 +227,9 @@ def generate_isolated_element_test(config, element_name):
     elif element_name == 'text':
         img = apply_text_layer(img, big_config)
     elif element_name == 'texture':
-        img = apply_texture_layer(img, big_config)
+        # Offered at both stages, as in generate_banner; texture_target picks one
+        img = apply_texture_layer(img, big_config, stage="background")
+        img = apply_texture_layer(img, big_config, stage="composite")
     elif element_name == 'effect':
         # Effect needs some content to work on - add shapes and patterns
         img = apply_shape_layer(img, big_config)
@@ -268,31 +268,43 @@ def parse_texture_parameter(value):
 
 def parse_effect_parameter(value):
     """
-    Parse effect parameter: "type:intensity"
-    Examples: "glow:soft", "shadow:medium", "blur:light"
+    Parse effect parameter: "type:intensity", per effect in a chain
+    Examples: "glow:soft", "bloom:0.5", "warm,bloom:0.5,vignette:0.8"
+    A numeric intensity (0-1) blends that effect with its input and stays
+    in the effect list; soft/medium/strong set the effect scale.
     """
     if not value:
         return {}
     
-    parts = value.split(':')
     result = {}
-    
-    # First part is effect type
-    if len(parts) >= 1:
-        effect_type = parts[0].lower()
-        result['effect'] = effect_type
-    
-    # Second part is intensity
-    if len(parts) >= 2:
-        intensity = parts[1].lower()
-        if intensity == 'soft':
+    effects = []
+    for item in value.split(','):
+        name, sep, intensity = item.rpartition(':')
+        if not sep:
+            name, intensity = item, None
+        # Effect names are case-insensitive; .cube LUT paths keep their case
+        name = name if name.lower().endswith(".cube") else name.lower()
+        if intensity is None:
+            effects.append(name)
+            continue
+        try:
+            effects.append(f"{name}:{float(intensity)}")
+            continue
+        except ValueError:
+            pass
+        intensity = intensity.lower()
+        if item.lower().endswith(".cube"):
+            effects.append(item)  # e.g. a drive letter, not an intensity
+        elif intensity == 'soft':
+            effects.append(name)
             result['effect_scale'] = 0.7
-        elif intensity == 'medium':
-            result['effect_scale'] = 1.0
         elif intensity == 'strong':
+            effects.append(name)
             result['effect_scale'] = 1.5
         else:
+            effects.append(name)
             result['effect_scale'] = 1.0
+    result['effect'] = ",".join(effects)
     
     return result
 
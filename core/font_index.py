@@ -0,0 +1,181 @@
+# font_index.py
+"""
+Persistent index of the font files in the bundled and system font
+directories.
+
+The index lists every font per directory together with the directory's
+modification time and is saved as JSON at FONT_INDEX_PATH. On first use
+in a process each indexed directory is stat'ed once: directories whose
+mtime changed (a font or subdirectory added, removed or renamed) are
+listed again, everything else is reused, so system fonts are walked only
+when they change. Lookups by file name or by family and style (e.g.
+"DejaVu Sans Bold") are then single dictionary accesses.
+"""
+
+import importlib.util
+import json
+import os
+import platform
+import tempfile
+from functools import lru_cache
+from PIL import ImageFont
+
+FONT_INDEX_PATH = os.environ.get(
+    "BANNER_MAKER_FONT_INDEX",
+    os.path.join(os.path.expanduser("~"), ".cache", "banner_maker", "font_index.json"),
+)
+
+# Bumped when the saved layout changes; older indexes are rebuilt
+FONT_INDEX_VERSION = 1
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc", ".otc")
+
+# Styles a bare family name resolves to
+REGULAR_STYLES = ("regular", "book", "normal", "roman")
+
+
+def font_dirs():
+    """Directories searched for fonts, in priority order: bundled fonts first, then the system's."""
+    dirs = [os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fonts')]
+    # The fonts package wherever it is installed (e.g. site-packages)
+    try:
+        spec = importlib.util.find_spec('fonts')
+        if spec is not None and spec.submodule_search_locations:
+            dirs.extend(spec.submodule_search_locations)
+    except (ImportError, ValueError):
+        pass
+
+    system = platform.system().lower()
+    if system == 'windows':
+        dirs += [
+            os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts'),
+            os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Windows', 'Fonts'),
+        ]
+    elif system == 'darwin':  # macOS
+        dirs += [
+            '/System/Library/Fonts',
+            '/Library/Fonts',
+            os.path.expanduser('~/Library/Fonts'),
+        ]
+    else:  # Linux and others
+        dirs += [
+            '/usr/share/fonts',
+            '/usr/local/share/fonts',
+            os.path.expanduser('~/.fonts'),
+            os.path.expanduser('~/.local/share/fonts'),
+        ]
+    # Unique real paths, keeping the first occurrence
+    return list(dict.fromkeys(os.path.realpath(d) for d in dirs))
+
+
+def _font_names(path):
+    """(family, style) of a font file, or (None, None) if FreeType cannot read it."""
+    try:
+        return ImageFont.truetype(path, 12).getname()
+    except Exception:
+        return None, None
+
+
+def _scan(directory, old, new):
+    """
+    Index directory and its subdirectories into new, reusing the entries of
+    old whose mtime is unchanged (and the names of fonts already known).
+    """
+    if directory in new:  # Reached again through a symlink
+        return
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return
+    entry = old.get(directory)
+    if entry is None or entry["mtime"] != mtime:
+        known = {name: (family, style) for name, family, style in entry["fonts"]} if entry else {}
+        fonts, subdirs = [], []
+        try:
+            with os.scandir(directory) as it:
+                for item in sorted(it, key=lambda item: item.name):
+                    if item.is_dir():
+                        subdirs.append(os.path.realpath(item.path))
+                    elif os.path.splitext(item.name)[1].lower() in FONT_EXTENSIONS:
+                        names = known.get(item.name) or _font_names(item.path)
+                        fonts.append([item.name, *names])
+        except OSError:
+            pass
+        entry = {"mtime": mtime, "fonts": fonts, "subdirs": subdirs}
+    new[directory] = entry
+    for subdir in entry["subdirs"]:
+        _scan(subdir, old, new)
+
+
+def _read_index(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == FONT_INDEX_VERSION:
+            return data["dirs"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass  # Missing or unreadable: rebuild
+    return {}
+
+
+def _write_index(path, dirs):
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a private file and rename so concurrent renders never see a partial index
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(path) + ".", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": FONT_INDEX_VERSION, "dirs": dirs}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass  # Read-only cache location: keep the index in memory for this process
+
+
+@lru_cache(maxsize=1)
+def load_font_index(path=None):
+    """
+    The font index as (files, families): lower-cased file name -> path and
+    lower-cased "family style" (or bare family, for its regular style) ->
+    path, earlier directories winning. Refreshed from disk once per process;
+    call load_font_index.cache_clear() to pick up new fonts in a running one.
+    """
+    path = path or FONT_INDEX_PATH
+    old = _read_index(path)
+    dirs = {}
+    for directory in font_dirs():
+        _scan(directory, old, dirs)
+    if dirs != old:
+        _write_index(path, dirs)
+
+    files, families, fallback = {}, {}, {}
+    for directory, entry in dirs.items():
+        for name, family, style in entry["fonts"]:
+            font_path = os.path.join(directory, name)
+            files.setdefault(name.lower(), font_path)
+            if family:
+                families.setdefault(f"{family} {style}".lower(), font_path)
+                target = families if (style or "").lower() in REGULAR_STYLES else fallback
+                target.setdefault(family.lower(), font_path)
+    for family, font_path in fallback.items():
+        families.setdefault(family, font_path)
+    return files, families
+
+
+def lookup_font(name):
+    """
+    Path of an indexed font by file name (case-insensitive, extension
+    optional) or by family and style, or None if there is none.
+    """
+    files, families = load_font_index()
+    key = os.path.basename(name.replace('\\', '/')).lower()
+    path = files.get(key) or families.get(key)
+    if path is None and not os.path.splitext(key)[1]:
+        for ext in FONT_EXTENSIONS:
+            path = files.get(key + ext)
+            if path:
+                break
+    return path
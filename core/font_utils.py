@@ -7,104 +7,47 @@ Consolidates font loading, sizing, and text measurement functions.
 import os
 from PIL import ImageFont
 import platform
+from core import text_utils
+from core.font_index import lookup_font
+
+
+# Alternative file names for common fonts, tried when the name itself is not indexed
+FONT_ALIASES = {
+    'arialbd.ttf': ['Arial Bold.ttf', 'Arial-Bold.ttf'],
+    'helvetica': ['Helvetica.ttc', 'helvetica.ttf'],
+    'times': ['times.ttf', 'Times.ttc', 'TimesNewRoman.ttf'],
+    'courier': ['courier.ttf', 'CourierNew.ttf'],
+}
 
 
 def find_font_path(font_name):
     """
     Find font file path across different operating systems.
-    Consolidated font finding logic.
+    Existing paths are returned as given; otherwise the file name (or a
+    family and style such as "DejaVu Sans Bold") is looked up in the
+    persistent font index of the bundled and system font directories
+    (see core.font_index). Returns font_name unchanged if nothing matches.
     """
     if os.path.isfile(font_name):
         return font_name
     
     # Extract filename if full path provided
-    if '/' in font_name or '\\' in font_name:
-        font_name = os.path.basename(font_name)
+    name = os.path.basename(font_name.replace('\\', '/'))
     
-    # Check local fonts directory first (development)
-    local_font_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'fonts', font_name)
+    # fonts/ under the working directory
+    local_font_path = os.path.join('fonts', name)
     if os.path.isfile(local_font_path):
         return local_font_path
     
-    # Check package fonts directory (installed package)
-    try:
-        # Try importlib.resources first (Python 3.9+)
-        try:
-            from importlib import resources
-            with resources.path('fonts', font_name) as font_path:
-                if font_path.exists():
-                    return str(font_path)
-        except (ImportError, AttributeError):
-            # Fallback to pkg_resources
-            import pkg_resources
-            package_font_path = pkg_resources.resource_filename('', f'fonts/{font_name}')
-            if os.path.isfile(package_font_path):
-                return package_font_path
-    except (ImportError, FileNotFoundError, ModuleNotFoundError):
-        pass
-    
-    # Check if fonts are in site-packages directory
-    try:
-        import sys
-        for path in sys.path:
-            if 'site-packages' in path:
-                fonts_path = os.path.join(path, 'fonts', font_name)
-                if os.path.isfile(fonts_path):
-                    return fonts_path
-    except:
-        pass
-    
-    # System font directories by platform
-    system = platform.system().lower()
-    font_dirs = []
-    
-    if system == 'windows':
-        font_dirs = [
-            os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts'),
-            os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Windows', 'Fonts'),
-        ]
-    elif system == 'darwin':  # macOS
-        font_dirs = [
-            '/System/Library/Fonts',
-            '/Library/Fonts',
-            os.path.expanduser('~/Library/Fonts'),
-        ]
-    else:  # Linux and others
-        font_dirs = [
-            '/usr/share/fonts',
-            '/usr/local/share/fonts',
-            os.path.expanduser('~/.fonts'),
-            os.path.expanduser('~/.local/share/fonts'),
-        ]
-    
-    # Search in system directories
-    for font_dir in font_dirs:
-        if os.path.exists(font_dir):
-            font_path = os.path.join(font_dir, font_name)
-            if os.path.isfile(font_path):
-                return font_path
-            
-            # Also search in subdirectories
-            for root, dirs, files in os.walk(font_dir):
-                if font_name in files:
-                    return os.path.join(root, font_name)
+    font_path = lookup_font(name)
+    if font_path:
+        return font_path
     
     # Common font name mappings
-    font_mappings = {
-        'arial.ttf': ['arial.ttf', 'Arial.ttf', 'arial.TTF'],
-        'arialbd.ttf': ['arialbd.ttf', 'Arial Bold.ttf', 'Arial-Bold.ttf'],
-        'helvetica': ['Helvetica.ttc', 'helvetica.ttf'],
-        'times': ['times.ttf', 'Times.ttc', 'TimesNewRoman.ttf'],
-        'courier': ['courier.ttf', 'CourierNew.ttf'],
-    }
-    
-    if font_name.lower() in font_mappings:
-        for alt_name in font_mappings[font_name.lower()]:
-            for font_dir in font_dirs:
-                if os.path.exists(font_dir):
-                    alt_path = os.path.join(font_dir, alt_name)
-                    if os.path.isfile(alt_path):
-                        return alt_path
+    for alt_name in FONT_ALIASES.get(name.lower(), []):
+        font_path = lookup_font(alt_name)
+        if font_path:
+            return font_path
     
     return font_name  # Return original if not found
 
@@ -231,6 +174,23 @@ def calculate_font_size_to_fit(text, max_width, max_height, font_name, min_size=
     return best_size
 
 
+def first_fitting(candidates, fits):
+    """
+    First of the candidates (e.g. font sizes, largest first) for which
+    fits(candidate) holds, or None. Binary search: fits must be monotone
+    along the candidates (false ... false, true ... true), so only about
+    log2(len(candidates)) of them are tried.
+    """
+    low, high = 0, len(candidates)
+    while low < high:
+        mid = (low + high) // 2
+        if fits(candidates[mid]):
+            high = mid
+        else:
+            low = mid + 1
+    return candidates[low] if low < len(candidates) else None
+
+
 def calculate_multiline_size(lines, font):
     """Calculate size needed for multiline text."""
     if not lines:
@@ -341,10 +301,11 @@ def validate_font_file(font_path):
 
 
 class FontManager:
-    """Font management helper class."""
+    """Font management helper class: cached font instances and text measurements."""
     
     def __init__(self):
         self.font_cache = {}
+        self.width_cache = {}
         self.available_fonts = None
     
     def get_font(self, font_name, size):
@@ -355,9 +316,17 @@ class FontManager:
             self.font_cache[cache_key] = font
         return self.font_cache[cache_key]
     
+    def text_width(self, font_name, size, text):
+        """Advance width of text in the (cached) font, memoized."""
+        cache_key = (font_name, size, text)
+        if cache_key not in self.width_cache:
+            self.width_cache[cache_key] = text_utils.get_text_width(self.get_font(font_name, size), text)
+        return self.width_cache[cache_key]
+    
     def clear_cache(self):
-        """Clear font cache."""
+        """Clear font and measurement caches."""
         self.font_cache.clear()
+        self.width_cache.clear()
     
     def scan_available_fonts(self):
         """Scan system for available fonts."""
@@ -4,8 +4,10 @@ Centralized layer composition and image utilities for banner generation.
 Consolidates image layer operations and composition patterns.
 """
 
+import math
 from PIL import Image, ImageDraw, ImageFilter
 import numpy as np
+from core.parallel_utils import apply_in_bands
 
 
 def create_layer(size, color=(0, 0, 0, 0)):
@@ -17,6 +19,74 @@ def create_layer(size, color=(0, 0, 0, 0)):
     return Image.new("RGBA", (width, height), color)
 
 
+def composite_in_bbox(base, layer, offset=(0, 0), bbox=None):
+    """
+    Alpha-composite layer onto base in place, with the layer's top-left at
+    offset. Only the layer's content box (layer.getbbox() unless given, in
+    layer coordinates) clipped to base is touched, so the cost scales with
+    the area the layer covers rather than the canvas.
+    """
+    if bbox is None:
+        bbox = layer.getbbox()
+        if bbox is None:
+            return base
+    ox, oy = offset
+    left, top = max(bbox[0], -ox), max(bbox[1], -oy)
+    right, bottom = min(bbox[2], base.width - ox), min(bbox[3], base.height - oy)
+    if left >= right or top >= bottom:
+        return base
+    base.alpha_composite(layer, (ox + left, oy + top), (left, top, right, bottom))
+    return base
+
+
+# Blur radii (Gaussian sigma, px) below twice this are blurred exactly;
+# larger ones are blurred on a downsampled copy where sigma stays >= this
+BLUR_PYRAMID_MIN_RADIUS = 3
+
+
+def blur_reach(radius):
+    """Pixels a Gaussian blur of radius reads on each side (Pillow runs three box passes, each reaching about radius + 1)."""
+    return 3 * math.ceil(radius) + 4
+
+
+def pyramid_blur(img, radius, quality=1.0):
+    """
+    Gaussian blur with cost independent of the radius. Small radii use
+    ImageFilter.GaussianBlur directly. Larger ones box-downsample by the
+    largest power of two f that keeps radius / f >= BLUR_PYRAMID_MIN_RADIUS
+    * quality, blur there by the remaining sigma (net of the box and the
+    bilinear upsample) and upsample bilinearly. Higher quality downsamples
+    less; None is always exact. Channels are blurred independently (no
+    alpha premultiplication), like GaussianBlur. Runs in row stripes with
+    halo rows on the band thread pool (see core.parallel_utils).
+    """
+    factor = 1
+    if quality is not None and radius > 0:
+        floor = BLUR_PYRAMID_MIN_RADIUS * max(quality, 1e-3)
+        while radius / (2 * factor) >= floor:
+            factor *= 2
+    if factor == 1:
+        blur = ImageFilter.GaussianBlur(radius=radius)
+        return apply_in_bands(lambda band, top: band.filter(blur), img, halo=blur_reach(radius))
+    # Variance added by the box reduce and the bilinear (tent) upsample, in full-size pixels
+    residual = math.sqrt(max(radius ** 2 - (factor ** 2 - 1) / 12 - factor ** 2 / 6, 0)) / factor
+    halo = factor * (3 * math.ceil(residual) + 6)
+    return apply_in_bands(lambda band, top: _pyramid_blur_band(band, factor, residual), img,
+                          halo=halo, align=factor)
+
+
+def _pyramid_blur_band(img, factor, residual):
+    """Reduce by factor, blur by residual and upsample back (see pyramid_blur)."""
+    w, h = img.size
+    bands = img.split() if img.mode in ("RGBA", "LA") else [img]
+    # Block i of the reduced image covers [i * f, (i + 1) * f): the box keeps
+    # full-size pixel centres on the block grid when upsampling
+    box = (0, 0, w / factor, h / factor)
+    blurred = [band.reduce(factor).filter(ImageFilter.GaussianBlur(radius=residual))
+               .resize((w, h), Image.BILINEAR, box=box) for band in bands]
+    return Image.merge(img.mode, blurred) if len(blurred) > 1 else blurred[0]
+
+
 def apply_layer_with_opacity(base_layer, overlay_layer, opacity=255):
     """Apply overlay layer to base with specified opacity."""
     if opacity >= 255:
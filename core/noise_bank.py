@@ -0,0 +1,77 @@
+# noise_bank.py
+"""
+Persistent bank of precomputed noise tiles for textures.
+
+Each (seed, stream) pair maps to a tileable float32 field of standard
+normal noise. It is generated once from core.random_utils, saved under
+NOISE_BANK_DIR and opened with np.memmap afterwards, so renders only pay
+for a gather. Fields are sampled at absolute pixel coordinates modulo the
+tile size: output stays reproducible for a seed and a region still matches
+the same area of a full render.
+"""
+
+import os
+import tempfile
+import threading
+from functools import lru_cache
+import numpy as np
+from core.random_utils import hash_normal
+
+# Side of each noise tile in pixels (4 MB per float32 tile)
+NOISE_BANK_TILE = 1024
+
+NOISE_BANK_DIR = os.environ.get(
+    "BANNER_MAKER_NOISE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "banner_maker", "noise"),
+)
+
+
+# Serializes tile creation within a process (lru_cache does not serialize
+# concurrent misses, and band workers ask for the same tile at once)
+_tile_lock = threading.Lock()
+
+# Errors np.load raises on a missing, partial or corrupt tile file
+_LOAD_ERRORS = (OSError, ValueError, EOFError)
+
+
+@lru_cache(maxsize=32)
+def noise_tile(seed, stream=0, tile=NOISE_BANK_TILE):
+    """Memory-mapped tile x tile normal noise field for (seed, stream), created on first use."""
+    path = os.path.join(NOISE_BANK_DIR, f"normal_{int(seed)}_{int(stream)}_{tile}.npy")
+    with _tile_lock:
+        try:
+            return np.load(path, mmap_mode="r")
+        except _LOAD_ERRORS:
+            pass  # Missing or unreadable: (re)generate below
+        ys, xs = np.ogrid[0:tile, 0:tile]
+        field = hash_normal(seed, xs, ys, stream)
+        try:
+            os.makedirs(NOISE_BANK_DIR, exist_ok=True)
+            # Write to a private file and rename so concurrent renders never see a partial tile
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(path) + ".", dir=NOISE_BANK_DIR)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, field)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return np.load(path, mmap_mode="r")
+        except _LOAD_ERRORS:
+            # Read-only cache location: keep the field in memory for this process
+            field.setflags(write=False)
+            return field
+
+
+def bank_normal(seed, xs, ys, stream=0, scale=1.0):
+    """
+    Standard normal noise (times scale) at integer pixel coordinates given as
+    open grids (see core.random_utils.pixel_grid), tiled from the bank.
+    """
+    field = noise_tile(seed, stream)
+    tile = field.shape[0]
+    rows = np.take(field, np.ravel(ys) % tile, axis=0)
+    result = np.take(rows, np.ravel(xs) % tile, axis=1)
+    if scale != 1.0:
+        result *= np.float32(scale)
+    return result
@@ -0,0 +1,184 @@
+# noise_utils.py
+"""
+Procedural noise for textures: gradient (Perlin) noise, fBm octaves,
+domain warping and seamless tiling.
+
+Everything is evaluated from absolute pixel coordinates with the
+position-keyed hashes in core.random_utils, so a region matches the same
+area of a full render. For open coordinate grids (core.random_utils.
+pixel_grid) each octave is sampled at its natural resolution, a few samples
+per lattice cell, and resampled bilinearly: coarse octaves cost almost
+nothing regardless of canvas size.
+"""
+
+import numpy as np
+from core.random_utils import hash_uniform
+
+# Samples per lattice cell when an octave is evaluated below full resolution
+SAMPLES_PER_CELL = 8
+
+# First stream used for domain-warp fields
+WARP_STREAM_BASE = 0x8000
+
+
+def _pair(value):
+    return tuple(value) if isinstance(value, (tuple, list)) else (value, value)
+
+
+def _fade(t):
+    """Quintic smoothstep 6t^5 - 15t^4 + 10t^3."""
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def _is_open_grid(x, y):
+    """True for np.ogrid-style coordinates: x is a (1, w) row, y an (h, 1) column."""
+    return np.ndim(x) == 2 and np.ndim(y) == 2 and np.shape(x)[0] == 1 and np.shape(y)[1] == 1
+
+
+def _grid_spacing(x, y):
+    """Smallest sample spacing of an open coordinate grid (1 for a single sample)."""
+    xs, ys = np.ravel(x), np.ravel(y)
+    spacing = [abs(v[1] - v[0]) for v in (xs, ys) if len(v) > 1]
+    return min(spacing) if spacing else 1
+
+
+def _lattice_period(period, cell):
+    """Lattice period (in cells) for a pixel period, or None for no tiling."""
+    if period is None:
+        return None
+    px, py = _pair(period)
+    cx, cy = _pair(cell)
+    return (max(1, int(round(px / cx))), max(1, int(round(py / cy))))
+
+
+def _gradient_noise_direct(seed, x, y, cell, stream, period, dtype):
+    cx, cy = _pair(cell)
+    fx = np.asarray(x, dtype=dtype) / dtype(cx)
+    fy = np.asarray(y, dtype=dtype) / dtype(cy)
+    x0 = np.floor(fx)
+    y0 = np.floor(fy)
+    tx = fx - x0
+    ty = fy - y0
+    ix = x0.astype(np.int64)
+    iy = y0.astype(np.int64)
+    # Random unit gradients on the lattice points the coordinates touch
+    ix_min, iy_min = int(ix.min()), int(iy.min())
+    lat_x = np.arange(ix_min, int(ix.max()) + 2)
+    lat_y = np.arange(iy_min, int(iy.max()) + 2)[:, None]
+    lattice_period = _lattice_period(period, cell)
+    if lattice_period is not None:
+        lat_x = lat_x % lattice_period[0]
+        lat_y = lat_y % lattice_period[1]
+    angle = hash_uniform(seed, lat_x, lat_y, stream, dtype=dtype) * dtype(2 * np.pi)
+    grad_x = np.cos(angle)
+    grad_y = np.sin(angle)
+    # Flat lattice index of each sample's cell, walked round the cell's corners
+    # (one int32 index and flat takes instead of 2D fancy indexing)
+    stride = lat_x.shape[-1]
+    grad_x = grad_x.ravel()
+    grad_y = grad_y.ravel()
+    index = (iy - iy_min) * stride + (ix - ix_min)
+    index = index.astype(np.int32) if grad_x.size < 2 ** 31 else index
+    tx1 = tx - 1
+    ty1 = ty - 1
+    n00 = grad_x.take(index) * tx + grad_y.take(index) * ty
+    index += 1
+    n10 = grad_x.take(index) * tx1 + grad_y.take(index) * ty
+    index += stride
+    n11 = grad_x.take(index) * tx1 + grad_y.take(index) * ty1
+    index -= 1
+    n01 = grad_x.take(index) * tx + grad_y.take(index) * ty1
+    u = _fade(tx)
+    v = _fade(ty)
+    top = n00 + (n10 - n00) * u
+    bottom = n01 + (n11 - n01) * u
+    # 2D Perlin noise peaks at sqrt(1/2); rescale to about [-1, 1]
+    return (top + (bottom - top) * v) * dtype(np.sqrt(2))
+
+
+def resample_open_grid(func, x, y, step, dtype=np.float32):
+    """
+    Evaluate func(sample_x, sample_y) on the absolute grid of spacing step
+    (a number or (step_x, step_y) pair) covering an open coordinate grid,
+    then resample bilinearly (separably) to x, y. func may return extra
+    leading axes (e.g. stacked fields), which are kept. The sample grid
+    depends only on absolute coordinates, so regions agree with full renders.
+    """
+    step_x, step_y = _pair(step)
+    xs = np.ravel(x)
+    ys = np.ravel(y)
+    gx0 = int(np.floor(xs.min() / step_x))
+    gy0 = int(np.floor(ys.min() / step_y))
+    sample_x = np.arange(gx0, int(np.floor(xs.max() / step_x)) + 2) * step_x
+    sample_y = np.arange(gy0, int(np.floor(ys.max() / step_y)) + 2) * step_y
+    coarse = func(sample_x[None, :], sample_y[:, None])
+    coarse = np.broadcast_to(coarse, coarse.shape[:-2] + (len(sample_y), len(sample_x)))
+    fx = xs.astype(dtype) / dtype(step_x) - gx0
+    fy = ys.astype(dtype) / dtype(step_y) - gy0
+    i = np.floor(fx).astype(np.int64)
+    j = np.floor(fy).astype(np.int64)
+    tx = fx - i
+    ty = (fy - j)[:, None]
+    rows = coarse[..., i] * (1 - tx) + coarse[..., i + 1] * tx
+    return rows[..., j, :] * (1 - ty) + rows[..., j + 1, :] * ty
+
+
+def gradient_noise(seed, x, y, cell, stream=0, period=None, dtype=np.float32):
+    """
+    Gradient (Perlin) noise in about [-1, 1] with features of cell pixels
+    (a number or (cell_x, cell_y) pair). With period (pixels, a multiple of
+    cell), the lattice wraps and the noise tiles seamlessly every period.
+    """
+    step = max(1, int(min(_pair(cell))) // SAMPLES_PER_CELL)
+    if step > 1 and _is_open_grid(x, y) and step > _grid_spacing(x, y):
+        return resample_open_grid(
+            lambda sx, sy: _gradient_noise_direct(seed, sx, sy, cell, stream, period, dtype),
+            x, y, step, dtype)
+    return _gradient_noise_direct(seed, x, y, cell, stream, period, dtype)
+
+
+def fbm(seed, x, y, cell, octaves=4, lacunarity=2.0, gain=0.5, stream=0, period=None, dtype=np.float32):
+    """
+    Fractal Brownian motion: octaves of gradient noise, each lacunarity
+    times finer and gain times weaker than the last, normalized to about
+    [-1, 1]. cell is the feature size of the first (coarsest) octave. Every
+    octave has its own stream and is evaluated at its own resolution.
+    With period, an integer lacunarity keeps all octaves tileable.
+    """
+    cx, cy = _pair(cell)
+    total = None
+    amplitude = 1.0
+    norm = 0.0
+    for octave in range(octaves):
+        scale = lacunarity ** octave
+        layer = gradient_noise(seed, x, y, (cx / scale, cy / scale), (stream << 8) + octave, period, dtype)
+        layer *= dtype(amplitude)
+        total = layer if total is None else total + layer
+        norm += amplitude
+        amplitude *= gain
+    total /= dtype(norm)
+    return total
+
+
+def domain_warp(seed, x, y, cell, amount, octaves=2, stream=0, period=None, step=None, dtype=np.float32):
+    """
+    Offset coordinates by an fBm vector field: returns (x + amount * fx,
+    y + amount * fy) as full float arrays, to feed back into gradient_noise
+    or fbm for organic, flowing structure. amount is in pixels. With step,
+    the (smooth) offsets of an open coordinate grid are evaluated every
+    step pixels and resampled bilinearly.
+    """
+    def offsets(sx, sy):
+        # Warp streams live in their own range so they never repeat a noise stream
+        return np.stack([fbm(seed, sx, sy, cell, octaves, stream=WARP_STREAM_BASE + 2 * stream + axis,
+                             period=period, dtype=dtype) for axis in (0, 1)])
+
+    if step is not None and _is_open_grid(x, y) and step > _grid_spacing(x, y):
+        warp = resample_open_grid(offsets, x, y, step, dtype)
+    else:
+        warp = offsets(x, y)
+    warp *= dtype(amount)
+    warp_x, warp_y = warp
+    warp_x += np.asarray(x, dtype=dtype)
+    warp_y += np.asarray(y, dtype=dtype)
+    return warp_x, warp_y
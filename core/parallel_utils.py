@@ -0,0 +1,117 @@
+# parallel_utils.py
+"""
+Row-band parallelism for pixel work.
+
+NumPy ufuncs and Pillow's filters release the GIL, so splitting the
+canvas into row stripes and running them on a shared thread pool scales
+with cores without copying data between processes. map_bands runs
+func(r0, r1) per stripe for work that writes only its own rows;
+apply_in_bands runs an image function per stripe with halo rows of
+context for neighbourhood kernels and reassembles the result.
+
+Work started from inside a band runs serially, so nested banded calls
+never wait on the pool they occupy. With one worker (or a canvas too
+small to split) everything runs inline, exactly as a serial loop would.
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+# Worker threads for banded work (0 = one per core, 1 = serial)
+WORKERS = int(os.environ.get("BANNER_MAKER_WORKERS", "0") or 0)
+
+# Smallest stripe worth a task of its own
+MIN_BAND_ROWS = 64
+
+# Stripes per worker, so uneven stripes still balance
+BANDS_PER_WORKER = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def set_workers(workers):
+    """Set the default worker count (0 = one per core, 1 = serial); returns the previous one."""
+    global WORKERS
+    previous, WORKERS = WORKERS, max(0, int(workers))
+    return previous
+
+
+def worker_count(workers=None):
+    """Effective number of workers for a call (None = the WORKERS default)."""
+    workers = WORKERS if workers is None else workers
+    if getattr(_local, "in_band", False):
+        return 1
+    if workers > 0:
+        return workers
+    # Cores this process may run on (respects CPU affinity)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def row_bands(h, workers=None, min_rows=MIN_BAND_ROWS, align=1):
+    """
+    Split h rows into [(r0, r1), ...] stripes: about BANDS_PER_WORKER per
+    worker, at least min_rows each, with r0 a multiple of align.
+    """
+    rows = max(min_rows, math.ceil(h / (worker_count(workers) * BANDS_PER_WORKER)), 1)
+    rows = math.ceil(rows / align) * align
+    return [(r0, min(h, r0 + rows)) for r0 in range(0, h, rows)]
+
+
+def _executor(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._max_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="banner-band")
+        return _pool
+
+
+def _run_band(func, band):
+    _local.in_band = True
+    try:
+        return func(*band)
+    finally:
+        _local.in_band = False
+
+
+def map_bands(func, bands, workers=None):
+    """Run func(r0, r1) for every band, in parallel when there are workers; results in band order."""
+    workers = worker_count(workers)
+    if workers <= 1 or len(bands) <= 1:
+        return [func(r0, r1) for r0, r1 in bands]
+    return list(_executor(workers).map(lambda band: _run_band(func, band), bands))
+
+
+def apply_in_bands(func, img, halo=0, workers=None, align=1, min_rows=MIN_BAND_ROWS):
+    """
+    Apply func(crop, top) -> image (same size and mode as crop) to row
+    stripes of img, where crop holds the stripe plus up to halo rows of
+    context on each side and top is its first row in img. Stripe and crop
+    tops are multiples of align. The context rows are cut off again and the
+    stripes reassembled; with a single stripe, func(img, 0) is returned.
+    """
+    w, h = img.size
+    bands = row_bands(h, workers, max(min_rows, 2 * halo), align)
+    if worker_count(workers) <= 1 or len(bands) <= 1:
+        return func(img, 0)
+
+    def run(r0, r1):
+        top = max(0, r0 - halo)
+        top -= top % align
+        bottom = min(h, r1 + halo)
+        result = func(img.crop((0, top, w, bottom)), top)
+        return result.crop((0, r0 - top, w, r1 - top))
+
+    parts = map_bands(run, bands, workers)
+    out = Image.new(parts[0].mode, (w, h))
+    for (r0, _), part in zip(bands, parts):
+        out.paste(part, (0, r0))
+    return out
@@ -0,0 +1,82 @@
+# plugin_utils.py
+"""
+Plugin descriptors for the auto-discovered effects, textures, shapes and
+patterns.
+
+A plugin module may declare PLUGIN = PluginInfo(...) describing how it
+reads its input image, whether its sizes follow supersampling, how it uses
+randomness, which BannerConfig fields it reads and, for colour effects,
+the pointwise stage effect chains fuse. The package registries
+(EFFECT_PLUGINS, TEXTURE_PLUGINS, SHAPE_PLUGINS, PATTERN_PLUGINS) hold one
+descriptor per registered name, filled with the package's defaults where a
+module declares nothing, so the renderer can pick fusion, tiling and
+caching strategies from them instead of special-casing names.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Callable, Optional
+
+# Access patterns, from cheapest to schedule to most constrained:
+# pointwise - each output pixel reads only the same input pixel (and its position)
+# neighborhood - reads input pixels up to radius away
+# global - reads arbitrary parts of the image (or is undeclared)
+KINDS = ("pointwise", "neighborhood", "global")
+
+# Randomness: None, "position" (counter-based hashes of the seed and an
+# absolute position or index, see core.random_utils: any region renders on
+# its own and matches the full render) or "seeded" (drawn in sequence from
+# a seed: only the whole canvas reproduces)
+RNG_USES = (None, "position", "seeded")
+
+
+@dataclass(frozen=True)
+class PluginInfo:
+    kind: str = "global"        # One of KINDS
+    radius: int = 0             # Neighbourhood reach in pixels (at SuperSampling 1 if supersampled)
+    supersampled: bool = False  # Sizes are in output pixels and scale with SuperSampling
+    rng: Optional[str] = None   # One of RNG_USES
+    positional: bool = False    # Output depends on absolute pixel position (canvas centre, hashed noise)
+    origin: bool = False        # apply_* takes origin=(x, y) to render a region in place
+    params: tuple = ()          # BannerConfig fields the plugin reads
+    stage: object = None        # Colour stage (apply_band, see effects._pointwise) a pointwise effect fuses as
+    name: str = None            # Registered name (filled by the registry)
+    func: Callable = None       # The apply_* function (filled by the registry)
+
+    def __post_init__(self):
+        if self.kind not in KINDS:
+            raise ValueError(f"Unknown plugin kind {self.kind!r} (expected one of {KINDS})")
+        if self.rng not in RNG_USES:
+            raise ValueError(f"Unknown plugin rng use {self.rng!r} (expected one of {RNG_USES})")
+        if self.stage is not None and (self.kind != "pointwise" or self.positional):
+            raise ValueError("Only position-independent pointwise plugins can have a colour stage")
+
+    @property
+    def pointwise(self):
+        return self.kind == "pointwise"
+
+    @property
+    def tileable(self):
+        """True if row stripes can be rendered on their own (with halo rows) and reassembled."""
+        return self.kind != "global" and self.rng != "seeded" and (self.origin or not self.positional)
+
+    def halo(self, SS=1):
+        """Rows of context a stripe needs at the given supersampling."""
+        return self.radius * SS if self.supersampled else self.radius
+
+    def cache_key(self, config):
+        """Values of the declared config fields (and SuperSampling if it matters), for caching results."""
+        key = tuple(getattr(config, p, None) for p in self.params)
+        return key + (getattr(config, 'SuperSampling', 1),) if self.supersampled else key
+
+
+def describe_plugin(module, name, func, **defaults):
+    """
+    Descriptor for a registered plugin: the module's PLUGIN if it declares
+    one, else PluginInfo(**defaults), with name and func filled in.
+    """
+    info = getattr(module, 'PLUGIN', None)
+    if info is None:
+        info = PluginInfo(**defaults)
+    elif not isinstance(info, PluginInfo):
+        raise TypeError(f"{module.__name__}.PLUGIN must be a PluginInfo, not {type(info).__name__}")
+    return replace(info, name=name, func=func)
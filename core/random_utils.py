@@ -0,0 +1,115 @@
+# random_utils.py
+"""
+Counter-based, position-keyed random numbers.
+
+Every value is a pure function of (seed, x, y, stream): nothing depends on
+how many draws happened before it. Any region or tile of a render can
+therefore be generated on its own and match the full render bit for bit.
+All functions are vectorized and broadcast over numpy coordinate arrays
+(e.g. from np.ogrid).
+"""
+
+import numpy as np
+
+_MASK32 = 0xFFFFFFFF
+
+
+def _mix(h):
+    """lowbias32 integer finalizer (uint32 in, uint32 out)."""
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x7FEB352D)
+    h ^= h >> np.uint32(15)
+    h *= np.uint32(0x846CA68B)
+    h ^= h >> np.uint32(16)
+    return h
+
+
+def _stream_key(seed, stream):
+    """Scalar key for (seed, stream), computed with Python integers."""
+    key = (int(seed) * 0x9E3779B1 + int(stream) * 0x85EBCA6B + 0x6A09E667) & _MASK32
+    key ^= key >> 16
+    key = (key * 0x7FEB352D) & _MASK32
+    key ^= key >> 15
+    return np.uint32(key)
+
+
+def _as_uint32(v):
+    # Through int64 so negative coordinates wrap instead of raising
+    return np.asarray(v, dtype=np.int64).astype(np.uint32)
+
+
+def hash_uint32(seed, x, y, stream=0):
+    """Uniformly distributed uint32 hash of integer coordinates."""
+    with np.errstate(over='ignore'):
+        h = _mix(_as_uint32(x) ^ _stream_key(seed, stream))
+        h = _mix(h + _as_uint32(y) * np.uint32(0x9E3779B9))
+    return h
+
+
+def hash_uniform(seed, x, y, stream=0, dtype=np.float32):
+    """Uniform floats in [0, 1)."""
+    h = hash_uint32(seed, x, y, stream)
+    return (h >> np.uint32(8)).astype(dtype) * dtype(1.0 / (1 << 24))
+
+
+def hash_randint(seed, x, y, low, high, stream=0):
+    """Integers in [low, high), like np.random.randint(low, high)."""
+    span = max(1, int(high) - int(low))
+    return (hash_uint32(seed, x, y, stream) % np.uint32(span)).astype(np.int64) + int(low)
+
+
+def hash_normal(seed, x, y, stream=0, scale=1.0, dtype=np.float32):
+    """
+    Normally distributed floats (mean 0, std scale). Box-Muller on the two
+    16-bit halves of a single hash, so one hash per sample.
+    """
+    h = hash_uint32(seed, x, y, stream)
+    u1 = ((h >> np.uint32(16)).astype(dtype) + dtype(0.5)) * dtype(1.0 / 65536)
+    u2 = (h & np.uint32(0xFFFF)).astype(dtype) * dtype(1.0 / 65536)
+    r = np.sqrt(dtype(-2.0) * np.log(u1))
+    r *= np.cos(dtype(2 * np.pi) * u2)
+    if scale != 1.0:
+        r *= dtype(scale)
+    return r
+
+
+def value_noise(seed, x, y, cell, stream=0, scale=1.0, dtype=np.float32):
+    """
+    Smooth noise: normally distributed values on a lattice of cell-sized
+    squares, bilinearly interpolated at (x, y). cell may be a number or a
+    (cell_x, cell_y) pair for anisotropic noise. Replaces "generate at low
+    resolution and upscale", but is evaluated from absolute coordinates.
+    """
+    cx, cy = cell if isinstance(cell, (tuple, list)) else (cell, cell)
+    fx = np.asarray(x, dtype=dtype) / dtype(cx)
+    fy = np.asarray(y, dtype=dtype) / dtype(cy)
+    x0 = np.floor(fx)
+    y0 = np.floor(fy)
+    tx = fx - x0
+    ty = fy - y0
+    ix = x0.astype(np.int64)
+    iy = y0.astype(np.int64)
+    # Hash only the lattice points the region touches, then gather corners
+    ix_min, iy_min = int(ix.min()), int(iy.min())
+    lat_x = np.arange(ix_min, int(ix.max()) + 2)
+    lat_y = np.arange(iy_min, int(iy.max()) + 2)[:, None]
+    lattice = hash_normal(seed, lat_x, lat_y, stream, dtype=dtype)
+    ix -= ix_min
+    iy -= iy_min
+    n00 = lattice[iy, ix]
+    n10 = lattice[iy, ix + 1]
+    n01 = lattice[iy + 1, ix]
+    n11 = lattice[iy + 1, ix + 1]
+    top = n00 + (n10 - n00) * tx
+    bottom = n01 + (n11 - n01) * tx
+    result = top + (bottom - top) * ty
+    if scale != 1.0:
+        result *= dtype(scale)
+    return result
+
+
+def pixel_grid(shape, origin=(0, 0)):
+    """Open (ys, xs) coordinate grids for a region of the given shape at origin."""
+    h, w = shape[:2]
+    x0, y0 = origin
+    return np.ogrid[y0:y0 + h, x0:x0 + w]
@@ -1,5 +1,52 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+
 def get_text_width(font, text):
     try:
         return font.getlength(text)
     except AttributeError:
-        return font.getsize(text)[0] 
\ No newline at end of file
+        return font.getsize(text)[0]
+
+
+def text_mask(font, text, xy, pad=0):
+    """
+    Coverage mask ("L") of text drawn at xy, on the text's bounding box
+    grown by pad on every side, and the mask's top-left corner in the
+    target image. The glyphs are rasterized once; outline, shadow and fill
+    are all stamped from this mask.
+    """
+    left, top, right, bottom = ImageDraw.Draw(Image.new("L", (1, 1))).textbbox(xy, text, font=font)
+    origin = (left - pad, top - pad)
+    mask = Image.new("L", (right - left + 2 * pad, bottom - top + 2 * pad), 0)
+    ImageDraw.Draw(mask).text((xy[0] - origin[0], xy[1] - origin[1]), text, font=font, fill=255)
+    return mask, origin
+
+
+def outline_mask(mask, reach):
+    """
+    Coverage of mask stamped at the 8 offsets (+-reach, 0) around itself,
+    combined as repeated antialiased draws combine (1 - prod(1 - a)).
+    mask needs reach pixels of margin (see text_mask's pad).
+    """
+    coverage = np.asarray(mask, dtype=np.float32) * np.float32(1 / 255)
+    h, w = coverage.shape
+    clear = np.ones_like(coverage)
+    for dy in (-reach, 0, reach):
+        for dx in (-reach, 0, reach):
+            if dx == 0 and dy == 0:
+                continue
+            # clear[y, x] *= 1 - coverage[y - dy, x - dx], within bounds
+            dst = clear[max(dy, 0):h + min(dy, 0), max(dx, 0):w + min(dx, 0)]
+            src = coverage[max(-dy, 0):h + min(-dy, 0), max(-dx, 0):w + min(-dx, 0)]
+            dst *= 1 - src
+    clear *= -255
+    clear += 255.5
+    return Image.fromarray(clear.astype(np.uint8), mode="L")
+
+
+def mask_layer(mask, color):
+    """RGBA layer of the mask's size: color where the mask covers, transparent elsewhere."""
+    layer = Image.new("RGBA", mask.size, (0, 0, 0, 0))
+    layer.paste(color, (0, 0), mask)
+    return layer
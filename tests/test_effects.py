@@ -0,0 +1,73 @@
+"""
+Effect intensities: "name:intensity" entries parse as expected, and the
+cached full-strength result gives the same output as computing the effect
+afresh, for any intensity.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from banner import effects
+from banner.effects import apply_effects, parse_effect_entry
+
+W, H = 160, 64
+
+
+@pytest.mark.parametrize("entry, expected", [
+    ("bloom", ("bloom", None)),
+    (" bloom:0.5", ("bloom", 0.5)),
+    ("bloom:-1", ("bloom", 0.0)),
+    (("glow", "0.25"), ("glow", 0.25)),
+    ("C:/luts/film.cube", ("C:/luts/film.cube", None)),
+    ("C:/luts/film.cube:0.5", ("C:/luts/film.cube", 0.5)),
+])
+def test_parse_effect_entry(entry, expected):
+    assert parse_effect_entry(entry) == expected
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    effects._effect_cache.clear()
+    yield
+    effects._effect_cache.clear()
+
+
+def _image(seed=0):
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (H, W, 4), dtype=np.uint8), "RGBA")
+
+
+def _render(effect, img):
+    config = SimpleNamespace(effect=effect, width=W, height=H, SuperSampling=1)
+    return np.asarray(apply_effects(img.copy(), config))
+
+
+@pytest.mark.parametrize("name", ["bloom", "glow", "chromatic_aberration", "lens_flare"])
+def test_cached_intensity_matches_uncached(name, monkeypatch):
+    calls = []
+    func = effects.EFFECT_MAP[name]
+    monkeypatch.setitem(effects.EFFECT_MAP, name, lambda *args, **kwargs: calls.append(1) or func(*args, **kwargs))
+    img = _image()
+    cached = {}
+    for intensity in (0.3, 0.7, 1.0):
+        cached[intensity] = _render(f"{name}:{intensity}", img)
+    # The full-strength effect ran once for the three intensities
+    assert len(calls) == 1
+    for intensity, result in cached.items():
+        effects._effect_cache.clear()
+        assert np.array_equal(result, _render(f"{name}:{intensity}", img))
+    # Full intensity matches the plain, uncached entry
+    assert np.array_equal(cached[1.0], _render(name, img))
+
+
+def test_cache_misses_on_new_pixels(monkeypatch):
+    calls = []
+    func = effects.EFFECT_MAP["bloom"]
+    monkeypatch.setitem(effects.EFFECT_MAP, "bloom", lambda *args, **kwargs: calls.append(1) or func(*args, **kwargs))
+    first = _render("bloom:0.5", _image(0))
+    second = _render("bloom:0.5", _image(1))
+    assert len(calls) == 2
+    assert not np.array_equal(first, second)
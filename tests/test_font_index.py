@@ -0,0 +1,77 @@
+"""
+Font index: fonts resolve by file name and by family/style, and a stale,
+corrupt or outdated index file is rebuilt instead of trusted.
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from core import font_index
+
+FONTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fonts")
+
+
+@pytest.fixture
+def font_dir(tmp_path, monkeypatch):
+    fonts = tmp_path / "fonts"
+    (fonts / "sub").mkdir(parents=True)
+    shutil.copy(os.path.join(FONTS, "Inter-Regular.ttf"), fonts)
+    shutil.copy(os.path.join(FONTS, "Inter-Bold.ttf"), fonts)
+    shutil.copy(os.path.join(FONTS, "DejaVuSansMono-Bold.ttf"), fonts / "sub")
+    monkeypatch.setattr(font_index, "font_dirs", lambda: [os.path.realpath(fonts)])
+    monkeypatch.setattr(font_index, "FONT_INDEX_PATH", str(tmp_path / "cache" / "font_index.json"))
+    font_index.load_font_index.cache_clear()
+    yield os.path.realpath(fonts)
+    font_index.load_font_index.cache_clear()
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Inter-Regular.ttf", "Inter-Regular.ttf"),
+    ("inter-bold", "Inter-Bold.ttf"),
+    ("C:\\Windows\\Fonts\\Inter-Bold.ttf", "Inter-Bold.ttf"),
+    ("Inter", "Inter-Regular.ttf"),
+    ("inter bold", "Inter-Bold.ttf"),
+    ("DejaVu Sans Mono Bold", "sub/DejaVuSansMono-Bold.ttf"),
+    # No regular style indexed: the family resolves to another style
+    ("DejaVu Sans Mono", "sub/DejaVuSansMono-Bold.ttf"),
+])
+def test_lookup_by_file_and_family(font_dir, name, expected):
+    assert font_index.lookup_font(name) == os.path.join(font_dir, *expected.split("/"))
+
+
+def test_unknown_font(font_dir):
+    assert font_index.lookup_font("Comic Sans MS") is None
+
+
+def test_index_is_saved_without_temp_files(font_dir):
+    font_index.load_font_index()
+    cache = os.path.dirname(font_index.FONT_INDEX_PATH)
+    assert os.listdir(cache) == ["font_index.json"]
+    with open(font_index.FONT_INDEX_PATH, encoding="utf-8") as f:
+        assert json.load(f)["version"] == font_index.FONT_INDEX_VERSION
+
+
+@pytest.mark.parametrize("content", ["", "{not json", "[]", json.dumps({"version": 0, "dirs": {}})])
+def test_corrupt_or_outdated_index_is_rebuilt(font_dir, content):
+    os.makedirs(os.path.dirname(font_index.FONT_INDEX_PATH))
+    with open(font_index.FONT_INDEX_PATH, "w", encoding="utf-8") as f:
+        f.write(content)
+    assert font_index.lookup_font("Inter Bold") == os.path.join(font_dir, "Inter-Bold.ttf")
+    with open(font_index.FONT_INDEX_PATH, encoding="utf-8") as f:
+        assert font_dir in json.load(f)["dirs"]
+
+
+def test_stale_directories_are_rescanned(font_dir):
+    assert font_index.lookup_font("Inter-Regular.ttf")
+    # A font removed and one added since the index was saved
+    os.remove(os.path.join(font_dir, "Inter-Regular.ttf"))
+    shutil.copy(os.path.join(FONTS, "DejaVuSansMono.ttf"), font_dir)
+    os.utime(font_dir, ns=(0, os.stat(font_dir).st_mtime_ns + 10 ** 9))
+    font_index.load_font_index.cache_clear()
+    assert font_index.lookup_font("Inter-Regular.ttf") is None
+    assert font_index.lookup_font("DejaVu Sans Mono") == os.path.join(font_dir, "DejaVuSansMono.ttf")
+    # The untouched subdirectory still resolves
+    assert font_index.lookup_font("DejaVuSansMono-Bold") == os.path.join(font_dir, "sub", "DejaVuSansMono-Bold.ttf")
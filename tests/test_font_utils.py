@@ -0,0 +1,50 @@
+"""
+first_fitting: the binary search returns what the linear scan it replaced
+(first candidate that fits) returns, at every boundary.
+"""
+
+import pytest
+
+from core.font_utils import first_fitting
+
+
+def _linear(candidates, fits):
+    for candidate in candidates:
+        if fits(candidate):
+            return candidate
+    return None
+
+
+# Font sizes stepping down by SS, as add_text searches them
+CANDIDATES = [range(96, 20, -2), range(120, 30, -3), range(40, 39, -1), range(40, 40, -1), [7]]
+
+
+@pytest.mark.parametrize('candidates', CANDIDATES)
+def test_every_threshold_matches_linear_scan(candidates):
+    sizes = list(candidates)
+    # The largest fitting size at each candidate, just between two and past both ends
+    limits = sorted({s + d for s in sizes for d in (-1, 0, 1)} | {0, 10 ** 6})
+    for limit in limits:
+        fits = lambda size: size <= limit
+        assert first_fitting(candidates, fits) == _linear(candidates, fits)
+
+
+@pytest.mark.parametrize('candidates', CANDIDATES)
+def test_nothing_fits(candidates):
+    assert first_fitting(candidates, lambda size: False) is None
+
+
+@pytest.mark.parametrize('candidates', CANDIDATES)
+def test_everything_fits(candidates):
+    expected = candidates[0] if len(candidates) else None
+    assert first_fitting(candidates, lambda size: True) == expected
+
+
+def test_fits_exactly_at_one_size():
+    tried = []
+    def fits(size):
+        tried.append(size)
+        return size <= 50
+    assert first_fitting(range(96, 20, -2), fits) == 50
+    # Binary search: a handful of measurements, not one per candidate
+    assert len(tried) <= 6
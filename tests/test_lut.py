@@ -0,0 +1,64 @@
+"""
+.cube parsing: LUT_3D_SIZE, DOMAIN_MIN/DOMAIN_MAX, comments and blank lines
+are read into a CubeLut; short or malformed files raise a ValueError that
+names the file.
+"""
+
+import numpy as np
+import pytest
+
+from banner.effects._lut import load_cube
+
+
+def _identity_rows(size):
+    levels = np.linspace(0, 1, size)
+    # Red changes fastest
+    return [f"{r:.6f} {g:.6f} {b:.6f}" for b in levels for g in levels for r in levels]
+
+
+def _write(tmp_path, lines, name="test.cube"):
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_identity_with_comments_and_blank_lines(tmp_path):
+    rows = _identity_rows(3)
+    path = _write(tmp_path, ["# Created by hand", 'TITLE "identity"', "", "LUT_3D_SIZE 3  # lattice", ""]
+                  + rows[:10] + ["", "# halfway"] + rows[10:])
+    lut = load_cube(path)
+    assert lut.size == 3 and lut.unit_domain
+    levels = np.linspace(0, 255, 3)
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    # Stored as [r][g][b] on the 0..255 scale
+    assert np.allclose(lut.table, np.stack([r, g, b], axis=-1), atol=1e-3)
+
+
+def test_domain(tmp_path):
+    path = _write(tmp_path, ["LUT_3D_SIZE 2", "DOMAIN_MIN 0.1 0.1 0.1", "DOMAIN_MAX 0.9 0.9 0.9"] + _identity_rows(2))
+    lut = load_cube(path)
+    assert not lut.unit_domain
+    # Inputs map from [0.1, 0.9] onto the lattice: 0.1 -> 0, 0.5 -> 0.5, 0.9 -> 1
+    rgb = np.array([[[0.1, 0.5, 0.9]]], dtype=np.float32) * 255
+    out = lut.apply_band(rgb, np.empty_like(rgb))
+    assert np.abs(out[0, 0] - [0, 127.5, 255]).max() <= 1
+
+
+@pytest.mark.parametrize("lines, message", [
+    (["TITLE \"no size\""] + _identity_rows(2), "missing LUT_3D_SIZE"),
+    (["LUT_3D_SIZE 2"] + _identity_rows(2)[:-1], "expected 8 entries, found 7"),
+    (["LUT_3D_SIZE 3"] + _identity_rows(2), "expected 27 entries, found 8"),
+    (["LUT_3D_SIZE"] + _identity_rows(2), "LUT_3D_SIZE expects 1"),
+    (["LUT_3D_SIZE two"] + _identity_rows(2), "LUT_3D_SIZE expects 1"),
+    (["LUT_3D_SIZE 1", "0 0 0"], "at least 2"),
+    (["LUT_3D_SIZE 2", "DOMAIN_MIN 0 0"] + _identity_rows(2), "DOMAIN_MIN expects 3"),
+    (["LUT_3D_SIZE 2", "DOMAIN_MAX 0 0 0"] + _identity_rows(2), "must be below DOMAIN_MAX"),
+    (["LUT_3D_SIZE 2"] + _identity_rows(2)[:-1] + ["1 1"], "table rows need 3 values"),
+    (["LUT_3D_SIZE 2"] + _identity_rows(2)[:-1] + ["1 x 1"], "malformed table value"),
+    (["LUT_1D_SIZE 2", "0 0 0", "1 1 1"], "1D .cube LUTs are not supported"),
+])
+def test_malformed_files_raise(tmp_path, lines, message):
+    path = _write(tmp_path, lines)
+    with pytest.raises(ValueError, match=message) as excinfo:
+        load_cube(path)
+    assert path in str(excinfo.value)
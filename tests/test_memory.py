@@ -0,0 +1,65 @@
+"""
+Peak memory per layer: every effect and texture, rendered on a fixed
+canvas, must stay within the multiples of the uint8 RGBA canvas documented
+in the numeric-policy comments of banner/effects/_utils.py and
+banner/textures/_utils.py. Measured with tracemalloc (NumPy buffers;
+Pillow's own image memory is not traced), serially.
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from banner.effects import EFFECT_MAP, EFFECT_PLUGINS
+from banner.textures import TEXTURE_MAP
+from core import parallel_utils
+
+# A 1024 x 256 banner at SuperSampling 3
+W, H = 3072, 768
+CANVAS_BYTES = W * H * 4
+
+# Documented budgets, in canvas multiples ("about": 10% slack)
+EFFECT_BUDGET = 6         # one float32 working array plus masks
+BLEND_EFFECT_BUDGET = 12  # neighbourhood effects blending two layers
+TEXTURE_BUDGET = 12       # uint8/int16 image plus float32 heightmap bands
+SLACK = 1.1
+
+
+@pytest.fixture(scope="module")
+def base():
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, (H, W, 4), dtype=np.uint8), "RGBA")
+
+
+@pytest.fixture(autouse=True)
+def serial():
+    # Bands in flight on several workers add up; budgets are per serial pass
+    workers = parallel_utils.WORKERS
+    parallel_utils.set_workers(1)
+    yield
+    parallel_utils.set_workers(workers)
+
+
+def _peak_multiple(func, img):
+    tracemalloc.start()
+    try:
+        func(img)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / CANVAS_BYTES
+
+
+@pytest.mark.parametrize("name", sorted(EFFECT_MAP))
+def test_effect_peak_memory(base, name):
+    budget = BLEND_EFFECT_BUDGET if EFFECT_PLUGINS[name].kind == "neighborhood" else EFFECT_BUDGET
+    peak = _peak_multiple(EFFECT_MAP[name], base.copy())
+    assert peak <= budget * SLACK, f"{name} peaked at {peak:.2f}x the canvas (budget {budget}x)"
+
+
+@pytest.mark.parametrize("name", sorted(name for name in TEXTURE_MAP if name != "none"))
+def test_texture_peak_memory(base, name):
+    peak = _peak_multiple(lambda img: TEXTURE_MAP[name](img, seed=1), base.copy())
+    assert peak <= TEXTURE_BUDGET * SLACK, f"{name} peaked at {peak:.2f}x the canvas (budget {TEXTURE_BUDGET}x)"
@@ -0,0 +1,46 @@
+"""
+Noise bank: tiles are created once per (seed, stream), safely under
+concurrent first use, and partial or corrupt tile files are regenerated.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from core import noise_bank
+from core.random_utils import hash_normal
+
+TILE = 64
+
+
+@pytest.fixture(autouse=True)
+def bank_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(noise_bank, "NOISE_BANK_DIR", str(tmp_path))
+    noise_bank.noise_tile.cache_clear()
+    yield tmp_path
+    noise_bank.noise_tile.cache_clear()
+
+
+def _expected(seed, stream=0):
+    ys, xs = np.ogrid[0:TILE, 0:TILE]
+    return hash_normal(seed, xs, ys, stream)
+
+
+def test_concurrent_first_use(bank_dir):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tiles = list(pool.map(lambda _: noise_bank.noise_tile(5, 1, TILE), range(32)))
+    for tile in tiles:
+        assert np.array_equal(tile, _expected(5, 1))
+    # One tile file, no temp files left behind
+    assert sorted(os.listdir(bank_dir)) == [f"normal_5_1_{TILE}.npy"]
+
+
+@pytest.mark.parametrize("content", [b"", b"\x93NUMPY", b"not a numpy file at all"])
+def test_partial_tile_is_regenerated(bank_dir, content):
+    (bank_dir / f"normal_3_0_{TILE}.npy").write_bytes(content)
+    assert np.array_equal(noise_bank.noise_tile(3, 0, TILE), _expected(3))
+    noise_bank.noise_tile.cache_clear()
+    # The rewritten file now loads as is
+    assert np.array_equal(np.load(bank_dir / f"normal_3_0_{TILE}.npy"), _expected(3))
@@ -0,0 +1,39 @@
+"""
+Pipeline: the texture runs at the stage texture_target selects, an unknown
+texture_target is an error instead of a silent fallback, and render_workers
+only applies to the render it is set for.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from banner.pipeline import BannerConfig, apply_texture_layer, generate_banner
+from core import parallel_utils
+
+
+def _base():
+    return Image.new('RGBA', (96, 48), (120, 130, 140, 255))
+
+
+@pytest.mark.parametrize('target', ['background', 'composite'])
+def test_texture_runs_at_its_target_stage(target):
+    config = BannerConfig(texture='paper', texture_target=target)
+    for stage in ('background', 'composite'):
+        out = apply_texture_layer(_base(), config, stage=stage)
+        changed = not np.array_equal(np.asarray(out), np.asarray(_base()))
+        assert changed == (stage == target)
+
+
+def test_unknown_texture_target_raises():
+    config = BannerConfig(texture='paper', texture_target='backgrund')
+    with pytest.raises(ValueError, match='texture_target'):
+        apply_texture_layer(_base(), config, stage='composite')
+
+
+def test_render_workers_apply_to_one_render(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel_utils, 'WORKERS', 3)
+    config = BannerConfig(width=128, height=32, output=str(tmp_path / 'banner.png'), render_workers=1)
+    generate_banner(config)
+    assert (tmp_path / 'banner.png').exists()
+    assert parallel_utils.WORKERS == 3
@@ -0,0 +1,25 @@
+"""
+Poisson-disk motif placement: points keep the minimum distance across the
+seams between tile blocks, and the layout does not repeat block to block.
+"""
+
+import numpy as np
+
+from banner.patterns._utils import POISSON_TILE, poisson_disk_points
+
+RADIUS = 10.0
+
+
+def test_minimum_distance_across_blocks():
+    points = poisson_disk_points(1200, 700, RADIUS, 3, (-250, -40))
+    dist = ((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+    np.fill_diagonal(dist, np.inf)
+    assert dist.min() >= RADIUS ** 2 - 1e-6
+
+
+def test_blocks_do_not_repeat():
+    span = POISSON_TILE * RADIUS
+    points = poisson_disk_points(int(3 * span), int(span), RADIUS, 3)
+    first = {tuple(p) for p in np.round(points[points[:, 0] < span], 3)}
+    shifted = {(x - span, y) for x, y in np.round(points[(points[:, 0] >= span) & (points[:, 0] < 2 * span)], 3)}
+    assert len(first & shifted) < 0.05 * len(first)
@@ -0,0 +1,61 @@
+"""
+Region renders: patterns and textures rendered for a region at its origin
+must match the same area of the full canvas exactly, so partial and
+parallel (banded) renders are bit-identical to a full render.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from banner.patterns import PATTERN_MAP
+from banner.textures import TEXTURE_MAP
+
+W, H = 600, 300
+COLORS = ['#f00', '#0f0', '#00f']
+
+# (left, top, width, height) regions, including ones touching the canvas edges
+REGIONS = [(150, 120, 200, 100), (0, 0, 257, 131), (431, 187, 169, 113)]
+
+MOTIF_PATTERNS = ['dots', 'circles', 'stars', 'hearts_outline', 'squares', 'ascii_grid']
+LINE_PATTERNS = ['lines', 'wave', 'sine', 'zigzag']
+
+
+def _blank(w, h):
+    return Image.new('RGBA', (w, h), (0, 0, 0, 0))
+
+
+def _assert_region_matches(full, part, region):
+    x, y, w, h = region
+    expected = np.asarray(full)[y:y + h, x:x + w]
+    assert np.array_equal(np.asarray(part), expected)
+
+
+@pytest.mark.parametrize('region', REGIONS)
+@pytest.mark.parametrize('placement', ['grid', 'poisson'])
+@pytest.mark.parametrize('name', MOTIF_PATTERNS)
+def test_motif_pattern_region(name, placement, region):
+    args = (H, 1.0, 200, 0.3, 0.3, 0, (0, 90), COLORS)
+    full = PATTERN_MAP[name](_blank(W, H), [0, 0, W, H], *args, SS=2, placement=placement, seed=7)
+    part = PATTERN_MAP[name](_blank(*region[2:]), [0, 0, W, H], *args, SS=2, placement=placement, seed=7, origin=region[:2])
+    _assert_region_matches(full, part, region)
+
+
+@pytest.mark.parametrize('region', REGIONS)
+@pytest.mark.parametrize('jitter', [0.0, 0.3])
+@pytest.mark.parametrize('name', LINE_PATTERNS)
+def test_line_pattern_region(name, jitter, region):
+    args = (H, 1.0, 200, jitter, 0.0, 0, 0, COLORS)
+    full = PATTERN_MAP[name](_blank(W, H), [0, 0, W, H], *args, SS=2, seed=7)
+    part = PATTERN_MAP[name](_blank(*region[2:]), [0, 0, W, H], *args, SS=2, seed=7, origin=region[:2])
+    _assert_region_matches(full, part, region)
+
+
+@pytest.mark.parametrize('region', REGIONS)
+@pytest.mark.parametrize('name', sorted(name for name in TEXTURE_MAP if name != 'none'))
+def test_texture_region(name, region):
+    x, y, w, h = region
+    base = Image.new('RGBA', (W, H), (120, 130, 140, 255))
+    full = TEXTURE_MAP[name](base.copy(), SS=2, seed=3)
+    part = TEXTURE_MAP[name](base.crop((x, y, x + w, y + h)), SS=2, seed=3, origin=(x, y))
+    _assert_region_matches(full, part, region)
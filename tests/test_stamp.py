@@ -0,0 +1,48 @@
+"""
+Stamp pattern: compositing stamps in batches of non-overlapping layers
+matches compositing them one by one, including overlapping stamps and
+stamps crossing the canvas edge.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from banner.patterns import PATTERN_MAP
+from banner.patterns import _utils
+
+W, H = 800, 240
+COLORS = ['#f00', '#0f08', '#00f']
+
+
+@pytest.fixture(scope="module")
+def stamp(tmp_path_factory):
+    path = tmp_path_factory.mktemp("stamp") / "stamp.png"
+    img = Image.new('RGBA', (60, 45), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((2, 2, 57, 42), fill=(200, 50, 30, 180))
+    draw.rectangle((20, 10, 40, 35), fill=(20, 200, 90, 255))
+    img.save(path)
+    return str(path)
+
+
+def _render(stamp, tint, placement, origin=(0, 0), size=(W, H)):
+    base = Image.new('RGBA', size, (30, 40, 50, 255))
+    return PATTERN_MAP['stamp'](base, [0, 0, W, H], H, 3.0, 200, 0.9, 0.5, (0, 180), 0, COLORS, SS=2,
+                                placement=placement, seed=5, origin=origin, stamp=stamp, tint=tint)
+
+
+@pytest.mark.parametrize('placement', ['grid', 'poisson'])
+@pytest.mark.parametrize('tint', [False, True])
+def test_batched_stamps_match_one_by_one(stamp, monkeypatch, tint, placement):
+    monkeypatch.setattr(_utils, 'STAMP_BATCH_MIN', 10 ** 9)
+    single = _render(stamp, tint, placement)
+    monkeypatch.setattr(_utils, 'STAMP_BATCH_MIN', 0)
+    batched = _render(stamp, tint, placement)
+    assert np.array_equal(np.asarray(batched), np.asarray(single))
+
+
+def test_stamp_layers_order_overlaps():
+    boxes = np.array([(0, 0, 10, 10), (5, 5, 15, 15), (20, 0, 30, 10), (8, 8, 12, 12), (40, 0, 50, 10)])
+    layers = _utils.stamp_layers(boxes)
+    assert layers.tolist() == [0, 1, 0, 2, 0]